@@ -11,16 +11,10 @@ Struktur:
 - tabs/model_performance.py: Tab evaluasi model
 """
 import streamlit as st
-import pandas as pd
-import pickle
 
-# Import tab modules
-from tabs import about_dataset
-from tabs import fraud_detection
-from tabs import dashboard
-from tabs import machine_learning
-from tabs import model_performance
-from tabs import contact_me
+# Modul tab dan dependency berat (pandas, altair, matplotlib, sklearn lewat
+# model) di-import di dalam tab yang membutuhkannya, bukan sebelum first
+# paint. Budget startup: benchmarks/bench_startup.py
 
 # ========================================
 # KONFIGURASI HALAMAN
@@ -35,34 +29,40 @@ st.set_page_config(
 # ========================================
 # LOAD MODEL
 # ========================================
-@st.cache_resource
+@st.cache_resource(show_spinner="Memuat model...")
+def load_model_watcher():
+    """
+    Model aktif dari registry (core/registry.py), satu per proses
+
+    Thread background memantau `models/registry/CURRENT` dan menukar model
+    setelah versi baru di-load dan divalidasi. Tanpa registry: file pickle.
+    Dipanggil pertama kali saat tab yang butuh model dibuka.
+    """
+    from core.registry import DEFAULT_REGISTRY_DIR, ModelWatcher
+    return ModelWatcher(DEFAULT_REGISTRY_DIR,
+                        fallback_path='models/fraud_detection_model.pkl').start()
+
 def load_model():
-    """Load model dan preprocessors dari file pickle"""
-    with open('models/fraud_detection_model.pkl', 'rb') as f:
-        artifacts = pickle.load(f)
-    return artifacts
+    """
+    Snapshot model aktif: artifacts + precompiled scorer dari versi yang sama
+
+    Satu snapshot per rerun: hot-swap tidak mengubah model di tengah render.
+    """
+    try:
+        return load_model_watcher().snapshot()
+    except FileNotFoundError:
+        st.error("❌ Model belum di-training! Jalankan `training_model.py` terlebih dahulu.")
+        st.stop()
 
 @st.cache_data
 def load_data():
-    """Load dataset transaksi untuk visualisasi"""
-    df = pd.read_csv('data/credit_card_transactions2.csv')
+    """Load dataset transaksi untuk visualisasi (via typed Parquet cache)"""
+    from core.data_loader import load_transactions
+    df = load_transactions('data/credit_card_transactions2.csv')
     return df
 
-# Load model artifacts
-try:
-    model_artifacts = load_model()
-    model = model_artifacts['model']
-    scaler = model_artifacts['scaler']
-    label_encoders = model_artifacts['label_encoders']
-    feature_columns = model_artifacts['feature_columns']
-    numerical_cols = model_artifacts['numerical_cols']
-    
-    # Extract model info if available
-    model_info = model_artifacts.get('model_info', {})
-    performance = model_artifacts.get('performance', {})
-except FileNotFoundError:
-    st.error("❌ Model belum di-training! Jalankan `training_model.py` terlebih dahulu.")
-    st.stop()
+# Diisi oleh tab yang memakai model (untuk footer)
+active_model = None
 
 # ========================================
 # INITIALIZE SESSION STATE
@@ -90,43 +90,56 @@ tab_about, tab1, tab2, tab3, tab4, tab_contact = st.tabs([
     "Machine Learning", 
     "Model Performance",
     "Contact Me"
-])
+], key='main_tab', on_change='rerun')
 
 # ========================================
 # RENDER TABS
 # ========================================
-with tab_about:
-    about_dataset.render()
-
-with tab1:
-    dashboard.render(load_data_func=load_data)
-
-with tab2:
-    fraud_detection.render(
-        model=model,
-        scaler=scaler,
-        label_encoders=label_encoders,
-        feature_columns=feature_columns,
-        numerical_cols=numerical_cols
-    )
-
-with tab3:
-    machine_learning.render(
-        model=model,
-        feature_columns=feature_columns,
-        load_data_func=load_data
-    )
-
-with tab4:
-    model_performance.render(
-        model=model,
-        model_info=model_info,
-        performance=performance,
-        feature_columns=feature_columns
-    )
-
-with tab_contact:
-    contact_me.render()
+# Hanya tab yang sedang dibuka yang dijalankan (dan modulnya di-import)
+if tab_about.open:
+    with tab_about:
+        from tabs import about_dataset
+        about_dataset.render()
+
+if tab1.open:
+    with tab1:
+        from tabs import dashboard
+        dashboard.render(load_data_func=load_data)
+
+if tab2.open:
+    with tab2:
+        from tabs import fraud_detection
+        active_model = load_model()
+        fraud_detection.render(
+            scorer=active_model['scorer']
+        )
+
+if tab3.open:
+    with tab3:
+        from tabs import machine_learning
+        active_model = load_model()
+        machine_learning.render(
+            model=active_model['artifacts']['model'],
+            feature_columns=active_model['artifacts']['feature_columns'],
+            load_data_func=load_data
+        )
+
+if tab4.open:
+    with tab4:
+        from tabs import model_performance
+        active_model = load_model()
+        model_artifacts = active_model['artifacts']
+        model_performance.render(
+            model=model_artifacts['model'],
+            model_info=model_artifacts.get('model_info', {}),
+            performance=model_artifacts.get('performance', {}),
+            feature_columns=model_artifacts['feature_columns']
+        )
+
+if tab_contact.open:
+    with tab_contact:
+        from tabs import contact_me
+        contact_me.render()
 
 # ========================================
 # FOOTER
@@ -135,6 +148,7 @@ st.markdown("---")
 st.markdown(
     "<div style='text-align: center; color: gray;'>"
     "🛡️ Credit Card Fraud Analysis System | Powered by Machine Learning"
-    "</div>",
+    + (f" | Model {active_model['version'] or 'fraud_detection_model.pkl'}" if active_model else "")
+    + "</div>",
     unsafe_allow_html=True
 )
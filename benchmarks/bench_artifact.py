@@ -0,0 +1,121 @@
+"""
+Benchmark - Ukuran, waktu load dan error probabilitas: pickle vs format compact
+
+Membandingkan artifacts pickle penuh, pickle minimal (model + pipeline),
+FlatForest .npy, dan format compact (core/compact_artifact.py) dengan leaf
+uint8 / float16. Waktu load diukur warm (median `--repeat` kali dalam proses
+ini) dan cold (proses Python baru: import modul yang dibutuhkan + load,
+seperti saat app/service start). Error probabilitas diukur terhadap model pickle pada
+seluruh dataset lewat BatchScorer (jalur yang sama dengan batch scoring).
+
+Usage:
+    python benchmarks/bench_artifact.py --model models/fraud_detection_model.pkl --repeat 5
+"""
+import argparse
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.compact_artifact import LEAF_DTYPES, load_compact, save_compact  # noqa: E402
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import get_feature_pipeline  # noqa: E402
+from core.forest import FlatForest  # noqa: E402
+from core.scoring import BatchScorer  # noqa: E402
+
+
+def path_bytes(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def median_ms(load, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e3)
+
+
+def cold_load_ms(statement):
+    """Import + load di proses Python baru (ms)"""
+    code = ("import time; start = time.perf_counter(); " + statement +
+            "; print((time.perf_counter() - start) * 1e3)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    artifacts = load_pickle(args.model)
+    pipeline = get_feature_pipeline(artifacts)
+    df = load_transactions(args.data)
+    reference = BatchScorer.from_artifacts(artifacts).predict_proba(df)
+    X = pipeline.transform(df)
+    print(f"Model: {artifacts['model'].n_estimators} trees, "
+          f"{sum(e.tree_.node_count for e in artifacts['model'].estimators_):,} nodes; "
+          f"error diukur pada {len(df):,} baris\n")
+    print(f"{'format':<22}{'size MB':>9}{'warm ms':>9}{'cold ms':>9}{'max |Δp|':>11}"
+          f"{'mean |Δp|':>11}{'agree':>9}")
+    print("-" * 80)
+
+    workdir = tempfile.mkdtemp(prefix='bench_artifact_')
+    try:
+        minimal_path = os.path.join(workdir, 'minimal.pkl')
+        with open(minimal_path, 'wb') as f:
+            pickle.dump({'model': artifacts['model'], 'feature_pipeline': pipeline}, f)
+        flat_dir = os.path.join(workdir, 'flat_forest')
+        FlatForest.from_sklearn(artifacts['model']).save(flat_dir)
+
+        rows = [
+            ('pickle (full)', args.model, lambda: load_pickle(args.model),
+             f"import pickle; pickle.load(open({args.model!r}, 'rb'))", None),
+            ('pickle (model+pipe)', minimal_path, lambda: load_pickle(minimal_path),
+             f"import pickle; pickle.load(open({minimal_path!r}, 'rb'))", None),
+            ('flat_forest .npy', flat_dir, lambda: FlatForest.load(flat_dir, mmap_mode='r'),
+             f"from core.forest import FlatForest; FlatForest.load({flat_dir!r}, mmap_mode='r')",
+             lambda forest: forest.predict_proba(X)[:, 1]),
+        ]
+        for leaf_dtype in LEAF_DTYPES:
+            directory = os.path.join(workdir, f'compact_{leaf_dtype}')
+            save_compact(artifacts, directory, leaf_dtype)
+            rows.append((f'compact ({leaf_dtype})', directory,
+                         lambda d=directory: load_compact(d),
+                         f"from core.compact_artifact import load_compact; load_compact({directory!r})",
+                         lambda loaded: BatchScorer.from_artifacts(loaded).predict_proba(df)))
+
+        for name, path, load, cold_statement, predict in rows:
+            load_ms = median_ms(load, args.repeat)
+            cold_ms = cold_load_ms(cold_statement)
+            proba = reference if predict is None else predict(load())
+            diff = np.abs(proba - reference)
+            agree = np.mean((proba >= 0.5) == (reference >= 0.5))
+            print(f"{name:<22}{path_bytes(path) / 1024**2:>9.2f}{load_ms:>9.1f}{cold_ms:>9.1f}"
+                  f"{diff.max():>11.2e}{diff.mean():>11.2e}{agree:>9.2%}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark - FlatForest vs sklearn `predict_proba`
+
+Memverifikasi probabilitas FlatForest sama dengan sklearn (toleransi 1e-6)
+lalu membandingkan latency pada beberapa ukuran batch. Baris input diambil
+dari dataset (di-tile jika batch lebih besar dari dataset).
+
+Usage:
+    python benchmarks/bench_forest.py --sizes 1 64 4096 1000000
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import get_feature_pipeline  # noqa: E402
+from core.forest import FlatForest  # noqa: E402
+from core.scoring import _array_model  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+TOLERANCE = 1e-6
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 64, 4096, 1_000_000])
+    parser.add_argument('--n-jobs', type=int, default=1, help="n_jobs untuk sklearn")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        artifacts = pickle.load(f)
+    model = _array_model(artifacts['model'], n_jobs=args.n_jobs)
+    X_base = get_feature_pipeline(artifacts).transform(load_transactions(args.data))
+
+    start = time.perf_counter()
+    forest = FlatForest.from_sklearn(model)
+    print(f"Export: {forest.n_trees} trees, {forest.n_nodes:,} nodes, depth {forest.max_depth} "
+          f"({(time.perf_counter() - start) * 1e3:.1f} ms)\n")
+
+    print(f"{'Batch':>10}{'sklearn (ms)':>16}{'flat (ms)':>14}{'speedup':>10}{'max |Δp|':>12}")
+    print("-" * 62)
+    for size in args.sizes:
+        reps = int(np.ceil(size / len(X_base)))
+        X = np.tile(X_base, (reps, 1))[:size]
+        repeat = 20 if size <= 4096 else 1
+
+        p_sklearn = model.predict_proba(X)
+        p_flat = forest.predict_proba(X)
+        max_diff = np.abs(p_sklearn - p_flat).max()
+        assert max_diff <= TOLERANCE, f"Mismatch at batch {size}: {max_diff}"
+
+        t_sklearn = best_of(lambda: model.predict_proba(X), repeat) * 1e3
+        t_flat = best_of(lambda: forest.predict_proba(X), repeat) * 1e3
+        print(f"{size:>10,}{t_sklearn:>16,.2f}{t_flat:>14,.2f}"
+              f"{t_sklearn / t_flat:>9.1f}x{max_diff:>12.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark - Fitur geo vectorized (batch) dan GeoStore (streaming)
+
+Data sintetis dibangun dari koordinat dataset (di-tile sampai N baris)
+dengan kartu dan waktu acak. Script ini mengukur throughput `geo_features`
+pada N baris, latency per event `GeoStore.update`, kecocokan hasil streaming
+vs batch, dan sebagai pembanding `DataFrame.apply` per baris pada sampel kecil.
+
+Usage:
+    python benchmarks/bench_geo.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_loader import load_transactions  # noqa: E402
+from core.geo import GeoStore, _haversine_scalar, geo_features  # noqa: E402
+from core.profiling import StageProfiler  # noqa: E402
+
+TOLERANCE_KM = 1e-6
+
+
+def synthetic_frame(base, n_rows, seed=42):
+    """Tile koordinat dataset sampai `n_rows` dengan cc_num dan unix_time acak"""
+    rng = np.random.default_rng(seed)
+    index = rng.integers(0, len(base), n_rows)
+    frame = pd.DataFrame({
+        col: base[col].to_numpy(dtype=np.float64)[index]
+        for col in ['lat', 'long', 'merch_lat', 'merch_long']
+    })
+    frame['cc_num'] = rng.integers(0, max(1, n_rows // 200), n_rows) + 10**15
+    frame['unix_time'] = rng.integers(1_325_376_000, 1_388_534_400, n_rows)
+    return frame
+
+
+def stream_features(frame):
+    """Umpankan frame (urut unix_time, stabil) ke GeoStore, return (fitur, detik)"""
+    ordered = frame.sort_values('unix_time', kind='stable')
+    store = GeoStore()
+    columns = [ordered[c].to_numpy().tolist()
+               for c in ['cc_num', 'unix_time', 'lat', 'long', 'merch_lat', 'merch_long']]
+    start = time.perf_counter()
+    rows = [store.update(*values) for values in zip(*columns)]
+    seconds = time.perf_counter() - start
+    result = pd.DataFrame(rows, index=ordered.index).sort_index()
+    return result, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--stream-rows', type=int, default=200_000)
+    parser.add_argument('--apply-rows', type=int, default=20_000)
+    args = parser.parse_args()
+
+    base = load_transactions(args.data, columns=['lat', 'long', 'merch_lat', 'merch_long'])
+    profiler = StageProfiler()
+
+    with profiler.stage('generate'):
+        frame = synthetic_frame(base, args.rows)
+    with profiler.stage('geo_features'):
+        start = time.perf_counter()
+        batch = geo_features(frame)
+        batch_seconds = time.perf_counter() - start
+    profiler.print_report()
+
+    print(f"\nBatch (vectorized) : {args.rows:,} rows in {batch_seconds:.2f}s "
+          f"({args.rows / batch_seconds:,.0f} rows/sec)")
+
+    sample = frame.iloc[:args.stream_rows]
+    expected = geo_features(sample)
+    streamed, stream_seconds = stream_features(sample)
+    max_diff = max(np.abs(streamed[col].to_numpy() - expected[col]).max() for col in expected)
+    print(f"Streaming GeoStore : {len(sample):,} events, "
+          f"{stream_seconds / len(sample) * 1e6:.1f} µs/event | max |Δ| vs batch {max_diff:.1e}")
+    assert max_diff <= TOLERANCE_KM, f"Streaming != batch ({max_diff})"
+
+    small = frame.iloc[:args.apply_rows]
+    start = time.perf_counter()
+    small.apply(lambda r: _haversine_scalar(r['lat'], r['long'], r['merch_lat'], r['merch_long']),
+                axis=1)
+    apply_rate = len(small) / (time.perf_counter() - start)
+    print(f"Row-wise apply     : {apply_rate:,.0f} rows/sec (distance saja, pembanding) → "
+          f"vectorized {args.rows / batch_seconds / apply_rate:,.0f}x lebih cepat")
+
+
+if __name__ == '__main__':
+    main()
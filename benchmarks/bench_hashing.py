@@ -0,0 +1,81 @@
+"""
+Benchmark - Blok hashing sparse vs X dense 8 kolom
+
+Untuk setiap jumlah bucket: memori X (CSR data + indices + indptr vs
+matriks dense setara), waktu transform, waktu fit RandomForest dan metrik
+pada test split stratified. Baris pertama (`dense`) adalah baseline X
+8 kolom yang dipakai fraud_detection_rf.py saat ini.
+
+Usage:
+    python benchmarks/bench_hashing.py --buckets 1024 4096 16384 --n-estimators 50
+"""
+import argparse
+import os
+import sys
+import time
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import (accuracy_score, f1_score, precision_score, recall_score,
+                             roc_auc_score)
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import FeaturePipeline  # noqa: E402
+
+
+def matrix_mb(X):
+    """Memori matriks: komponen CSR jika sparse, selain itu buffer dense"""
+    if hasattr(X, 'indptr'):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024**2
+    return X.nbytes / 1024**2
+
+
+def evaluate(name, pipeline, train, test, args):
+    start = time.perf_counter()
+    pipeline.fit(train)
+    X_train = pipeline.transform_model_input(train)
+    X_test = pipeline.transform_model_input(test)
+    transform_s = time.perf_counter() - start
+
+    model = RandomForestClassifier(n_estimators=args.n_estimators, max_depth=args.max_depth,
+                                   class_weight='balanced', random_state=42, n_jobs=-1)
+    start = time.perf_counter()
+    model.fit(X_train, train['is_fraud'])
+    fit_s = time.perf_counter() - start
+
+    y_test = test['is_fraud']
+    proba = model.predict_proba(X_test)[:, 1]
+    pred = (proba >= 0.5).astype(int)
+    dense_mb = X_train.shape[0] * X_train.shape[1] * 4 / 1024**2
+    print(f"{name:>8}{X_train.shape[1]:>7,}{matrix_mb(X_train):>9.1f}{dense_mb:>11.1f}"
+          f"{transform_s:>8.2f}s{fit_s:>8.2f}s"
+          f"{accuracy_score(y_test, pred):>8.4f}{precision_score(y_test, pred, zero_division=0):>8.4f}"
+          f"{recall_score(y_test, pred):>8.4f}{f1_score(y_test, pred):>8.4f}"
+          f"{roc_auc_score(y_test, proba):>8.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--buckets', type=int, nargs='+', default=[1024, 4096, 16384])
+    parser.add_argument('--n-estimators', type=int, default=50)
+    parser.add_argument('--max-depth', type=int, default=15)
+    args = parser.parse_args()
+
+    df = load_transactions(args.data)
+    train, test = train_test_split(df, test_size=0.2, random_state=42, stratify=df['is_fraud'])
+    print(f"Train {len(train):,} / test {len(test):,} rows, "
+          f"RandomForest n_estimators={args.n_estimators} max_depth={args.max_depth}\n")
+    print(f"{'X':>8}{'cols':>7}{'MB':>9}{'dense MB':>11}{'xform':>9}{'fit':>9}"
+          f"{'acc':>8}{'prec':>8}{'recall':>8}{'f1':>8}{'auc':>8}")
+    print("-" * 93)
+
+    evaluate('dense', FeaturePipeline(), train, test, args)
+    for n_buckets in args.buckets:
+        evaluate(f'h{n_buckets}', FeaturePipeline(hash_buckets=n_buckets), train, test, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark - Latency scoring selama hot-swap model dari registry
+
+Satu thread scoring berjalan terus (seperti request app) sementara versi
+baru dipublish ke registry sementara. Latency per request dilaporkan per
+fase: sebelum publish, selama load + validasi di background, dan setelah
+swap. Juga dicek bahwa tidak ada request yang gagal, dan bahwa versi
+rusak ditolak tanpa mengganggu model aktif.
+
+Usage:
+    python benchmarks/bench_hotswap.py --model models/fraud_detection_model.pkl --seconds 3
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.registry import ModelRegistry, ModelWatcher, probe_record  # noqa: E402
+
+
+def score_loop(watcher, record, stop, samples):
+    """Scoring berulang; setiap request memakai snapshot yang diambil di awal"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        active = watcher.snapshot()
+        active['scorer'].score(record)
+        samples.append((start, time.perf_counter() - start, active['version']))
+
+
+def percentiles_us(latencies):
+    if not latencies:
+        return "-"
+    p50, p99, worst = np.percentile(latencies, [50, 99, 100]) * 1e6
+    return f"{len(latencies):>8,} req | p50 {p50:>7.1f} µs | p99 {p99:>8.1f} µs | max {worst / 1e3:>7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--seconds', type=float, default=3.0, help="Durasi setiap fase")
+    parser.add_argument('--interval', type=float, default=0.2, help="Jeda polling pointer")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_registry_')
+    try:
+        registry = ModelRegistry(root)
+        registry.publish(args.model, 'v1')
+        watcher = ModelWatcher(root, interval=args.interval).start()
+        record = probe_record(watcher.snapshot()['scorer'].feature_pipeline)
+        print(f"✓ v1 aktif (load + validasi {watcher.snapshot()['load_seconds'] * 1e3:.0f} ms)")
+
+        stop, samples = threading.Event(), []
+        scorer_thread = threading.Thread(target=score_loop, args=(watcher, record, stop, samples))
+        scorer_thread.start()
+
+        time.sleep(args.seconds)
+        published = time.perf_counter()
+        registry.publish(args.model, 'v2')
+        while watcher.snapshot()['version'] != 'v2':
+            time.sleep(0.001)
+        swapped = time.perf_counter()
+
+        # Versi rusak: pointer pindah, tetapi validasi gagal dan v2 tetap melayani
+        broken = os.path.join(root, 'broken.pkl')
+        with open(broken, 'wb') as f:
+            f.write(b'not a pickle')
+        registry.publish(broken, 'v3-broken')
+        time.sleep(args.seconds)
+        stop.set()
+        scorer_thread.join()
+        watcher.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    before = [lat for t, lat, _ in samples if t < published]
+    during = [lat for t, lat, _ in samples if published <= t < swapped]
+    after = [lat for t, lat, _ in samples if t >= swapped]
+    print(f"✓ v2 ditukar {(swapped - published) * 1e3:.0f} ms setelah publish "
+          f"(polling {args.interval * 1e3:.0f} ms)\n")
+    print(f"  before swap  {percentiles_us(before)}")
+    print(f"  during load  {percentiles_us(during)}")
+    print(f"  after swap   {percentiles_us(after)}")
+
+    status = watcher.status()
+    versions = sorted({version for _, _, version in samples})
+    print(f"\n✓ {len(samples):,} request tanpa error, versi yang melayani: {versions}")
+    print(f"✓ Versi rusak ditolak, aktif: {status['version']} | {status['last_error']}")
+
+
+if __name__ == '__main__':
+    main()
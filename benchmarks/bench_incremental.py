@@ -0,0 +1,105 @@
+"""
+Benchmark - Retrain incremental (warm-start) vs full refit per siklus bulanan
+
+Model awal dilatih pada `--initial-months` bulan pertama. Setiap siklus
+berikutnya: kedua model (incremental dan full refit) dievaluasi pada bulan
+berjalan *sebelum* melihat labelnya, lalu
+  - incremental: `retrain_incremental` dengan tree baru dari bulan itu saja
+  - full refit: pipeline + forest di-fit ulang dari seluruh histori
+Tabel menunjukkan waktu retrain dan drift recall kedua pendekatan.
+
+Usage:
+    python benchmarks/bench_incremental.py --initial-months 6 --n-estimators 100 --new-trees 25
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cv import classification_metrics  # noqa: E402
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import FeaturePipeline  # noqa: E402
+from core.incremental import retrain_incremental  # noqa: E402
+
+
+def full_fit(history, args):
+    """Pipeline + RandomForest dari nol atas seluruh histori"""
+    start = time.perf_counter()
+    pipeline = FeaturePipeline(target_encoding=args.target_encoding)
+    y = history['is_fraud'].to_numpy()
+    pipeline.fit(history, y)
+    X = pipeline.transform_model_input(history, y)
+    model = RandomForestClassifier(n_estimators=args.n_estimators, max_depth=15,
+                                   min_samples_split=5, min_samples_leaf=2,
+                                   random_state=42, n_jobs=-1)
+    model.fit(X, y)
+    artifacts = {'model': model, 'feature_pipeline': pipeline,
+                 'target_encoders': pipeline.target_encoders, 'model_info': {}}
+    return artifacts, time.perf_counter() - start
+
+
+def score(artifacts, df):
+    X = artifacts['feature_pipeline'].transform_model_input(df)
+    proba = artifacts['model'].predict_proba(X)[:, 1]
+    return classification_metrics(df['is_fraud'].to_numpy(), proba)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--initial-months', type=int, default=6)
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--new-trees', type=int, default=25)
+    parser.add_argument('--max-trees', type=int, help="Default: --n-estimators")
+    parser.add_argument('--target-encoding', action='store_true')
+    args = parser.parse_args()
+
+    df = load_transactions(args.data)
+    month = pd.to_datetime(df['trans_date_trans_time']).dt.to_period('M')
+    months = sorted(month.unique())
+    initial = df[month.isin(months[:args.initial_months])]
+    print(f"Initial fit: {months[0]}..{months[args.initial_months - 1]} ({len(initial):,} rows), "
+          f"{args.n_estimators} trees; incremental +{args.new_trees} tree/siklus, "
+          f"max {args.max_trees or args.n_estimators}\n")
+
+    incremental, _ = full_fit(initial, args)
+    full, _ = full_fit(initial, args)
+    history = [initial]
+
+    print(f"{'month':>8}{'rows':>7}{'recall inc':>12}{'recall full':>13}{'auc inc':>9}"
+          f"{'auc full':>10}{'inc s':>8}{'full s':>8}{'speedup':>9}")
+    print("-" * 84)
+    inc_recall, full_recall, inc_s, full_s = [], [], [], []
+    for current in months[args.initial_months:]:
+        batch = df[month == current]
+        if batch['is_fraud'].nunique() < 2:
+            continue
+        m_inc, m_full = score(incremental, batch), score(full, batch)
+
+        incremental, report = retrain_incremental(incremental, batch, args.new_trees,
+                                                  args.max_trees or args.n_estimators)
+        history.append(batch)
+        full, full_seconds = full_fit(pd.concat(history), args)
+
+        inc_recall.append(m_inc['recall'])
+        full_recall.append(m_full['recall'])
+        inc_s.append(report['total_seconds'])
+        full_s.append(full_seconds)
+        print(f"{str(current):>8}{len(batch):>7,}{m_inc['recall']:>12.4f}{m_full['recall']:>13.4f}"
+              f"{m_inc['roc_auc']:>9.4f}{m_full['roc_auc']:>10.4f}{inc_s[-1]:>8.2f}"
+              f"{full_s[-1]:>8.2f}{full_s[-1] / inc_s[-1]:>8.1f}x")
+
+    print("-" * 84)
+    print(f"{'mean':>8}{'':>7}{np.mean(inc_recall):>12.4f}{np.mean(full_recall):>13.4f}"
+          f"{'':>19}{np.mean(inc_s):>8.2f}{np.mean(full_s):>8.2f}"
+          f"{np.mean(full_s) / np.mean(inc_s):>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
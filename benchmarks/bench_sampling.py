@@ -0,0 +1,94 @@
+"""
+Benchmark - Downsampling non-fraud: waktu fit vs recall/precision/kalibrasi
+
+Dataset asli hampir seimbang, jadi extract besar yang imbalanced dibangun
+sintetis: baris training/test (split stratified dari data asli, di-encode
+dengan FeaturePipeline) di-tile sampai `--rows` baris dengan fraud rate
+`--fraud-rate`. Untuk setiap `neg_rate` dan mode koreksi: waktu fit
+RandomForest, metrik pada test extract (distribusi asli), dan kalibrasi
+(rata-rata probabilitas prediksi vs fraud rate sebenarnya, Brier score).
+
+Usage:
+    python benchmarks/bench_sampling.py --rows 1000000 --fraud-rate 0.005 \\
+        --neg-rates 1 0.3 0.1 0.03 0.01
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import brier_score_loss
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cv import classification_metrics  # noqa: E402
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import FeaturePipeline  # noqa: E402
+from core.sampling import (CORRECTIONS, downsample_majority, fit_downsampled,  # noqa: E402
+                           fraud_proba, prior_neg_rate)
+
+
+def imbalanced_extract(X, y, n_rows, fraud_rate, seed):
+    """Tile baris (X, y) sampai `n_rows` dengan proporsi fraud `fraud_rate`"""
+    rng = np.random.default_rng(seed)
+    n_fraud = max(1, int(n_rows * fraud_rate))
+    index = np.concatenate([rng.choice(np.flatnonzero(y == 1), n_fraud),
+                            rng.choice(np.flatnonzero(y == 0), n_rows - n_fraud)])
+    rng.shuffle(index)
+    return X[index], y[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--test-rows', type=int, default=200_000)
+    parser.add_argument('--fraud-rate', type=float, default=0.005)
+    parser.add_argument('--neg-rates', type=float, nargs='+', default=[1.0, 0.3, 0.1, 0.03, 0.01])
+    parser.add_argument('--n-estimators', type=int, default=50)
+    parser.add_argument('--max-depth', type=int, default=15)
+    args = parser.parse_args()
+
+    df = load_transactions(args.data)
+    train, test = train_test_split(df, test_size=0.2, random_state=42, stratify=df['is_fraud'])
+    pipeline = FeaturePipeline().fit(train)
+    X_train, y_train = imbalanced_extract(pipeline.transform(train), train['is_fraud'].to_numpy(),
+                                          args.rows, args.fraud_rate, seed=1)
+    X_test, y_test = imbalanced_extract(pipeline.transform(test), test['is_fraud'].to_numpy(),
+                                        args.test_rows, args.fraud_rate, seed=2)
+    print(f"Train extract {len(y_train):,} rows / test {len(y_test):,} rows, "
+          f"fraud rate {args.fraud_rate:.2%}; RandomForest n_estimators={args.n_estimators} "
+          f"max_depth={args.max_depth}\n")
+    print(f"{'neg_rate':>9}{'mode':>9}{'rows':>11}{'fit s':>8}{'speedup':>9}{'recall':>8}"
+          f"{'prec':>8}{'f1':>8}{'auc':>8}{'mean p':>9}{'brier':>9}")
+    print("-" * 96)
+
+    baseline_s = None
+    for neg_rate in sorted(args.neg_rates, reverse=True):
+        index = downsample_majority(y_train, neg_rate)
+        modes = ['none'] if neg_rate >= 1 else CORRECTIONS
+        for mode in modes:
+            model = RandomForestClassifier(n_estimators=args.n_estimators,
+                                           max_depth=args.max_depth, min_samples_split=5,
+                                           min_samples_leaf=2, random_state=42, n_jobs=-1)
+            start = time.perf_counter()
+            fit_downsampled(model, X_train[index], y_train[index], neg_rate,
+                            'prior' if mode == 'none' else mode)
+            fit_s = time.perf_counter() - start
+            baseline_s = baseline_s or fit_s
+
+            # Koreksi yang sama dengan jalur scoring (artifacts 'prior_neg_rate')
+            proba = fraud_proba(model, X_test, prior_neg_rate(neg_rate, mode))
+            m = classification_metrics(y_test, proba)
+            print(f"{neg_rate:>9.2f}{mode:>9}{len(index):>11,}{fit_s:>8.2f}"
+                  f"{baseline_s / fit_s:>8.1f}x{m['recall']:>8.4f}{m['precision']:>8.4f}"
+                  f"{m['f1_score']:>8.4f}{m['roc_auc']:>8.4f}{proba.mean():>9.5f}"
+                  f"{brier_score_loss(y_test, proba):>9.5f}")
+    print(f"\nFraud rate sebenarnya (test): {y_test.mean():.5f}")
+
+
+if __name__ == '__main__':
+    main()
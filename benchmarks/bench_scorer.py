@@ -0,0 +1,114 @@
+"""
+Benchmark - Latency scoring satu transaksi (Fraud Detection tab)
+
+Membandingkan jalur lama (LabelEncoder.transform + DataFrame +
+scaler.transform + predict + predict_proba) dengan TransactionScorer.
+
+Target (feature building saja, di luar model):
+    p50 < 20 µs, p99 < 100 µs
+
+Usage:
+    python benchmarks/bench_scorer.py --model models/fraud_detection_model.pkl
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scoring import TransactionScorer  # noqa: E402
+
+warnings.filterwarnings('ignore')
+
+TARGET_P50_US = 20.0
+TARGET_P99_US = 100.0
+
+RECORD = {
+    'category': 'gas_transport',
+    'amt': 1500.0,
+    'gender': 'M',
+    'state': 'TX',
+    'age': 25,
+    'hour': 3,
+    'is_weekend': True,
+}
+
+
+def legacy_score(artifacts, record):
+    """Jalur lama dari tabs/fraud_detection.py (sebelum TransactionScorer)"""
+    label_encoders = artifacts['label_encoders']
+    scaler = artifacts['scaler']
+    model = artifacts['model']
+    input_data = pd.DataFrame({
+        'category': [label_encoders['category'].transform([record['category']])[0]],
+        'amt': [record['amt']],
+        'gender': [label_encoders['gender'].transform([record['gender']])[0]],
+        'state': [label_encoders['state'].transform([record['state']])[0]],
+        'age': [record['age']],
+        'hour': [record['hour']],
+        'is_weekend': [int(record['is_weekend'])],
+        'amt_per_hour_ratio': [record['amt'] / (record['hour'] + 1)],
+    })
+    input_data = input_data[artifacts['feature_columns']]
+    numerical_cols = artifacts['numerical_cols']
+    input_data[numerical_cols] = scaler.transform(input_data[numerical_cols])
+    prediction = model.predict(input_data)[0]
+    return prediction, model.predict_proba(input_data)[0]
+
+
+def measure(func, n):
+    timings = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def report(name, timings_us):
+    p50, p99 = np.percentile(timings_us, [50, 99])
+    print(f"{name:<32}{p50:>12,.1f}{p99:>12,.1f}")
+    return p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--n', type=int, default=20_000, help="Iterasi feature building")
+    parser.add_argument('--n-model', type=int, default=200, help="Iterasi end-to-end")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        artifacts = pickle.load(f)
+    scorer = TransactionScorer.from_artifacts(artifacts)
+
+    # Sanity check: hasil harus sama dengan jalur lama
+    pred_old, proba_old = legacy_score(artifacts, RECORD)
+    pred_new, proba_new = scorer.score(RECORD)
+    assert pred_old == pred_new and np.allclose(proba_old, proba_new), "Scorer mismatch!"
+    # Jalur satu record (build_features) dan jalur batch (build_many) harus identik
+    proba_many = scorer.predict_proba_many([RECORD])
+    assert np.allclose(proba_new[1], proba_many[0]), "Single-record vs batch mismatch!"
+
+    print(f"{'Path':<32}{'p50 (µs)':>12}{'p99 (µs)':>12}")
+    print("-" * 56)
+    p50, p99 = report("build_features (scorer)", measure(lambda: scorer.build_features(RECORD), args.n))
+    report("score end-to-end (scorer)", measure(lambda: scorer.score(RECORD), args.n_model))
+    report("legacy end-to-end", measure(lambda: legacy_score(artifacts, RECORD), args.n_model))
+    print("-" * 56)
+
+    ok = p50 < TARGET_P50_US and p99 < TARGET_P99_US
+    print(f"Target build_features p50 < {TARGET_P50_US:.0f} µs, p99 < {TARGET_P99_US:.0f} µs: "
+          f"{'✅ OK' if ok else '❌ MISSED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
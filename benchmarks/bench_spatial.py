@@ -0,0 +1,84 @@
+"""
+Benchmark - Grid index merchant vs brute force
+
+Titik merchant diambil dari dataset (di-tile dengan jitter kecil sampai N
+titik). Untuk setiap ukuran: waktu build index, latency satu query
+(p50/p99) grid vs brute force, throughput `query_many`, dan verifikasi
+hasil grid sama persis dengan brute force.
+
+Usage:
+    python benchmarks/bench_spatial.py --points 14000 1000000 --radius-km 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_loader import load_transactions  # noqa: E402
+from core.spatial import MerchantGridIndex  # noqa: E402
+
+
+def tiled_points(base, n_points, seed=42):
+    """Tile koordinat dataset sampai `n_points` dengan jitter ±0.05°"""
+    rng = np.random.default_rng(seed)
+    index = rng.integers(0, len(base), n_points)
+    jitter = rng.uniform(-0.05, 0.05, (2, n_points)) if n_points > len(base) else np.zeros((2, n_points))
+    lat = base['merch_lat'].to_numpy(np.float64)[index] + jitter[0]
+    lon = base['merch_long'].to_numpy(np.float64)[index] + jitter[1]
+    return lat, lon, base['is_fraud'].to_numpy()[index]
+
+
+def latencies_us(func, lat, lon):
+    timings = np.empty(len(lat))
+    for i in range(len(lat)):
+        start = time.perf_counter()
+        func(lat[i], lon[i])
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--points', type=int, nargs='+', default=[14_000, 1_000_000])
+    parser.add_argument('--radius-km', type=float, default=10.0)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    base = load_transactions(args.data, columns=['merch_lat', 'merch_long', 'is_fraud'])
+    rng = np.random.default_rng(0)
+
+    print(f"Radius {args.radius_km:g} km, {args.queries:,} query acak\n")
+    print(f"{'Points':>10}{'build (ms)':>12}{'MB':>7}{'grid p50':>10}{'p99':>8}"
+          f"{'brute p50':>11}{'p99':>9}{'speedup':>9}{'batch q/s':>12}")
+    print("-" * 88)
+    for n_points in args.points:
+        lat, lon, fraud = tiled_points(base, n_points)
+        start = time.perf_counter()
+        index = MerchantGridIndex.build(lat, lon, fraud, radius_km=args.radius_km)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        pick = rng.integers(0, n_points, args.queries)
+        q_lat, q_lon = lat[pick], lon[pick]
+        for i in range(0, args.queries, max(1, args.queries // 200)):
+            assert index.query(q_lat[i], q_lon[i]) == index.brute_force(q_lat[i], q_lon[i])
+
+        grid = latencies_us(index.query, q_lat, q_lon)
+        brute = latencies_us(index.brute_force, q_lat[:200], q_lon[:200])
+
+        start = time.perf_counter()
+        index.query_many(q_lat, q_lon)
+        batch_rate = args.queries / (time.perf_counter() - start)
+
+        print(f"{n_points:>10,}{build_ms:>12,.1f}{index.nbytes / 1024**2:>7.1f}"
+              f"{np.percentile(grid, 50):>8.1f}µs{np.percentile(grid, 99):>6.1f}µs"
+              f"{np.percentile(brute, 50):>9.1f}µs{np.percentile(brute, 99):>7.1f}µs"
+              f"{np.median(brute) / np.median(grid):>8.0f}x{batch_rate:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
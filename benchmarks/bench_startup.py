@@ -0,0 +1,160 @@
+"""
+Benchmark - Startup app.py: import-time breakdown, time to first render, budget
+
+Setiap pengukuran memakai proses Python baru (cold start) dengan
+`-X importtime`. App dijalankan lewat `streamlit.testing.v1.AppTest`
+(script app yang sama dengan `streamlit run`, tanpa server/browser):
+
+- first render: satu run script dengan tab default (About Dataset)
+- breakdown: waktu import kumulatif per package yang di-import oleh app
+  sendiri (harness Streamlit sudah di-import sebelum pengukuran)
+- first open per tab: run berikutnya setelah tab dipilih (`--tabs`)
+
+Budget dicek di akhir; exit code 1 jika time to first render melebihi
+`--budget-ms` atau jika dependency berat sudah di-import sebelum first
+paint. Pakai di CI untuk menangkap regresi cold start.
+
+Usage:
+    python benchmarks/bench_startup.py --budget-ms 1000
+    python benchmarks/bench_startup.py --tabs "Fraud Detection" "Model Performance"
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1000.0
+# Tidak boleh ter-import sebelum first paint (tab default)
+HEAVY_MODULES = ['pandas', 'matplotlib', 'altair', 'sklearn', 'scipy', 'pyarrow']
+# Modul milik repo; import di bawahnya diatribusikan ke package pihak ketiga
+APP_PACKAGES = {'tabs', 'core'}
+MARKER = '--- bench_startup: app start ---'
+FIRST_PAINT_MARKER = '--- bench_startup: first render ---'
+
+# Dijalankan di proses anak; hasil dikirim sebagai JSON di baris terakhir stdout
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+print({marker!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+at = AppTest.from_file('app.py', default_timeout=600).run()
+first_render = time.perf_counter() - start
+print({first_paint!r}, file=sys.stderr, flush=True)
+result = {{'first_render_ms': first_render * 1e3,
+          'errors': [e.value for e in at.exception],
+          'heavy_loaded': [m for m in {heavy!r} if m in sys.modules],
+          'tabs': []}}
+for tab in {tabs!r}:
+    at.session_state['main_tab'] = tab
+    start = time.perf_counter()
+    at.run()
+    result['tabs'].append({{'tab': tab, 'ms': (time.perf_counter() - start) * 1e3,
+                           'errors': [e.value for e in at.exception]}})
+print(json.dumps(result))
+"""
+
+
+def parse_importtime(lines):
+    """
+    Waktu import kumulatif (ms) per package pihak ketiga / stdlib
+
+    Baris `-X importtime`: "import time: self [us] | cumulative | name",
+    indentasi nama = kedalaman, child dicetak sebelum parent. Setiap import
+    dihitung pada package pertama di luar APP_PACKAGES dalam rantainya,
+    jadi pandas yang di-import lewat tabs.dashboard tercatat sebagai pandas.
+    """
+    totals = {}
+    ancestors = []
+    for line in reversed(lines):
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        package = name.strip().split('.')[0]
+        del ancestors[depth:]
+        parent = ancestors[-1] if ancestors else None
+        ancestors.append(package)
+        if package not in APP_PACKAGES and (parent is None or parent in APP_PACKAGES):
+            totals[package] = totals.get(package, 0.0) + int(cumulative) / 1e3
+    return totals
+
+
+def run_app(tabs):
+    """
+    Returns:
+        (hasil JSON proses anak, import ms sebelum first paint, import ms saat tab dibuka)
+    """
+    code = CHILD.format(marker=MARKER, first_paint=FIRST_PAINT_MARKER, heavy=HEAVY_MODULES,
+                        tabs=list(tabs))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    lines = result.stderr.splitlines()
+    start, paint = lines.index(MARKER), lines.index(FIRST_PAINT_MARKER)
+    return (json.loads(result.stdout.strip().splitlines()[-1]),
+            parse_importtime(lines[start + 1:paint]), parse_importtime(lines[paint + 1:]))
+
+
+def cold_import_ms(module):
+    """Waktu import satu modul di proses baru (ms)"""
+    code = (f"import time; start = time.perf_counter(); import {module}; "
+            "print((time.perf_counter() - start) * 1e3)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Budget time to first render (ms)")
+    parser.add_argument('--tabs', nargs='*',
+                        default=['Dashboard', 'Fraud Detection', 'Machine Learning',
+                                 'Model Performance', 'Contact Me'],
+                        help="Tab yang dibuka berurutan setelah first render")
+    parser.add_argument('--top', type=int, default=10, help="Jumlah package di breakdown")
+    args = parser.parse_args()
+
+    result, before_paint, in_tabs = run_app(args.tabs)
+
+    print("Import-time breakdown (ms kumulatif per package yang di-import oleh app)")
+    print(f"{'package':<24}{'first paint':>12}{'tabs':>10}")
+    print("-" * 46)
+    packages = sorted(set(before_paint) | set(in_tabs),
+                      key=lambda p: -(before_paint.get(p, 0) + in_tabs.get(p, 0)))
+    for package in packages[:args.top]:
+        print(f"{package:<24}{before_paint.get(package, 0):>12.1f}{in_tabs.get(package, 0):>10.1f}")
+
+    print("\nDependency yang ditunda (cold import yang tidak lagi dibayar sebelum first paint)")
+    for module in ['pandas', 'altair', 'matplotlib.pyplot', 'sklearn.ensemble']:
+        print(f"   {module:<24}{cold_import_ms(module):>8.0f} ms")
+
+    print(f"\n{'run':<28}{'ms':>8}")
+    print("-" * 36)
+    print(f"{'first render':<28}{result['first_render_ms']:>8.0f}")
+    for tab in result['tabs']:
+        print(f"{'buka ' + tab['tab']:<28}{tab['ms']:>8.0f}")
+
+    failures = []
+    if result['first_render_ms'] > args.budget_ms:
+        failures.append(f"first render {result['first_render_ms']:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if result['heavy_loaded']:
+        failures.append(f"di-import sebelum first paint: {result['heavy_loaded']}")
+    errors = result['errors'] + [e for tab in result['tabs'] for e in tab['errors']]
+    if errors:
+        failures.append(f"exception saat render: {errors}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print(f"\n✓ First render {result['first_render_ms']:.0f} ms ≤ budget {args.budget_ms:.0f} ms, "
+          f"tanpa {', '.join(HEAVY_MODULES)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark - Throughput dan memori worker pool dengan forest memory-mapped
+
+Untuk setiap jumlah worker, ukur throughput agregat scoring (baris/detik)
+dan rincian memori per worker (RSS, anon, file-backed, PSS). Sebagai
+pembanding, RSS satu proses yang meng-unpickle model sklearn penuh diukur
+di subprocess terpisah.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1 2 4 8 --rows 1000000
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_loader import load_transactions  # noqa: E402
+from core.features import get_feature_pipeline  # noqa: E402
+from core.forest import export_model  # noqa: E402
+from core.worker_pool import ForestWorkerPool  # noqa: E402
+
+# Dijalankan di subprocess: RSS setelah unpickle model penuh
+_PICKLE_PROBE = """
+import json, pickle, sys
+import pandas, sklearn.ensemble, sklearn.preprocessing  # library dihitung terpisah dari model
+from core.profiling import memory_breakdown_mb
+before = memory_breakdown_mb()
+with open(sys.argv[1], 'rb') as f:
+    artifacts = pickle.load(f)
+after = memory_breakdown_mb()
+print(json.dumps({'before': before, 'after': after}))
+"""
+
+
+def pickle_baseline(model_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', _PICKLE_PROBE, model_path],
+                            cwd=root, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--forest-dir', default=os.path.join('models', 'flat_forest'))
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--chunk-rows', type=int, default=2048)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.forest_dir):
+        export_model(args.model, args.forest_dir)
+        print(f"✓ Exported forest to {args.forest_dir}")
+
+    with open(args.model, 'rb') as f:
+        artifacts = pickle.load(f)
+    X_base = get_feature_pipeline(artifacts).transform(load_transactions(args.data))
+    X = np.tile(X_base, (int(np.ceil(args.rows / len(X_base))), 1))[:args.rows]
+    forest_mb = sum(os.path.getsize(os.path.join(args.forest_dir, name))
+                    for name in os.listdir(args.forest_dir)) / 1024**2
+
+    print(f"Rows: {len(X):,} | forest on disk: {forest_mb:.1f} MB | cores: {os.cpu_count()}\n")
+    print(f"{'Workers':>8}{'rows/sec':>14}{'RSS/worker':>12}{'anon':>9}{'file':>9}{'PSS':>9}")
+    print("-" * 61)
+    for n_workers in args.workers:
+        with ForestWorkerPool(args.forest_dir, n_workers=n_workers,
+                              chunk_rows=args.chunk_rows) as pool:
+            pool.predict_proba(X[:args.chunk_rows * n_workers])  # warm-up: page-in mmap
+            start = time.perf_counter()
+            pool.predict_proba(X)
+            seconds = time.perf_counter() - start
+            memory = list(pool.worker_memory().values())
+
+        mean = {key: np.mean([m.get(key, np.nan) for m in memory])
+                for key in ('rss', 'anon', 'file', 'pss')}
+        print(f"{n_workers:>8}{len(X) / seconds:>14,.0f}{mean['rss']:>11.1f}M"
+              f"{mean['anon']:>8.1f}M{mean['file']:>8.1f}M{mean['pss']:>8.1f}M")
+
+    baseline = pickle_baseline(args.model)
+    model_mb = baseline['after']['rss'] - baseline['before']['rss']
+    print(f"\nUnpickle model sklearn penuh: RSS {baseline['after']['rss']:.1f} MB "
+          f"(model saja +{model_mb:.1f} MB anon per proses, tidak bisa dibagi)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Load Generator - Throughput scoring service: micro-batching vs satu panggilan per request
+
+Untuk setiap konfigurasi service (`--max-batch-size 1` sebagai baseline dan
+micro-batching), script ini menjalankan `python -m core.service` sebagai
+subprocess lalu mengirim request `POST /score` dari N klien konkuren
+(keep-alive) selama durasi tertentu.
+
+Usage:
+    python benchmarks/loadgen.py --concurrency 1 16 256 --duration 10
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRANSACTIONS = [
+    {'category': 'gas_transport', 'amt': 1500.0, 'gender': 'M', 'state': 'TX',
+     'age': 25, 'hour': 3, 'is_weekend': 1},
+    {'category': 'grocery_pos', 'amt': 50.0, 'gender': 'F', 'state': 'CA',
+     'age': 35, 'hour': 14, 'is_weekend': 0},
+    {'category': 'shopping_net', 'amt': 820.5, 'gender': 'F', 'state': 'NY',
+     'age': 61, 'hour': 23, 'is_weekend': 1},
+]
+
+
+def start_service(model, port, max_batch_size, max_wait_ms):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'core.service', '--model', model, '--port', str(port),
+         '--max-batch-size', str(max_batch_size), '--max-wait-ms', str(max_wait_ms)],
+        cwd=ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Service gagal start")
+
+
+def get_json(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', path)
+    return json.loads(conn.getresponse().read())
+
+
+def run_clients(port, concurrency, duration):
+    """Jalankan N klien sampai durasi habis, return (latencies_ms, elapsed)"""
+    latencies = [[] for _ in range(concurrency)]
+    stop_at = time.monotonic() + duration
+
+    def client(idx):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        body = [json.dumps(t).encode() for t in TRANSACTIONS]
+        i = idx
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            conn.request('POST', '/score', body=body[i % len(body)],
+                         headers={'Content-Type': 'application/json'})
+            conn.getresponse().read()
+            latencies[idx].append((time.perf_counter() - start) * 1e3)
+            i += 1
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.concatenate([np.asarray(l) for l in latencies]), time.monotonic() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 256])
+    parser.add_argument('--duration', type=float, default=10.0, help="Detik per skenario")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    configs = [('per-request', 1), ('micro-batch', args.max_batch_size)]
+    results = {}
+    for name, batch_size in configs:
+        process = start_service(args.model, args.port, batch_size, args.max_wait_ms)
+        try:
+            for concurrency in args.concurrency:
+                before = get_json(args.port, '/metrics')
+                latencies, elapsed = run_clients(args.port, concurrency, args.duration)
+                after = get_json(args.port, '/metrics')
+                batches = after['batches'] - before['batches']
+                rows = after['rows'] - before['rows']
+                results[(name, concurrency)] = {
+                    'rps': len(latencies) / elapsed,
+                    'p50': np.percentile(latencies, 50),
+                    'p99': np.percentile(latencies, 99),
+                    'mean_batch': rows / batches if batches else 0.0,
+                }
+            histogram = after['batch_size_histogram']
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"[{name}] batch size histogram: {histogram}")
+
+    print(f"\n{'Clients':>8}{'Mode':>14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'batch':>8}{'gain':>8}")
+    print("-" * 68)
+    for concurrency in args.concurrency:
+        base = results[('per-request', concurrency)]['rps']
+        for name, _ in configs:
+            r = results[(name, concurrency)]
+            print(f"{concurrency:>8}{name:>14}{r['rps']:>10,.0f}{r['p50']:>10.2f}"
+                  f"{r['p99']:>10.2f}{r['mean_batch']:>8.1f}{r['rps'] / base:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
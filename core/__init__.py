@@ -0,0 +1 @@
+# Core package for Fraud Detection System (data, features, scoring)
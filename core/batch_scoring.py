@@ -0,0 +1,301 @@
+"""
+Batch Scoring - Scoring file transaksi secara streaming per chunk
+
+Input berupa CSV dengan skema `credit_card_transactions2.csv`. Output berisi
+`trans_num`, `fraud_probability`, `label` dan `risk_factors`, ditulis per
+chunk ke CSV atau Parquet sehingga memori tetap terbatas untuk input
+berukuran multi-GB.
+
+Usage:
+    python -m core.batch_scoring data/credit_card_transactions2.csv \\
+        --output scored.parquet --chunksize 100000
+
+    # Worker pool multi-proses dengan forest memory-mapped (core/worker_pool.py)
+    python -m core.batch_scoring transaksi.csv -o scored.parquet --workers 8
+
+Untuk model dengan fitur velocity/geo, histori kartu dibawa antar chunk
+(`CardHistory`): hasilnya sama dengan backfill atas seluruh file selama
+input terurut menurut `unix_time` (seperti log transaksi, lihat core/replay.py).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.compact_artifact import load_artifacts
+from core.data_loader import read_transactions_csv
+from core.features import derive_features, get_feature_pipeline
+from core.forest import FlatForest
+from core.geo import GEO_INPUT_COLUMNS, geo_features
+from core.scoring import BatchScorer
+from core.velocity import VELOCITY_INPUT_COLUMNS, VELOCITY_WINDOWS, velocity_features
+from core.worker_pool import ForestWorkerPool, PooledBatchScorer
+
+OUTPUT_COLUMNS = ['trans_num', 'fraud_probability', 'label', 'risk_factors']
+
+# Aturan faktor risiko, sama dengan yang ditampilkan di tab Fraud Detection
+HIGH_AMOUNT_THRESHOLD = 500
+RISKY_CATEGORIES = ['gas_transport', 'misc_net', 'shopping_net']
+RISK_FACTOR_NAMES = ['high_amount', 'unusual_hour', 'weekend', 'risky_category']
+
+# Semua kombinasi faktor (bitmask 0..15) → string, dihitung sekali
+_RISK_FACTOR_LOOKUP = np.array([
+    ';'.join(name for bit, name in enumerate(RISK_FACTOR_NAMES) if mask & (1 << bit))
+    for mask in range(1 << len(RISK_FACTOR_NAMES))
+], dtype=object)
+
+
+def risk_factors(df, derived):
+    """
+    Faktor risiko per baris secara vectorized, dipisah dengan ';'
+
+    Args:
+        df: Chunk DataFrame mentah
+        derived: Hasil `derive_features` untuk chunk yang sama
+    """
+    hour = derived['hour']
+    mask = (
+        (np.asarray(df['amt']) > HIGH_AMOUNT_THRESHOLD).astype(np.int8)
+        | (((hour < 6) | (hour > 22)).astype(np.int8) << 1)
+        | (derived['is_weekend'].astype(np.int8) << 2)
+        | (np.isin(np.asarray(df['category'], dtype=object), RISKY_CATEGORIES).astype(np.int8) << 3)
+    )
+    return _RISK_FACTOR_LOOKUP[mask]
+
+
+class CardHistory:
+    """
+    Histori kartu yang dibawa dari chunk sebelumnya untuk fitur velocity/geo
+
+    Tanpa histori, `velocity_features` dan `geo_features` hanya melihat baris
+    di chunk yang sama, sehingga count/amount window dan travel speed reset
+    setiap `chunksize` baris. Baris histori disisipkan di depan chunk berikutnya
+    sebagai konteks lalu dibuang dari hasil. Yang disimpan hanya:
+    - velocity: baris dalam window terbesar sebelum `unix_time` terakhir
+    - geo: transaksi terakhir setiap kartu
+
+    Args:
+        velocity: Pipeline memakai fitur velocity
+        geo: Pipeline memakai fitur geo
+
+    Usage:
+        history = CardHistory(velocity=True, geo=True)
+        chunk = chunk.assign(**history.features(chunk))
+    """
+
+    def __init__(self, velocity=False, geo=False):
+        self.velocity = velocity
+        self.geo = geo
+        columns = ((VELOCITY_INPUT_COLUMNS + ['amt'] if velocity else [])
+                   + (GEO_INPUT_COLUMNS if geo else []))
+        self.columns = list(dict.fromkeys(columns))
+        self._rows = None
+
+    @property
+    def n_rows(self):
+        return 0 if self._rows is None else len(self._rows)
+
+    def features(self, chunk):
+        """
+        Fitur velocity/geo untuk chunk, dihitung bersama histori sebelumnya
+
+        Returns:
+            Dict {nama_fitur: numpy array} dengan urutan baris sama seperti `chunk`
+        """
+        current = pd.DataFrame({col: np.asarray(chunk[col]) for col in self.columns})
+        frame = current if self._rows is None else pd.concat([self._rows, current],
+                                                             ignore_index=True)
+        start = self.n_rows
+        derived = {}
+        if self.velocity:
+            derived.update(velocity_features(frame))
+        if self.geo:
+            derived.update(geo_features(frame))
+        self._rows = self._retain(frame)
+        return {col: values[start:] for col, values in derived.items()}
+
+    def _retain(self, frame):
+        if len(frame) == 0:
+            return self._rows
+        times = np.asarray(frame['unix_time'], dtype=np.int64)
+        keep = np.zeros(len(frame), dtype=bool)
+        if self.velocity:
+            keep |= times > times.max() - max(VELOCITY_WINDOWS.values())
+        if self.geo:
+            # Baris terakhir per kartu dalam urutan (waktu, urutan input)
+            latest = frame.iloc[np.argsort(times, kind='stable')].drop_duplicates(
+                'cc_num', keep='last').index
+            keep[latest] = True
+        return frame[keep].reset_index(drop=True)
+
+
+def iter_scored_chunks(source, scorer, chunksize=100_000, threshold=0.5):
+    """
+    Baca sumber per chunk dan yield hasil scoring
+
+    Args:
+        source: Path atau file-like object CSV
+        scorer: BatchScorer (core/scoring.py)
+        chunksize: Jumlah baris per chunk
+        threshold: Batas probabilitas untuk label fraud
+
+    Yields:
+        (DataFrame hasil, jumlah baris di chunk)
+    """
+    pipeline = scorer.feature_pipeline
+    usecols = ['trans_num'] + pipeline.input_columns
+    reference_year = pipeline.reference_year
+    history = (CardHistory(velocity=pipeline.velocity, geo=pipeline.geo)
+               if pipeline.velocity or pipeline.geo else None)
+    for chunk in read_transactions_csv(source, usecols=usecols, chunksize=chunksize):
+        # Tanggal di-parse sekali per chunk: kolom turunan yang sudah ada
+        # dipakai langsung oleh FeaturePipeline.transform dan risk_factors
+        derived = derive_features(chunk, reference_year)
+        if history is not None:
+            # Kolom velocity/geo yang sudah ada tidak dihitung ulang per chunk
+            # oleh FeaturePipeline.transform
+            derived.update(history.features(chunk))
+        chunk = chunk.assign(**derived)
+        proba = scorer.predict_proba(chunk)
+        result = pd.DataFrame({
+            'trans_num': chunk['trans_num'].to_numpy(),
+            'fraud_probability': proba.astype(np.float32),
+            'label': (proba > threshold).astype(np.int8),
+            'risk_factors': risk_factors(chunk, derived),
+        })
+        yield result, len(chunk)
+
+
+class _ChunkWriter:
+    """Tulis chunk secara incremental ke CSV (append) atau Parquet (row group)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_parquet = path.lower().endswith('.parquet')
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.is_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a',
+                      header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        elif self._first:
+            # Input kosong: tetap tulis file dengan header saja
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(self.path, index=False)
+
+
+def score_file(source, output_path, scorer, chunksize=100_000, threshold=0.5,
+               progress_callback=None):
+    """
+    Scoring seluruh file dan tulis hasil ke `output_path`
+
+    Args:
+        source: Path atau file-like object CSV
+        output_path: File output (.csv atau .parquet)
+        scorer: BatchScorer (core/scoring.py)
+        progress_callback: Fungsi opsional `f(fraction, rows, rows_per_sec)`
+
+    Returns:
+        Dict ringkasan: rows, fraud, seconds, rows_per_sec
+    """
+    close_source = isinstance(source, (str, os.PathLike))
+    handle = open(source, 'rb') if close_source else source
+    total_bytes = _size_of(handle)
+
+    writer = _ChunkWriter(output_path)
+    rows = fraud = 0
+    start = time.perf_counter()
+    try:
+        for result, n in iter_scored_chunks(handle, scorer, chunksize, threshold):
+            writer.write(result)
+            rows += n
+            fraud += int(result['label'].sum())
+            if progress_callback is not None:
+                elapsed = time.perf_counter() - start
+                fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else 0.0
+                progress_callback(fraction, rows, rows / elapsed if elapsed else 0.0)
+    finally:
+        writer.close()
+        if close_source:
+            handle.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'fraud': fraud,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else 0.0,
+    }
+
+
+def _size_of(handle):
+    try:
+        return os.fstat(handle.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        size = getattr(handle, 'size', None)
+        if size is None:
+            position = handle.tell()
+            size = handle.seek(0, os.SEEK_END)
+            handle.seek(position)
+        return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch scoring file transaksi (headless)")
+    parser.add_argument('input', help="CSV transaksi dengan skema credit_card_transactions2.csv")
+    parser.add_argument('--output', '-o', required=True, help="File output (.csv atau .parquet)")
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'),
+                        help="File pickle atau folder compact (core/compact_artifact.py)")
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Jumlah proses worker (0 = sklearn in-process dengan semua core)")
+    parser.add_argument('--forest-dir', default=os.path.join('models', 'flat_forest'),
+                        help="Folder FlatForest .npy untuk mode worker (diekspor jika belum ada)")
+    args = parser.parse_args(argv)
+
+    artifacts = load_artifacts(args.model)
+
+    pool = None
+    if args.workers > 0:
+        if not os.path.exists(args.forest_dir):
+            if not hasattr(artifacts['model'], 'estimators_'):
+                parser.error("Artifacts compact tidak bisa diekspor ke FlatForest; "
+                             "isi --forest-dir dengan folder hasil training")
+            FlatForest.from_sklearn(artifacts['model']).save(args.forest_dir)
+        pool = ForestWorkerPool(args.forest_dir, n_workers=args.workers, chunk_rows=2048)
+        scorer = PooledBatchScorer(get_feature_pipeline(artifacts), pool,
+                                   artifacts.get('prior_neg_rate'))
+    else:
+        scorer = BatchScorer.from_artifacts(artifacts)
+
+    def report(fraction, rows, rows_per_sec):
+        print(f"   {fraction * 100:5.1f}% | {rows:,} rows | {rows_per_sec:,.0f} rows/sec")
+
+    try:
+        summary = score_file(args.input, args.output, scorer, chunksize=args.chunksize,
+                             threshold=args.threshold, progress_callback=report)
+    finally:
+        if pool is not None:
+            pool.close()
+    print(f"✓ Scored {summary['rows']:,} rows in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_sec']:,.0f} rows/sec), {summary['fraud']:,} flagged as fraud")
+    print(f"✓ Output: {os.path.abspath(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
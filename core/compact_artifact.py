@@ -0,0 +1,328 @@
+"""
+Compact Artifact - Format model terkuantisasi pengganti pickle
+
+Pickle artifacts menyimpan seluruh graf objek sklearn (ratusan ribu objek
+Python untuk 200 tree), jadi waktu load sebanding dengan jumlah objek.
+Format compact adalah satu folder berisi array datar + header JSON kecil:
+
+    <dir>/header.json    versi format, metadata forest, FeaturePipeline
+                         (vocabulary, mean/scale scaler, opsi fitur, tabel
+                         target encoding), performance dan model_info
+          feature.npy    int16   indeks fitur per node (0 untuk leaf)
+          threshold.npy  float32 threshold (dibulatkan ke bawah, hasil split
+                                 identik dengan sklearn untuk input float32)
+          right.npy      int32   child kanan global (leaf: dirinya sendiri)
+          left.npy       int32   hanya jika child kiri != node + 1 (tree
+                                 sklearn depth-first selalu node + 1)
+          leaf.npy       uint8 / float16 probabilitas fraud per node
+          roots.npy      int32   root setiap tree
+
+Array dibuka dengan `np.load(mmap_mode='r')`, jadi load hanya membaca header
+dan memetakan file (milidetik). Kuantisasi leaf uint8 membatasi error
+probabilitas per tree pada 1/510; rata-rata forest tidak pernah lebih buruk
+dari itu. Spatial index dan blok hashing (input CSR, sedangkan traversal
+FlatForest butuh input dense) belum didukung; pakai pickle untuk model
+tersebut.
+
+Usage:
+    python -m core.compact_artifact export --model models/fraud_detection_model.pkl \\
+        --output models/compact --leaf-dtype uint8
+    artifacts = load_artifacts('models/compact')      # atau path .pkl
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from core.features import FeaturePipeline, get_feature_pipeline
+from core.forest import FlatForest, _BLOCK_ELEMENTS
+from core.target_encoding import TargetEncoder
+
+FORMAT_VERSION = 1
+HEADER_FILE = 'header.json'
+LEAF_DTYPES = {'uint8': 255.0, 'float16': 1.0}
+
+
+class QuantizedForest(FlatForest):
+    """
+    FlatForest dengan feature int16 dan probabilitas fraud leaf terkuantisasi
+
+    Traversal (`apply`) sama dengan FlatForest; hanya agregasi leaf yang
+    berbeda: p = sum(leaf) * leaf_scale / n_trees.
+    """
+
+    def __init__(self, feature, threshold, left, right, leaf, leaf_scale, roots,
+                 max_depth, n_features, classes):
+        super().__init__(feature, threshold, left, right, None, roots,
+                         max_depth, n_features, classes)
+        self.leaf = leaf
+        self.leaf_scale = float(leaf_scale)
+        self._positive = int(np.flatnonzero(self.classes_ == 1)[0])
+
+    def predict_proba(self, X):
+        """Probabilitas kelas (n, 2), urutan kolom mengikuti `classes_`"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        fraud = np.empty(X.shape[0], dtype=np.float64)
+        block = max(1, _BLOCK_ELEMENTS // self.n_trees)
+        for start in range(0, X.shape[0], block):
+            leaves = self.apply(X[start:start + block])
+            fraud[start:start + block] = self.leaf[leaves].sum(axis=1, dtype=np.float64)
+        fraud *= 1.0 / (self.leaf_scale * self.n_trees)
+        out = np.empty((X.shape[0], 2), dtype=np.float64)
+        out[:, self._positive] = fraud
+        out[:, 1 - self._positive] = 1.0 - fraud
+        return out
+
+
+# ============================================================================
+# FOREST
+# ============================================================================
+
+def quantize_forest(model, leaf_dtype='uint8'):
+    """
+    Array compact dari RandomForestClassifier biner
+
+    Returns:
+        (arrays, meta) dengan arrays berupa dict nama → ndarray
+    """
+    if leaf_dtype not in LEAF_DTYPES:
+        raise ValueError(f"leaf_dtype harus salah satu dari {list(LEAF_DTYPES)}")
+    flat = FlatForest.from_sklearn(model)
+    if len(flat.classes_) != 2:
+        raise ValueError("Format compact hanya untuk klasifikasi biner")
+    if flat.n_features > np.iinfo(np.int16).max:
+        raise ValueError(f"{flat.n_features} fitur tidak muat di int16")
+
+    node = np.arange(flat.n_nodes, dtype=np.int32)
+    internal = flat.left != node
+    fraud = flat.value[:, int(np.flatnonzero(flat.classes_ == 1)[0])]
+    scale = LEAF_DTYPES[leaf_dtype]
+    arrays = {
+        'feature': flat.feature.astype(np.int16),
+        'threshold': flat.threshold,
+        'right': flat.right,
+        'leaf': (np.round(fraud * scale).astype(np.uint8) if leaf_dtype == 'uint8'
+                 else fraud.astype(np.float16)),
+        'roots': flat.roots,
+    }
+    if not np.array_equal(flat.left[internal], node[internal] + 1):
+        arrays['left'] = flat.left
+    meta = {
+        'n_trees': flat.n_trees,
+        'n_nodes': flat.n_nodes,
+        'max_depth': flat.max_depth,
+        'n_features': flat.n_features,
+        'classes': flat.classes_.tolist(),
+        'leaf_dtype': leaf_dtype,
+        'leaf_scale': scale,
+    }
+    return arrays, meta
+
+
+def _forest_from_arrays(arrays, meta):
+    right = arrays['right']
+    left = arrays.get('left')
+    if left is None:
+        # Child kiri implisit: node + 1, kecuali leaf (self-loop, right == node)
+        node = np.arange(len(right), dtype=np.int32)
+        left = np.where(right == node, node, node + 1).astype(np.int32)
+    return QuantizedForest(arrays['feature'], arrays['threshold'], left, right,
+                           arrays['leaf'], meta['leaf_scale'], arrays['roots'],
+                           meta['max_depth'], meta['n_features'], meta['classes'])
+
+
+# ============================================================================
+# FEATURE PIPELINE
+# ============================================================================
+
+def pipeline_header(pipeline):
+    """State FeaturePipeline yang JSON-serializable"""
+    if pipeline.spatial_index is not None:
+        raise ValueError("Spatial index belum didukung format compact; simpan sebagai pickle")
+    if pipeline.hasher is not None:
+        raise ValueError("Blok hashing sparse belum didukung format compact (FlatForest "
+                         "butuh input dense); simpan sebagai pickle")
+    scaler = pipeline.scaler
+    header = {
+        'reference_year': pipeline.reference_year,
+        'velocity': pipeline.velocity,
+        'geo': pipeline.geo,
+        'feature_columns': list(pipeline.feature_columns),
+        'categorical_cols': list(pipeline.categorical_cols),
+        'numerical_cols': list(pipeline.numerical_cols),
+        # Nilai kategori dalam urutan kode (setelah `extend` tidak lagi alfabetis)
+        'vocab': {col: sorted(mapping, key=mapping.get) for col, mapping in pipeline.vocab.items()},
+        'scaler': {
+            'mean': scaler.mean_.tolist(),
+            'scale': scaler.scale_.tolist(),
+            'var': scaler.var_.tolist(),
+            'n_samples_seen': int(np.max(scaler.n_samples_seen_)),
+        },
+        'target_encoders': None,
+    }
+    if pipeline.target_encoders is not None:
+        header['target_encoders'] = {
+            col: {
+                'smoothing': enc.smoothing,
+                'values': sorted(enc.index, key=enc.index.get),
+                'counts': enc.counts[:len(enc.index)].tolist(),
+                'frauds': enc.frauds[:len(enc.index)].tolist(),
+                'total_count': enc.total_count,
+                'total_fraud': enc.total_fraud,
+            }
+            for col, enc in pipeline.target_encoders.items()
+        }
+    return header
+
+
+def pipeline_from_header(header):
+    """Bangun ulang FeaturePipeline dari `pipeline_header`"""
+    pipeline = FeaturePipeline(reference_year=header['reference_year'],
+                               velocity=header['velocity'], geo=header['geo'],
+                               target_encoding=header['target_encoders'] is not None)
+    pipeline.feature_columns = list(header['feature_columns'])
+    pipeline.categorical_cols = list(header['categorical_cols'])
+    pipeline.numerical_cols = list(header['numerical_cols'])
+    pipeline.vocab = {col: {value: code for code, value in enumerate(values)}
+                      for col, values in header['vocab'].items()}
+    pipeline._seen = {col: set(values) for col, values in header['vocab'].items()}
+
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(header['scaler']['mean'])
+    scaler.scale_ = np.asarray(header['scaler']['scale'])
+    scaler.var_ = np.asarray(header['scaler']['var'])
+    scaler.n_samples_seen_ = header['scaler']['n_samples_seen']
+    scaler.n_features_in_ = len(scaler.mean_)
+    pipeline.scaler = scaler
+
+    for col, state in (header['target_encoders'] or {}).items():
+        enc = TargetEncoder(state['smoothing'])
+        enc.index = {value: i for i, value in enumerate(state['values'])}
+        enc.counts = np.asarray(state['counts'], dtype=np.float64)
+        enc.frauds = np.asarray(state['frauds'], dtype=np.float64)
+        enc.total_count = state['total_count']
+        enc.total_fraud = state['total_fraud']
+        pipeline.target_encoders[col] = enc
+    return pipeline
+
+
+# ============================================================================
+# SAVE / LOAD
+# ============================================================================
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def save_compact(artifacts, directory, leaf_dtype='uint8'):
+    """
+    Tulis artifacts (model + pipeline + metadata) ke format compact
+
+    Hanya `model`, FeaturePipeline, `feature_columns`, `prior_neg_rate`,
+    `performance` dan `model_info` yang disimpan; hasil cv/search/surrogate
+    tetap di pickle.
+
+    Jika artifacts tidak bisa diekspor (ValueError, mis. spatial index),
+    folder compact lama di `directory` dihapus sebelum error diteruskan,
+    supaya `load_artifacts` tidak diam-diam melayani model sebelumnya.
+
+    Returns:
+        Total ukuran file (bytes)
+    """
+    try:
+        arrays, forest_meta = quantize_forest(artifacts['model'], leaf_dtype)
+        pipeline = get_feature_pipeline(artifacts)
+        header = {
+            'format_version': FORMAT_VERSION,
+            'forest': forest_meta,
+            'arrays': sorted(arrays),
+            'pipeline': pipeline_header(pipeline),
+            'feature_columns': list(artifacts.get('feature_columns', pipeline.output_columns)),
+            'prior_neg_rate': artifacts.get('prior_neg_rate'),
+            'performance': artifacts.get('performance', {}),
+            'model_info': artifacts.get('model_info', {}),
+        }
+    except ValueError:
+        remove_compact(directory)
+        raise
+
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith('.npy'):
+            os.remove(os.path.join(directory, name))
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, name + '.npy'), array)
+    with open(os.path.join(directory, HEADER_FILE), 'w') as f:
+        json.dump(header, f, default=_json_default)
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def remove_compact(directory):
+    """Hapus folder compact (hanya jika berisi header format ini)"""
+    if os.path.isfile(os.path.join(directory, HEADER_FILE)):
+        shutil.rmtree(directory)
+
+
+def load_compact(directory, mmap_mode='r'):
+    """
+    Load folder compact sebagai dict artifacts (model = QuantizedForest)
+
+    Dict yang dihasilkan kompatibel dengan `TransactionScorer.from_artifacts`,
+    `BatchScorer.from_artifacts` dan `get_feature_pipeline`.
+    """
+    with open(os.path.join(directory, HEADER_FILE)) as f:
+        header = json.load(f)
+    if header['format_version'] > FORMAT_VERSION:
+        raise ValueError(f"Format compact v{header['format_version']} lebih baru dari "
+                         f"yang didukung (v{FORMAT_VERSION})")
+    arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)
+              for name in header['arrays']}
+    pipeline = pipeline_from_header(header['pipeline'])
+    return {
+        'model': _forest_from_arrays(arrays, header['forest']),
+        'feature_pipeline': pipeline,
+        'scaler': pipeline.scaler,
+        'target_encoders': pipeline.target_encoders,
+        'feature_columns': header['feature_columns'],
+        'numerical_cols': pipeline.numerical_cols,
+        'categorical_cols': pipeline.categorical_cols,
+        'prior_neg_rate': header.get('prior_neg_rate'),
+        'performance': header['performance'],
+        'model_info': header['model_info'],
+    }
+
+
+def load_artifacts(path):
+    """Load artifacts dari folder compact atau file pickle"""
+    if os.path.isdir(path):
+        return load_compact(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Format artifacts compact (terkuantisasi)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help="Konversi model pickle ke folder compact")
+    export.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    export.add_argument('--output', default=os.path.join('models', 'compact'))
+    export.add_argument('--leaf-dtype', default='uint8', choices=list(LEAF_DTYPES))
+    args = parser.parse_args(argv)
+
+    with open(args.model, 'rb') as f:
+        artifacts = pickle.load(f)
+    size = save_compact(artifacts, args.output, args.leaf_dtype)
+    print(f"✓ Compact artifact ({args.leaf_dtype} leaves): {size / 1024**2:.2f} MB "
+          f"(pickle {os.path.getsize(args.model) / 1024**2:.2f} MB) → {os.path.abspath(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+CV - Cross-validation satu pass dengan probabilitas out-of-fold
+
+Setiap fold di-fit tepat sekali (fold dijalankan paralel lewat joblib) dan
+dari satu `predict_proba` per fold dihitung semua metrik sekaligus:
+accuracy, precision, recall, F1 dan ROC-AUC. Probabilitas out-of-fold
+(OOF) untuk setiap baris training disimpan, sehingga threshold dan
+kalibrasi bisa dituning tanpa fit tambahan.
+
+Usage:
+    result = cross_validate_oof(model, X_train, y_train, n_folds=5)
+    result['mean']['recall'], result['oof_proba']
+"""
+import os
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import (accuracy_score, f1_score, precision_recall_curve,
+                             precision_score, recall_score, roc_auc_score)
+from sklearn.model_selection import StratifiedKFold
+
+from core.sampling import fit_downsampled, fraud_proba, majority_weights, prior_neg_rate
+
+METRICS = ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc']
+
+
+def classification_metrics(y_true, proba, threshold=0.5, sample_weight=None):
+    """
+    Semua metrik evaluasi dari satu vektor probabilitas fraud
+
+    `sample_weight` dipakai untuk baris hasil downsampling (core/sampling.py)
+    agar metrik mencerminkan distribusi kelas aslinya.
+    """
+    y_pred = (proba >= threshold).astype(int)
+    w = {'sample_weight': sample_weight}
+    return {
+        'accuracy': accuracy_score(y_true, y_pred, **w),
+        'precision': precision_score(y_true, y_pred, zero_division=0, **w),
+        'recall': recall_score(y_true, y_pred, **w),
+        'f1_score': f1_score(y_true, y_pred, **w),
+        'roc_auc': roc_auc_score(y_true, proba, **w),
+    }
+
+
+def best_f1_threshold(y_true, proba, sample_weight=None):
+    """Threshold dengan F1 tertinggi pada probabilitas OOF"""
+    precision, recall, thresholds = precision_recall_curve(y_true, proba,
+                                                           sample_weight=sample_weight)
+    f1 = 2 * precision[:-1] * recall[:-1] / np.maximum(precision[:-1] + recall[:-1], 1e-12)
+    best = int(np.argmax(f1))
+    return float(thresholds[best]), float(f1[best])
+
+
+def take_rows(X, index):
+    """Subset baris untuk DataFrame (iloc), ndarray atau CSR"""
+    return X.iloc[index] if hasattr(X, 'iloc') else X[index]
+
+
+def _fit_fold(model, X, y, train_index, valid_index, neg_rate, correction):
+    fit_downsampled(model, take_rows(X, train_index), y[train_index], neg_rate, correction)
+    return fraud_proba(model, take_rows(X, valid_index), prior_neg_rate(neg_rate, correction))
+
+
+def cross_validate_oof(model, X, y, n_folds=5, n_jobs=-1, random_state=42,
+                       neg_rate=1.0, correction='prior'):
+    """
+    Stratified K-fold: satu fit per fold, semua metrik + probabilitas OOF
+
+    Fold berjalan paralel; core sisanya dibagi ke estimator di dalam fold
+    (`n_jobs` model) agar tidak terjadi oversubscription.
+
+    Args:
+        model: Estimator sklearn (di-clone per fold, tidak diubah)
+        X: DataFrame, ndarray atau CSR
+        y: Label 0/1
+        n_folds: Jumlah fold
+        n_jobs: Jumlah worker paralel untuk fold (-1 = semua core)
+        neg_rate: Jika X sudah di-downsample (core/sampling.py), fraksi
+            non-fraud yang dipertahankan; fit fold memakai koreksi yang sama
+            dengan model final dan metrik diberi bobot 1/neg_rate
+        correction: Mode koreksi downsampling ('prior' / 'weights'); dengan
+            'prior' probabilitas OOF sudah dikoreksi seperti saat scoring
+
+    Returns:
+        Dict dengan 'folds' (metrik per fold), 'mean', 'std',
+        'oof_proba' (float32 per baris X) dan 'best_threshold'
+    """
+    y = np.asarray(y)
+    n_cpus = os.cpu_count() or 1
+    n_workers = min(n_folds, n_cpus if n_jobs is None or n_jobs < 0 else n_jobs)
+    fold_model = clone(model)
+    if 'n_jobs' in fold_model.get_params():
+        fold_model.set_params(n_jobs=max(1, n_cpus // n_workers))
+
+    splits = list(StratifiedKFold(n_splits=n_folds, shuffle=True,
+                                  random_state=random_state).split(np.zeros(len(y)), y))
+    probas = Parallel(n_jobs=n_workers)(
+        delayed(_fit_fold)(clone(fold_model), X, y, train_index, valid_index,
+                           neg_rate, correction)
+        for train_index, valid_index in splits
+    )
+
+    weights = majority_weights(y, neg_rate) if neg_rate < 1 else None
+    oof = np.empty(len(y), dtype=np.float32)
+    folds = []
+    for (_, valid_index), proba in zip(splits, probas):
+        oof[valid_index] = proba
+        folds.append(classification_metrics(
+            y[valid_index], proba,
+            sample_weight=None if weights is None else weights[valid_index]))
+
+    scores = {m: np.array([f[m] for f in folds]) for m in METRICS}
+    threshold, threshold_f1 = best_f1_threshold(y, oof, weights)
+    return {
+        'n_folds': n_folds,
+        'folds': folds,
+        'mean': {m: float(v.mean()) for m, v in scores.items()},
+        'std': {m: float(v.std()) for m, v in scores.items()},
+        'oof_proba': oof,
+        'best_threshold': {'threshold': threshold, 'f1_score': threshold_f1},
+    }
+
+
+def print_cv_report(result):
+    """Tabel metrik per fold + mean ± std"""
+    print(f"\n{'Fold':<8}" + "".join(f"{m:>11}" for m in METRICS))
+    print("-" * (8 + 11 * len(METRICS)))
+    for i, fold in enumerate(result['folds'], 1):
+        print(f"{i:<8}" + "".join(f"{fold[m]:>11.4f}" for m in METRICS))
+    print("-" * (8 + 11 * len(METRICS)))
+    print(f"{'mean':<8}" + "".join(f"{result['mean'][m]:>11.4f}" for m in METRICS))
+    print(f"{'± std':<8}" + "".join(f"{result['std'][m]:>11.4f}" for m in METRICS))
+    best = result['best_threshold']
+    print(f"\nThreshold F1 terbaik (OOF): {best['threshold']:.3f} (F1 {best['f1_score']:.4f})")
@@ -0,0 +1,184 @@
+"""
+Data Loader - Typed columnar cache untuk dataset transaksi
+
+CSV mentah di-parse sekali dengan dtype yang tepat (categorical, float32,
+int8, datetime) lalu disimpan sebagai Parquet di `data/.cache/`. Cache
+hanya di-rebuild jika content hash CSV berubah.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_CSV_PATH = os.path.join('data', 'credit_card_transactions2.csv')
+CACHE_DIR_NAME = '.cache'
+
+# Naikkan jika skema dtype di bawah berubah, agar cache lama tidak dipakai
+CACHE_VERSION = 1
+
+DATETIME_COLS = ['trans_date_trans_time', 'dob']
+
+COLUMN_DTYPES = {
+    'Unnamed: 0': 'int32',
+    'cc_num': 'int64',
+    'merchant': 'category',
+    'category': 'category',
+    'amt': 'float32',
+    'first': 'category',
+    'last': 'category',
+    'gender': 'category',
+    'street': 'category',
+    'city': 'category',
+    'state': 'category',
+    'zip': 'int32',
+    'lat': 'float32',
+    'long': 'float32',
+    'city_pop': 'int32',
+    'job': 'category',
+    'trans_num': 'object',
+    'unix_time': 'int64',
+    'merch_lat': 'float32',
+    'merch_long': 'float32',
+    'is_fraud': 'int8',
+    'merch_zipcode': 'float32',
+}
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """
+    Hitung content hash (BLAKE2b) dari sebuah file secara streaming
+
+    Args:
+        path: Path ke file
+
+    Returns:
+        Hex digest dari isi file
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_hash(path, cache_dir=None):
+    """
+    Content hash dengan memo berdasarkan (size, mtime) di sidecar JSON.
+
+    Hash hanya dihitung ulang jika ukuran atau mtime file berubah, sehingga
+    cold start tidak perlu membaca seluruh CSV hanya untuk validasi cache.
+    """
+    cache_dir = cache_dir or _default_cache_dir(path)
+    stat = os.stat(path)
+    meta_path = os.path.join(cache_dir, _stem(path) + '.hash.json')
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            return meta['hash']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = file_hash(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write_text(meta_path, json.dumps({
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': digest,
+    }))
+    return digest
+
+
+def read_transactions_csv(path, **kwargs):
+    """
+    Baca CSV transaksi dengan dtype yang sudah ditentukan (tanpa cache)
+
+    Args:
+        path: Path ke CSV
+        **kwargs: Diteruskan ke `pd.read_csv` (mis. `chunksize`, `usecols`)
+    """
+    usecols = kwargs.get('usecols')
+    dtypes = COLUMN_DTYPES
+    parse_dates = DATETIME_COLS
+    if usecols is not None:
+        dtypes = {c: t for c, t in COLUMN_DTYPES.items() if c in usecols}
+        parse_dates = [c for c in DATETIME_COLS if c in usecols]
+    return pd.read_csv(path, dtype=dtypes, parse_dates=parse_dates,
+                       date_format='ISO8601', **kwargs)
+
+
+def load_transactions(path=DEFAULT_CSV_PATH, columns=None, cache_dir=None):
+    """
+    Load dataset transaksi melalui typed columnar cache
+
+    Args:
+        path: Path ke CSV mentah
+        columns: Subset kolom yang dibaca dari cache (opsional)
+        cache_dir: Folder cache (default: `<folder CSV>/.cache`)
+
+    Returns:
+        DataFrame dengan dtype categorical/float32/int8/datetime
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        # Tanpa pyarrow tidak ada cache, tetapi dtype tetap typed
+        return read_transactions_csv(path, usecols=columns)
+
+    cache_dir = cache_dir or _default_cache_dir(path)
+    cache_path = cache_path_for(path, cache_dir)
+
+    if not os.path.exists(cache_path):
+        build_cache(path, cache_dir)
+
+    return pd.read_parquet(cache_path, columns=columns)
+
+
+def cache_path_for(path, cache_dir=None):
+    """Path file Parquet cache untuk versi CSV saat ini"""
+    cache_dir = cache_dir or _default_cache_dir(path)
+    digest = cached_file_hash(path, cache_dir)
+    name = f"{_stem(path)}-{digest[:16]}-v{CACHE_VERSION}.parquet"
+    return os.path.join(cache_dir, name)
+
+
+def build_cache(path, cache_dir=None):
+    """
+    Parse CSV dan tulis Parquet cache (atomic), hapus cache versi lama
+
+    Returns:
+        Path file cache yang baru ditulis
+    """
+    cache_dir = cache_dir or _default_cache_dir(path)
+    cache_path = cache_path_for(path, cache_dir)
+
+    df = read_transactions_csv(path)
+    tmp_path = cache_path + '.tmp'
+    df.to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, cache_path)
+
+    prefix = _stem(path) + '-'
+    for name in os.listdir(cache_dir):
+        full = os.path.join(cache_dir, name)
+        if name.startswith(prefix) and name.endswith('.parquet') and full != cache_path:
+            os.remove(full)
+    return cache_path
+
+
+def _default_cache_dir(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def _stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _atomic_write_text(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
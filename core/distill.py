@@ -0,0 +1,234 @@
+"""
+Distill - Surrogate kecil yang meniru probabilitas Random Forest
+
+Forest produksi (200 tree, depth 15) butuh ratusan µs per baris bahkan
+lewat FlatForest, karena biayanya ditentukan jumlah tree x kedalaman. Untuk
+jalur otorisasi, model kecil dilatih meniru probabilitas forest pada data
+training (soft label) dengan regresi:
+
+    'tree'    satu DecisionTree depth 8
+    'forest'  8 tree depth 6
+    'gbm'     gradient boosting 40 tree depth 3
+
+Hasilnya diratakan ke `CompactModel`: list Python datar yang ditelusuri
+dengan loop skalar. Untuk beberapa lusin node per baris ini jauh lebih
+cepat daripada dispatch numpy/sklearn (~µs per baris). Fidelity diukur
+pada test set: agreement label dengan teacher, selisih probabilitas, dan
+selisih ROC-AUC terhadap label asli.
+
+Teacher dan surrogate disimpan berdampingan di artifacts
+(`artifacts['surrogate']`); `select_model` memilih salah satunya saat load.
+
+Usage:
+    result = distill(teacher, X_train, soft_labels, X_test, y_test)
+    artifacts['surrogate'] = result
+    scorer = TransactionScorer.from_artifacts(select_model(artifacts, 'surrogate'))
+"""
+import time
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import roc_auc_score
+from sklearn.tree import DecisionTreeRegressor
+
+from core.forest import FlatForest
+
+SURROGATES = {
+    'tree': lambda: DecisionTreeRegressor(max_depth=8, min_samples_leaf=20, random_state=42),
+    'forest': lambda: RandomForestRegressor(n_estimators=8, max_depth=6, min_samples_leaf=20,
+                                            random_state=42, n_jobs=-1),
+    'gbm': lambda: GradientBoostingRegressor(n_estimators=40, max_depth=3, learning_rate=0.2,
+                                             random_state=42),
+}
+MODEL_CHOICES = ['teacher', 'surrogate']
+
+# Di atas ukuran batch ini estimator sklearn (vectorized) dipakai alih-alih loop skalar
+SCALAR_MAX_BATCH = 64
+LATENCY_SAMPLES = 2000
+
+
+class CompactModel:
+    """
+    Ensemble regression tree kecil dengan API `predict_proba` classifier
+
+    p(fraud) = clip(bias + scale * sum(leaf setiap tree), 0, 1)
+
+    Node disimpan sebagai list Python (bukan array numpy) karena akses
+    skalar list jauh lebih murah untuk traversal satu baris.
+
+    Args:
+        estimator: DecisionTreeRegressor, RandomForestRegressor atau
+            GradientBoostingRegressor yang sudah di-fit pada probabilitas fraud
+        kind: Nama surrogate (kunci SURROGATES)
+    """
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, estimator, kind):
+        self.kind = kind
+        self.estimator = estimator
+        self.n_features_in_ = estimator.n_features_in_
+        if isinstance(estimator, GradientBoostingRegressor):
+            trees = [e.tree_ for e in estimator.estimators_[:, 0]]
+            self.bias = float(estimator.init_.predict(np.zeros((1, self.n_features_in_)))[0])
+            self.scale = float(estimator.learning_rate)
+        elif hasattr(estimator, 'estimators_'):
+            trees = [e.tree_ for e in estimator.estimators_]
+            self.bias, self.scale = 0.0, 1.0 / len(trees)
+        else:
+            trees = [estimator.tree_]
+            self.bias, self.scale = 0.0, 1.0
+
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        for tree in trees:
+            offset = len(feature)
+            roots.append(offset)
+            is_leaf = tree.children_left == -1
+            feature += tree.feature.tolist()
+            threshold += tree.threshold.tolist()
+            # Leaf ditandai left = -1; indeks child digeser ke offset global
+            left += np.where(is_leaf, -1, tree.children_left + offset).tolist()
+            right += np.where(is_leaf, -1, tree.children_right + offset).tolist()
+            value += tree.value[:, 0, 0].tolist()
+        self._nodes = (feature, threshold, left, right, value)
+        self._roots = roots
+
+    @property
+    def n_trees(self):
+        return len(self._roots)
+
+    @property
+    def n_nodes(self):
+        return len(self._nodes[0])
+
+    def predict_row(self, x):
+        """Probabilitas fraud untuk satu baris (sequence float, urutan feature_columns)"""
+        feature, threshold, left, right, value = self._nodes
+        total = 0.0
+        for node in self._roots:
+            while left[node] != -1:
+                node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+            total += value[node]
+        p = self.bias + self.scale * total
+        return 0.0 if p < 0.0 else 1.0 if p > 1.0 else p
+
+    def predict_proba(self, X):
+        """Probabilitas [aman, fraud] per baris, seperti classifier sklearn"""
+        if hasattr(X, 'to_numpy'):
+            X = X.to_numpy()
+        if len(X) == 1:
+            p = self.predict_row(np.asarray(X[0], dtype=np.float32).tolist())
+            return np.array([[1.0 - p, p]])
+        if len(X) <= SCALAR_MAX_BATCH:
+            # Input float32 (sama seperti tree sklearn), dibaca sebagai float Python
+            rows = np.asarray(X, dtype=np.float32).tolist()
+            fraud = np.array([self.predict_row(row) for row in rows])
+        else:
+            fraud = np.clip(self.estimator.predict(np.asarray(X, dtype=np.float32)), 0.0, 1.0)
+        return np.column_stack([1.0 - fraud, fraud])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def single_row_latency_us(predict_one, X, n=LATENCY_SAMPLES):
+    """Median latency `predict_one(row)` untuk baris (1, n_features) float32 (µs)"""
+    X = np.asarray(X, dtype=np.float32)
+    timings = np.empty(min(n, len(X)))
+    for i in range(len(timings)):
+        row = X[i:i + 1]
+        start = time.perf_counter()
+        predict_one(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1e6)
+
+
+def fidelity(teacher_proba, surrogate_proba, y_true, threshold=0.5):
+    """Kecocokan surrogate terhadap teacher pada data evaluasi"""
+    teacher_auc = roc_auc_score(y_true, teacher_proba)
+    surrogate_auc = roc_auc_score(y_true, surrogate_proba)
+    return {
+        'agreement': float(np.mean((teacher_proba >= threshold) == (surrogate_proba >= threshold))),
+        'mean_abs_diff': float(np.mean(np.abs(teacher_proba - surrogate_proba))),
+        'teacher_auc': float(teacher_auc),
+        'surrogate_auc': float(surrogate_auc),
+        'auc_gap': float(teacher_auc - surrogate_auc),
+    }
+
+
+def distill(teacher, X_fit, soft_labels, X_eval, y_eval, kinds=None):
+    """
+    Latih semua surrogate kandidat dan pilih yang paling setia pada teacher
+
+    Args:
+        teacher: Forest yang sudah di-fit
+        X_fit: Baris untuk melatih surrogate (biasanya X_train)
+        soft_labels: Probabilitas fraud teacher untuk X_fit
+        X_eval, y_eval: Data evaluasi fidelity (test set)
+        kinds: Subset SURROGATES (default semua)
+
+    Returns:
+        Dict {'kind', 'model', 'fidelity', 'candidates'}; 'candidates'
+        berisi report setiap kandidat (tanpa model)
+    """
+    teacher_proba = teacher.predict_proba(X_eval)[:, 1]
+    X_fit = np.asarray(X_fit, dtype=np.float32)
+    X_eval = np.asarray(X_eval, dtype=np.float32)
+    y_eval = np.asarray(y_eval)
+    flat_teacher = FlatForest.from_sklearn(teacher)
+    teacher_us = single_row_latency_us(flat_teacher.predict_proba, X_eval, n=200)
+
+    candidates, models = [], {}
+    for kind in kinds or list(SURROGATES):
+        start = time.perf_counter()
+        model = CompactModel(SURROGATES[kind]().fit(X_fit, soft_labels), kind)
+        fit_seconds = time.perf_counter() - start
+        surrogate_proba = model.predict_proba(X_eval)[:, 1]
+        latency_us = single_row_latency_us(model.predict_proba, X_eval)
+        candidates.append({
+            'kind': kind,
+            'n_trees': model.n_trees,
+            'n_nodes': model.n_nodes,
+            **fidelity(teacher_proba, surrogate_proba, y_eval),
+            'fit_seconds': fit_seconds,
+            'latency_us': latency_us,
+            'teacher_latency_us': teacher_us,
+            'speedup': teacher_us / latency_us,
+        })
+        models[kind] = model
+
+    best = max(candidates, key=lambda c: (c['agreement'], -c['auc_gap']))
+    return {'kind': best['kind'], 'model': models[best['kind']], 'fidelity': best,
+            'candidates': candidates}
+
+
+def select_model(artifacts, which='teacher'):
+    """
+    Artifacts dengan `model` = teacher atau surrogate
+
+    Args:
+        which: 'teacher' (forest asli) atau 'surrogate' (CompactModel hasil distill)
+    """
+    if which == 'teacher':
+        return artifacts
+    if which not in MODEL_CHOICES:
+        raise ValueError(f"Pilihan model harus salah satu dari {MODEL_CHOICES}")
+    surrogate = artifacts.get('surrogate')
+    if surrogate is None:
+        raise ValueError("Artifacts tidak berisi surrogate; latih dengan --distill")
+    return {**artifacts, 'model': surrogate['model']}
+
+
+def print_distill_report(result):
+    """Tabel fidelity dan latency setiap kandidat surrogate"""
+    print(f"\n{'kind':>8}{'trees':>7}{'nodes':>7}{'agree':>8}{'|Δp|':>8}{'auc':>8}"
+          f"{'Δauc':>8}{'µs/row':>9}{'speedup':>9}")
+    print("-" * 72)
+    for c in result['candidates']:
+        mark = '  ←' if c['kind'] == result['kind'] else ''
+        print(f"{c['kind']:>8}{c['n_trees']:>7}{c['n_nodes']:>7,}{c['agreement']:>8.4f}"
+              f"{c['mean_abs_diff']:>8.4f}{c['surrogate_auc']:>8.4f}{c['auc_gap']:>8.4f}"
+              f"{c['latency_us']:>9.2f}{c['speedup']:>8.0f}x{mark}")
+    first = result['candidates'][0]
+    print(f"Teacher: ROC-AUC {first['teacher_auc']:.4f}, "
+          f"{first['teacher_latency_us']:.1f} µs/row (FlatForest)")
@@ -0,0 +1,240 @@
+"""
+Feature Cache - Cache content-addressed untuk X/y hasil feature engineering
+
+Key cache = hash dari (content hash CSV, versi kode fitur, parameter).
+Versi kode fitur adalah hash isi modul-modul fitur di `core/`, jadi setiap
+perubahan transformasi otomatis membuat key baru tanpa perlu bump manual.
+Kolom yang di-drop oleh script training dimasukkan pemanggil ke `params`.
+
+Setiap entry adalah satu folder:
+    <cache_dir>/<key>/X.npy            (atau X.data/X.indices/X.indptr.npy untuk CSR)
+                      y.npy
+                      pipeline.pkl     (FeaturePipeline yang sudah di-fit)
+                      meta.json        (kolom, shape, parameter, n_train, ukuran)
+
+Array dibaca dengan `np.load(mmap_mode='r')`, jadi cache hit tidak menyalin
+X ke memori. Total ukuran cache dibatasi `max_bytes`; entry yang paling lama
+tidak dipakai (mtime meta.json, di-touch setiap hit) dihapus lebih dulu.
+
+Usage:
+    cache = FeatureCache()
+    key = cache.key('data/credit_card_transactions2.csv', params)
+    entry = cache.load(key)
+    if entry is None:
+        entry = cache.save(key, X, y, pipeline, columns)
+
+    python -m core.feature_cache --list
+    python -m core.feature_cache --max-gb 2      # prune sampai di bawah 2 GB
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+from scipy import sparse
+
+from core.data_loader import CACHE_DIR_NAME, cached_file_hash
+
+DEFAULT_CACHE_DIR = os.path.join('data', CACHE_DIR_NAME, 'features')
+DEFAULT_MAX_BYTES = 5 * 1024**3
+
+# Modul yang menentukan isi X: perubahan di salah satunya = versi kode baru.
+# Seleksi kolom di fraud_detection_rf.py (DROP_COLS) masuk lewat `params`.
+FEATURE_MODULES = ['data_loader.py', 'features.py', 'velocity.py', 'geo.py',
+                   'spatial.py', 'hashing.py', 'target_encoding.py']
+
+_META = 'meta.json'
+
+
+def feature_code_version():
+    """Hash isi modul fitur (FEATURE_MODULES)"""
+    digest = hashlib.blake2b(digest_size=8)
+    core_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in FEATURE_MODULES:
+        with open(os.path.join(core_dir, name), 'rb') as f:
+            digest.update(name.encode() + b'\0' + f.read())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Cache X/y + pipeline per key dengan batas ukuran disk (LRU)
+
+    Args:
+        cache_dir: Folder root cache
+        max_bytes: Budget disk; entry LRU dihapus setelah `save` jika terlampaui
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes)
+
+    def key(self, data_path, params):
+        """
+        Key content-addressed untuk sebuah dataset + parameter fitur
+
+        Args:
+            data_path: Path CSV mentah (hash memakai memo size/mtime data_loader)
+            params: Dict parameter yang mempengaruhi X (harus JSON-serializable)
+        """
+        payload = json.dumps({
+            'data': cached_file_hash(data_path),
+            'code': feature_code_version(),
+            'params': params,
+        }, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    # ----------------------------------------
+    # READ / WRITE
+    # ----------------------------------------
+    def load(self, key):
+        """
+        Buka entry cache (array memory-mapped) atau None jika miss
+
+        Returns:
+            Dict {'X', 'y', 'pipeline', 'columns', 'meta'}
+        """
+        path = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(path, _META)) as f:
+                meta = json.load(f)
+            with open(os.path.join(path, 'pipeline.pkl'), 'rb') as f:
+                pipeline = pickle.load(f)
+        except (OSError, ValueError):
+            return None
+
+        def array(name):
+            return np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+
+        if meta['sparse']:
+            X = sparse.csr_matrix((array('X.data'), array('X.indices'), array('X.indptr')),
+                                  shape=tuple(meta['shape']), copy=False)
+        else:
+            X = array('X')
+        # Touch: mtime meta.json = waktu terakhir dipakai (urutan LRU)
+        os.utime(os.path.join(path, _META))
+        return {'X': X, 'y': array('y'), 'pipeline': pipeline,
+                'columns': meta['columns'], 'meta': meta}
+
+    def save(self, key, X, y, pipeline, columns, params=None, n_train=None):
+        """
+        Tulis entry baru (atomic: folder sementara lalu rename), lalu evict
+
+        Args:
+            n_train: Jika X berisi baris training lalu baris test, jumlah
+                baris training (disimpan di meta)
+
+        Returns:
+            Entry yang sudah dibuka ulang dari disk (sama seperti `load`)
+        """
+        path = os.path.join(self.cache_dir, key)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        if sparse.issparse(X):
+            X = sparse.csr_matrix(X)
+            for part in ('data', 'indices', 'indptr'):
+                np.save(os.path.join(tmp_path, f'X.{part}.npy'), getattr(X, part))
+        else:
+            np.save(os.path.join(tmp_path, 'X.npy'), np.ascontiguousarray(X))
+        np.save(os.path.join(tmp_path, 'y.npy'), np.asarray(y))
+        with open(os.path.join(tmp_path, 'pipeline.pkl'), 'wb') as f:
+            pickle.dump(pipeline, f)
+
+        meta = {
+            'key': key,
+            'sparse': sparse.issparse(X),
+            'shape': list(X.shape),
+            'columns': list(columns),
+            'params': params,
+            'n_train': n_train,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        meta['bytes'] = _dir_bytes(tmp_path)
+        with open(os.path.join(tmp_path, _META), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+        return self.load(key)
+
+    # ----------------------------------------
+    # EVICTION
+    # ----------------------------------------
+    def entries(self):
+        """Entry yang ada, urut dari yang paling lama tidak dipakai"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self.cache_dir, name, _META)
+            if '.tmp-' in name or not os.path.exists(meta_path):
+                continue
+            entries.append({
+                'key': name,
+                'bytes': _dir_bytes(os.path.join(self.cache_dir, name)),
+                'last_used': os.path.getmtime(meta_path),
+            })
+        return sorted(entries, key=lambda e: e['last_used'])
+
+    def evict(self, keep=None):
+        """
+        Hapus entry LRU sampai total ukuran <= max_bytes
+
+        Args:
+            keep: Key yang tidak boleh dihapus (entry yang baru saja ditulis)
+
+        Returns:
+            Daftar key yang dihapus
+        """
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        removed = []
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry['key'] == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, entry['key']), ignore_errors=True)
+            total -= entry['bytes']
+            removed.append(entry['key'])
+        return removed
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola feature cache training")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--list', action='store_true', help="Tampilkan entry (LRU dulu)")
+    parser.add_argument('--max-gb', type=float, help="Prune sampai total di bawah budget ini")
+    parser.add_argument('--clear', action='store_true', help="Hapus seluruh cache")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+        print(f"✓ Cleared {args.cache_dir}")
+        return
+    cache = FeatureCache(args.cache_dir)
+    if args.max_gb is not None:
+        cache.max_bytes = int(args.max_gb * 1024**3)
+        removed = cache.evict()
+        print(f"✓ Evicted {len(removed)} entries")
+    entries = cache.entries()
+    if args.list or args.max_gb is None:
+        for entry in entries:
+            used = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['last_used']))
+            print(f"   {entry['key']}  {entry['bytes'] / 1024**2:>9.1f} MB  last used {used}")
+    print(f"Total: {len(entries)} entries, "
+          f"{sum(e['bytes'] for e in entries) / 1024**2:.1f} MB in {args.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,456 @@
+"""
+Features - Feature pipeline tunggal untuk training, dashboard dan scoring
+
+Semua transformasi (age, hour, is_weekend, amt_per_hour_ratio, label
+encoding, scaling) didefinisikan di sini dan objek `FeaturePipeline` yang
+sudah di-fit disimpan di dalam model pickle, sehingga serving selalu
+memakai transformasi yang sama persis dengan saat training.
+
+Fitur velocity per kartu (core/velocity.py), fitur geo (core/geo.py) dan
+kepadatan transaksi/fraud di sekitar merchant (core/spatial.py) bersifat
+opsional: `FeaturePipeline(velocity=True, geo=True, spatial_radius_km=10)`.
+Blok hashing sparse untuk merchant/job/city/zip (core/hashing.py) diaktifkan
+dengan `hash_buckets` dan dipakai lewat `transform_sparse`. Fraud rate
+ter-smoothing per category/state/merchant (core/target_encoding.py)
+diaktifkan dengan `target_encoding=True`.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from core.hashing import HashedBlock
+from core.target_encoding import (TARGET_COLUMNS, TARGET_ENCODED_COLS, TargetEncoder,
+                                   fold_ids)
+from core.spatial import SPATIAL_COLUMNS, SPATIAL_INPUT_COLUMNS, MerchantGridIndex
+from core.geo import GEO_COLUMNS, GEO_INPUT_COLUMNS, geo_features, record_geo
+from core.velocity import (EMPTY_HISTORY, VELOCITY_COLUMNS, VELOCITY_INPUT_COLUMNS,
+                           velocity_features)
+
+CATEGORICAL_COLS = ['category', 'gender', 'state']
+NUMERICAL_COLS = ['amt', 'age', 'hour', 'is_weekend', 'amt_per_hour_ratio']
+FEATURE_COLUMNS = ['category', 'amt', 'gender', 'state',
+                   'age', 'hour', 'is_weekend', 'amt_per_hour_ratio']
+
+# Kolom CSV mentah yang dibutuhkan untuk membangun FEATURE_COLUMNS
+RAW_COLUMNS = ['trans_date_trans_time', 'category', 'amt', 'gender',
+               'state', 'dob', 'is_fraud']
+
+# Kode untuk kategori yang tidak ada di vocabulary training
+UNKNOWN_CODE = -1
+
+_SECONDS_PER_DAY = 86400
+_SECONDS_PER_HOUR = 3600
+
+
+def _to_datetime64(values):
+    """Konversi kolom ke array datetime64[s] (parse string hanya jika perlu)"""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values)
+    return np.asarray(values, dtype='datetime64[s]')
+
+
+def derive_features(df, reference_year):
+    """
+    Hitung fitur turunan secara vectorized (tanpa `.dt` accessor per kolom)
+
+    Args:
+        df: DataFrame dengan kolom `dob`, `trans_date_trans_time` dan `amt`
+        reference_year: Tahun referensi untuk umur (`reference_year - tahun lahir`)
+
+    Returns:
+        Dict {nama_fitur: numpy array}
+    """
+    trans_seconds = _to_datetime64(df['trans_date_trans_time']).astype(np.int64)
+    birth_year = _to_datetime64(df['dob']).astype('datetime64[Y]').astype(np.int64) + 1970
+
+    hour = (trans_seconds % _SECONDS_PER_DAY) // _SECONDS_PER_HOUR
+    # 1970-01-01 adalah hari Kamis (dayofweek=3, Senin=0)
+    dayofweek = (trans_seconds // _SECONDS_PER_DAY + 3) % 7
+    amt = np.asarray(df['amt'], dtype=np.float64)
+
+    return {
+        'age': (reference_year - birth_year).astype(np.int16),
+        'hour': hour.astype(np.int8),
+        'is_weekend': (dayofweek >= 5).astype(np.int8),
+        'amt_per_hour_ratio': (amt / (hour + 1)).astype(np.float32),
+    }
+
+
+def get_feature_pipeline(artifacts):
+    """
+    Ambil FeaturePipeline dari model artifacts
+
+    Model lama (sebelum FeaturePipeline) dibangun ulang dari
+    `label_encoders` + `scaler` yang tersimpan di pickle.
+    """
+    pipeline = artifacts.get('feature_pipeline')
+    if pipeline is None:
+        pipeline = FeaturePipeline.from_artifacts(artifacts)
+    return pipeline
+
+
+class FeaturePipeline:
+    """
+    Pipeline fitur yang di-fit sekali dan dipakai di semua jalur
+
+    - `add_features(df)`     : tambah kolom turunan (untuk EDA/dashboard)
+    - `transform(df)`        : batch path, return float32 array (n, n_features)
+    - `transform_record(r)`  : single-record path tanpa pandas
+
+    Args:
+        reference_year: Tahun referensi untuk menghitung umur. Disimpan saat
+            fit agar umur saat serving konsisten dengan saat training.
+        velocity: Tambahkan fitur velocity per kartu (butuh `cc_num` dan
+            `unix_time`). Pada batch path fitur dihitung dari baris di
+            DataFrame itu sendiri, jadi panggil `add_features` pada seluruh
+            histori sebelum split.
+        geo: Tambahkan jarak ke merchant dan travel speed antar transaksi
+            (butuh koordinat, `cc_num` dan `unix_time`)
+        spatial_radius_km: Jika diisi, tambahkan jumlah transaksi dan fraud
+            training dalam radius ini dari lokasi merchant. Index dibangun
+            saat `fit(df, y)` dan ikut tersimpan di pipeline.
+        hash_buckets: Jika diisi, tambahkan blok sparse hasil hashing
+            merchant/job/city/zip dengan jumlah bucket ini. Model kemudian
+            dilatih dengan `transform_sparse` (CSR, tidak pernah dense).
+        target_encoding: Tambahkan fraud rate ter-smoothing per category,
+            state dan merchant. Tabel dibangun saat `fit(df, y)`; baris
+            training mendapat nilai out-of-fold, scoring memakai lookup.
+    """
+
+    # Default untuk pipeline yang di-pickle sebelum opsi velocity/geo/spatial ada
+    velocity = False
+    geo = False
+    spatial_radius_km = None
+    spatial_index = None
+    hasher = None
+    target_encoders = None
+
+    def __init__(self, reference_year=None, velocity=False, geo=False, spatial_radius_km=None,
+                 hash_buckets=None, target_encoding=False):
+        self.reference_year = reference_year or datetime.now().year
+        self.velocity = bool(velocity)
+        self.geo = bool(geo)
+        self.spatial_radius_km = spatial_radius_km
+        self.spatial_index = None
+        self.hasher = HashedBlock(hash_buckets) if hash_buckets else None
+        self.target_encoders = ({col: TargetEncoder() for col in TARGET_ENCODED_COLS}
+                                if target_encoding else None)
+        self.feature_columns = list(FEATURE_COLUMNS)
+        self.categorical_cols = list(CATEGORICAL_COLS)
+        self.numerical_cols = list(NUMERICAL_COLS)
+        if self.velocity:
+            self.feature_columns += VELOCITY_COLUMNS
+            self.numerical_cols += VELOCITY_COLUMNS
+        if self.geo:
+            self.feature_columns += GEO_COLUMNS
+            self.numerical_cols += GEO_COLUMNS
+        if self.spatial_radius_km:
+            self.feature_columns += SPATIAL_COLUMNS
+            self.numerical_cols += SPATIAL_COLUMNS
+        if self.target_encoders is not None:
+            self.feature_columns += TARGET_COLUMNS
+            self.numerical_cols += TARGET_COLUMNS
+        self.scaler = StandardScaler()
+        self.vocab = {}
+        self._seen = {col: set() for col in self.categorical_cols}
+
+    # ----------------------------------------
+    # FIT
+    # ----------------------------------------
+    def fit(self, df, y=None):
+        """
+        Fit vocabulary kategorikal dan scaler dari DataFrame training
+
+        Args:
+            y: Label fraud, wajib jika `spatial_radius_km` diisi atau
+                `target_encoding` aktif (index spatial dan tabel target
+                encoding dibangun dari baris training ini)
+        """
+        self.scaler = StandardScaler()
+        self._seen = {col: set() for col in self.categorical_cols}
+        if self.target_encoders is not None:
+            if y is None:
+                raise ValueError("Target encoding butuh label `y` saat fit")
+            self.target_encoders = {col: TargetEncoder(enc.smoothing)
+                                    for col, enc in self.target_encoders.items()}
+        if self.spatial_radius_km:
+            if y is None:
+                raise ValueError("Fitur spatial butuh label `y` saat fit")
+            self.spatial_index = MerchantGridIndex.build(
+                df['merch_lat'], df['merch_long'], y, radius_km=self.spatial_radius_km)
+        return self.partial_fit(df, y)
+
+    def partial_fit(self, df, y=None):
+        """
+        Update vocabulary dan scaler secara incremental (mode streaming)
+
+        Args:
+            y: Label baris `df` jika baris tersebut ada di spatial index
+                (fitur spatial dihitung leave-one-out). Dengan target
+                encoding, baris berlabel juga ditambahkan ke tabel dan
+                di-encode out-of-fold.
+        """
+        if self.spatial_radius_km and self.spatial_index is None:
+            raise ValueError("Spatial index belum dibangun, panggil fit(df, y)")
+        if self.target_encoders is not None and y is not None:
+            self.update_target_encoding(df, y)
+        for col in self.categorical_cols:
+            self._seen[col].update(pd.unique(np.asarray(df[col], dtype=object)))
+        self.scaler.partial_fit(self._numeric_block(df, y))
+        # Kode mengikuti urutan terurut, sama seperti LabelEncoder
+        self.vocab = {
+            col: {value: code for code, value in enumerate(sorted(map(str, seen)))}
+            for col, seen in self._seen.items()
+        }
+        return self
+
+    def extend(self, df, y=None):
+        """
+        Perluas pipeline yang sudah dipakai model dengan data baru (retrain incremental)
+
+        Berbeda dengan `partial_fit`, kode lama tidak pernah berubah:
+        kategori baru mendapat kode setelah kode terakhir (append-only),
+        scaler dan spatial index dibekukan. Jika `y` diberikan dan target
+        encoding aktif, label baru ditambahkan ke tabel.
+
+        Setelah `extend`, jangan panggil `partial_fit` lagi: vocabulary akan
+        diurutkan ulang dan kode tidak cocok dengan tree yang sudah ada.
+        """
+        for col in self.categorical_cols:
+            mapping = self.vocab[col]
+            for value in map(str, pd.unique(np.asarray(df[col], dtype=object))):
+                if value not in mapping:
+                    mapping[value] = len(mapping)
+                    self._seen[col].add(value)
+        if self.target_encoders is not None and y is not None:
+            self.update_target_encoding(df, y)
+        return self
+
+    def update_target_encoding(self, df, y):
+        """
+        Tambahkan transaksi yang baru berlabel ke tabel target encoding
+
+        Hanya hitungan yang bertambah (tanpa recompute); scaler tidak
+        berubah. Untuk satu transaksi lihat `update_target_record`.
+        """
+        for col, encoder in self.target_encoders.items():
+            encoder.update(df[col], y)
+
+    def update_target_record(self, record, label):
+        """Update O(1) tabel target encoding dari satu transaksi berlabel"""
+        for col, encoder in self.target_encoders.items():
+            if col in record:
+                encoder.update_one(record[col], int(label))
+
+    @classmethod
+    def from_artifacts(cls, artifacts):
+        """Bangun pipeline dari artifacts lama (label_encoders + scaler)"""
+        pipeline = cls()
+        pipeline.scaler = artifacts['scaler']
+        pipeline.feature_columns = list(artifacts['feature_columns'])
+        pipeline.numerical_cols = list(artifacts['numerical_cols'])
+        pipeline.vocab = {
+            col: {value: code for code, value in enumerate(le.classes_)}
+            for col, le in artifacts['label_encoders'].items()
+        }
+        pipeline.categorical_cols = list(pipeline.vocab)
+        pipeline._seen = {col: set(v) for col, v in pipeline.vocab.items()}
+        return pipeline
+
+    def label_encoders(self):
+        """
+        LabelEncoder yang ekuivalen, untuk kompatibilitas artifacts lama
+
+        `classes_` mengikuti urutan kode; setelah `extend` urutan ini tidak
+        lagi alfabetis, jadi pakai `encode`/`vocab`, bukan `le.transform`.
+        """
+        encoders = {}
+        for col, mapping in self.vocab.items():
+            le = LabelEncoder()
+            le.classes_ = np.array(list(mapping), dtype=object)
+            encoders[col] = le
+        return encoders
+
+    @property
+    def input_columns(self):
+        """Kolom CSV mentah yang dibutuhkan oleh `transform`"""
+        columns = [c for c in RAW_COLUMNS if c != 'is_fraud']
+        extra = ((VELOCITY_INPUT_COLUMNS if self.velocity else [])
+                 + (GEO_INPUT_COLUMNS if self.geo else [])
+                 + (SPATIAL_INPUT_COLUMNS if self.spatial_radius_km else [])
+                 + (self.hasher.columns if self.hasher is not None else [])
+                 + (TARGET_ENCODED_COLS if self.target_encoders is not None else []))
+        return columns + [c for c in dict.fromkeys(extra) if c not in columns]
+
+    @property
+    def output_columns(self):
+        """Nama semua kolom input model (kolom dense + bucket hashing jika ada)"""
+        if self.hasher is None:
+            return list(self.feature_columns)
+        return self.feature_columns + self.hasher.column_names
+
+    @property
+    def n_model_inputs(self):
+        return len(self.feature_columns) + (self.hasher.n_buckets if self.hasher is not None else 0)
+
+    def classes(self, col):
+        """Daftar nilai kategori yang dikenal untuk sebuah kolom"""
+        return list(self.vocab[col])
+
+    # ----------------------------------------
+    # TRANSFORM
+    # ----------------------------------------
+    def add_features(self, df):
+        """Tambahkan kolom turunan (age, hour, ...) ke salinan DataFrame"""
+        out = df.copy()
+        for col, values in self._derive(df).items():
+            out[col] = values
+        return out
+
+    def encode(self, col, values):
+        """Encode kolom kategorikal ke kode integer (unknown → UNKNOWN_CODE)"""
+        mapping = self.vocab[col]
+        cat = pd.Categorical(np.asarray(values, dtype=object))
+        lut = np.array([mapping.get(str(c), UNKNOWN_CODE) for c in cat.categories]
+                       + [UNKNOWN_CODE], dtype=np.int32)
+        # cat.codes bernilai -1 untuk NaN → indeks terakhir (UNKNOWN_CODE)
+        return lut[cat.codes]
+
+    def transform(self, df, y=None):
+        """
+        Batch path: DataFrame → matriks fitur float32 siap untuk model
+
+        Kolom turunan yang sudah ada di DataFrame dipakai langsung; yang belum
+        ada dihitung dari `dob` dan `trans_date_trans_time`.
+
+        Args:
+            y: Label baris training yang ikut membangun spatial index dan
+                tabel target encoding; kontribusi baris itu sendiri
+                dikurangi (leave-one-out / out-of-fold)
+        """
+        numeric = self._numeric_block(df, y)
+        scaled = (numeric - self.scaler.mean_) / self.scaler.scale_
+
+        X = np.empty((len(df), len(self.feature_columns)), dtype=np.float32)
+        for j, col in enumerate(self.feature_columns):
+            if col in self.vocab:
+                X[:, j] = self.encode(col, df[col])
+            else:
+                X[:, j] = scaled[:, self.numerical_cols.index(col)]
+        return X
+
+    def transform_sparse(self, df, y=None):
+        """
+        Batch path untuk model dengan blok hashing: CSR float32 (n, len(output_columns))
+
+        Kolom dense (`transform`) digabung dengan blok hashing tanpa pernah
+        membuat matriks dense selebar jumlah bucket.
+        """
+        dense = sparse.csr_matrix(self.transform(df, y))
+        if self.hasher is None:
+            return dense
+        return sparse.hstack([dense, self.hasher.transform(df)], format='csr', dtype=np.float32)
+
+    def transform_model_input(self, df, y=None):
+        """Input model untuk batch path: CSR jika ada blok hashing, selain itu dense"""
+        return self.transform(df, y) if self.hasher is None else self.transform_sparse(df, y)
+
+    def transform_record(self, record):
+        """
+        Single-record path: dict → array float32 dengan shape (1, n_features)
+
+        Args:
+            record: Dict dengan kolom kategorikal dan `amt`, plus `age`,
+                `hour`, `is_weekend` (atau `dob`/`trans_date_trans_time`)
+        """
+        values = self._record_numeric(record)
+        mean, scale = self.scaler.mean_, self.scaler.scale_
+        row = np.zeros((1, self.n_model_inputs), dtype=np.float32)
+        for j, col in enumerate(self.feature_columns):
+            if col in self.vocab:
+                row[0, j] = self.vocab[col].get(str(record[col]), UNKNOWN_CODE)
+            else:
+                k = self.numerical_cols.index(col)
+                row[0, j] = (values[col] - mean[k]) / scale[k]
+        if self.hasher is not None:
+            for bucket in self.hasher.record_buckets(record):
+                row[0, len(self.feature_columns) + bucket] += 1
+        return row
+
+    # ----------------------------------------
+    # HELPERS
+    # ----------------------------------------
+    def _numeric_block(self, df, y=None):
+        missing = [c for c in self.numerical_cols if c not in df.columns]
+        derived = self._derive(df, missing, y) if missing else {}
+        return np.column_stack([
+            np.asarray(df[c] if c in df.columns else derived[c], dtype=np.float64)
+            for c in self.numerical_cols
+        ])
+
+    def _derive(self, df, columns=None, y=None):
+        """Fitur turunan (semua, atau hanya yang dibutuhkan untuk `columns`)"""
+        def needed(group):
+            return columns is None or any(c in group for c in columns)
+
+        derived = {}
+        optional = VELOCITY_COLUMNS + GEO_COLUMNS + SPATIAL_COLUMNS + TARGET_COLUMNS
+        if columns is None or any(c not in optional for c in columns):
+            derived.update(derive_features(df, self.reference_year))
+        if self.velocity and needed(VELOCITY_COLUMNS):
+            derived.update(velocity_features(df))
+        if self.geo and needed(GEO_COLUMNS):
+            derived.update(geo_features(df))
+        if self.spatial_index is not None and needed(SPATIAL_COLUMNS):
+            count, fraud = self.spatial_index.query_many(
+                df['merch_lat'], df['merch_long'],
+                own_fraud=None if y is None else np.asarray(y))
+            derived.update({'nearby_txn_count': count, 'nearby_fraud_count': fraud})
+        if self.target_encoders is not None and needed(TARGET_COLUMNS):
+            folds = None if y is None else fold_ids(len(df))
+            for col, name in zip(TARGET_ENCODED_COLS, TARGET_COLUMNS):
+                encoder = self.target_encoders[col]
+                derived[name] = (encoder.transform(df[col]) if folds is None
+                                 else encoder.oof_transform(df[col], y, folds))
+        return derived
+
+    def _record_numeric(self, record):
+        values = dict(record)
+        if 'age' not in values:
+            values['age'] = self.reference_year - pd.Timestamp(values['dob']).year
+        if 'hour' not in values or 'is_weekend' not in values:
+            ts = pd.Timestamp(values['trans_date_trans_time'])
+            values.setdefault('hour', ts.hour)
+            values.setdefault('is_weekend', int(ts.dayofweek >= 5))
+        values['is_weekend'] = int(values['is_weekend'])
+        values.setdefault('amt_per_hour_ratio', values['amt'] / (values['hour'] + 1))
+        if self.velocity:
+            # Tanpa state store, record tanpa fitur velocity dianggap tanpa histori
+            for col in VELOCITY_COLUMNS:
+                values.setdefault(col, EMPTY_HISTORY[col])
+        if self.geo:
+            values.update(record_geo(values))
+        if self.spatial_radius_km:
+            values.update(self._record_spatial(values))
+        if self.target_encoders is not None:
+            values.update(self._record_target(values))
+        return values
+
+    def _record_spatial(self, record):
+        """Fitur spatial untuk satu record (0 jika koordinat merchant tidak ada)"""
+        if all(col in record for col in SPATIAL_COLUMNS):
+            return {col: record[col] for col in SPATIAL_COLUMNS}
+        if self.spatial_index is None or 'merch_lat' not in record or 'merch_long' not in record:
+            return {col: 0 for col in SPATIAL_COLUMNS}
+        count, fraud = self.spatial_index.query(record['merch_lat'], record['merch_long'])
+        return {'nearby_txn_count': count, 'nearby_fraud_count': fraud}
+
+    def _record_target(self, record):
+        """Fitur target encoding untuk satu record (lookup O(1) per kolom)"""
+        return {
+            name: record[name] if name in record else self.target_encoders[col].lookup(record.get(col))
+            for col, name in zip(TARGET_ENCODED_COLS, TARGET_COLUMNS)
+        }
@@ -0,0 +1,247 @@
+"""
+Flat Forest - Inference engine Random Forest berbasis array NumPy
+
+Semua tree dari `RandomForestClassifier` diratakan menjadi array kontigu
+(feature, threshold, left, right, value) dengan offset node global. Evaluasi
+berjalan level demi level untuk seluruh batch dan seluruh tree sekaligus,
+sehingga tidak ada dispatch Python per tree seperti di sklearn.
+
+Detail implementasi:
+- Leaf dibuat self-loop (left = right = dirinya sendiri), jadi setiap baris
+  cukup di-iterasi `max_depth` kali tanpa percabangan khusus.
+- Threshold disimpan sebagai float32 yang dibulatkan ke bawah. Karena input
+  selalu float32 (sama seperti sklearn), `x <= t32` ekuivalen persis dengan
+  `x <= t64`, jadi hasilnya identik dengan sklearn.
+- State traversal berbentuk (n_trees, n_rows) agar gather ke array node
+  berada dalam rentang node satu tree (lebih ramah cache).
+- Child kiri/kanan disimpan interleaved di satu array `children`
+  (`children[2 * node + go_right]`): satu gather per level. `left`/`right`
+  hanyalah view strided dari array ini, jadi folder `.npy` yang di-load
+  dengan mmap tidak membuat salinan privat per proses.
+
+Engine ini unggul untuk batch kecil (1-64 baris). Untuk batch ribuan baris
+ke atas, traversal Cython sklearn (apalagi dengan n_jobs=-1) lebih cepat;
+lihat benchmarks/bench_forest.py.
+
+Usage:
+    python -m core.forest export --model models/fraud_detection_model.pkl \\
+        --output models/flat_forest
+"""
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+
+ARRAY_NAMES = ['feature', 'threshold', 'children', 'value', 'roots']
+# Folder lama (sebelum `children.npy`) menyimpan child kiri/kanan terpisah
+LEGACY_CHILD_NAMES = ['left', 'right']
+META_FILE = 'forest.json'
+
+# Batas elemen (baris x tree) per blok evaluasi, menjaga memori kerja ~ puluhan MB
+_BLOCK_ELEMENTS = 1 << 21
+
+
+class FlatForest:
+    """
+    Random Forest dalam bentuk array datar
+
+    Args:
+        feature: int32 (n_nodes,) indeks fitur per node
+        threshold: float32 (n_nodes,) threshold split (x <= threshold → kiri)
+        left, right: int32 (n_nodes,) indeks global child kiri/kanan; boleh
+            None jika `children` diberikan
+        value: float64 (n_nodes, n_classes) probabilitas kelas per node
+        roots: int32 (n_trees,) indeks global root setiap tree
+        max_depth: Kedalaman maksimum seluruh tree
+        n_features: Jumlah fitur input
+        classes: Label kelas (urutan sama dengan `predict_proba` sklearn)
+        children: int32 (2 * n_nodes,) child kiri/kanan interleaved (mis.
+            hasil mmap `children.npy`); dibangun dari `left`/`right` jika None
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 max_depth, n_features, classes, children=None):
+        if children is None:
+            children = np.empty(2 * len(left), dtype=np.int32)
+            children[0::2] = left
+            children[1::2] = right
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.left = children[0::2]
+        self.right = children[1::2]
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.classes_ = np.asarray(classes)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    # ----------------------------------------
+    # EXPORT
+    # ----------------------------------------
+    @classmethod
+    def from_sklearn(cls, model):
+        """Ratakan `RandomForestClassifier` (atau ExtraTrees) yang sudah di-fit"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n, dtype=np.int32)
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(_round_down_float32(np.where(is_leaf, 0.0, tree.threshold)))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            values.append(np.divide(value, totals, out=np.zeros_like(value), where=totals > 0))
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_,
+        )
+
+    def save(self, directory):
+        """Simpan setiap array sebagai `.npy` (bisa di-load dengan mmap)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, name + '.npy'), getattr(self, name))
+        meta = {
+            'max_depth': self.max_depth,
+            'n_features': self.n_features,
+            'classes': self.classes_.tolist(),
+            'n_trees': self.n_trees,
+            'n_nodes': self.n_nodes,
+        }
+        with open(os.path.join(directory, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        """
+        Load forest dari folder hasil `save`
+
+        Args:
+            mmap_mode: Diteruskan ke `np.load` (mis. 'r' agar beberapa proses
+                berbagi page fisik yang sama)
+        """
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+
+        def read(name):
+            return np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)
+
+        names = list(ARRAY_NAMES)
+        if not os.path.exists(os.path.join(directory, 'children.npy')):
+            # Format lama: children dibangun di memori (salinan privat per proses)
+            names = [name for name in names if name != 'children'] + LEGACY_CHILD_NAMES
+        arrays = {name: read(name) for name in names}
+        arrays.setdefault('left', None)
+        arrays.setdefault('right', None)
+        return cls(max_depth=meta['max_depth'], n_features=meta['n_features'],
+                   classes=meta['classes'], **arrays)
+
+    # ----------------------------------------
+    # INFERENCE
+    # ----------------------------------------
+    def apply(self, X):
+        """Indeks leaf global untuk setiap (baris, tree), shape (n, n_trees)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows = X.shape[0]
+        # Feature-major: nilai fitur f untuk baris i ada di f * n_rows + i
+        flat_X = np.ascontiguousarray(X.T).ravel()
+        row_index = np.arange(n_rows, dtype=np.int32)[None, :]
+
+        shape = (self.n_trees, n_rows)
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1).astype(np.int32)
+        # Buffer gather fitur mengikuti dtype array (int32, atau int16 di format compact)
+        feature = np.empty(shape, dtype=self.feature.dtype)
+        index = np.empty(shape, dtype=np.int32)
+        x = np.empty(shape, dtype=np.float32)
+        t = np.empty(shape, dtype=np.float32)
+        go_right = np.empty(shape, dtype=bool)
+
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=feature)
+            np.multiply(feature, n_rows, out=index, dtype=np.int32)
+            np.add(index, row_index, out=index)
+            np.take(flat_X, index, out=x)
+            np.take(self.threshold, nodes, out=t)
+            np.greater(x, t, out=go_right)
+            np.multiply(nodes, 2, out=nodes)
+            np.add(nodes, go_right, out=nodes)
+            np.take(self.children, nodes, out=nodes)
+        return nodes.T
+
+    def predict_proba(self, X):
+        """Probabilitas kelas, ekuivalen dengan `RandomForestClassifier.predict_proba`"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows = X.shape[0]
+        out = np.empty((n_rows, self.value.shape[1]), dtype=np.float64)
+        block = max(1, _BLOCK_ELEMENTS // self.n_trees)
+        for start in range(0, n_rows, block):
+            leaves = self.apply(X[start:start + block])
+            out[start:start + block] = self.value[leaves].sum(axis=1) / self.n_trees
+        return out
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _round_down_float32(values):
+    """Cast ke float32 dengan pembulatan ke bawah (largest float32 <= value)"""
+    rounded = values.astype(np.float32)
+    up = rounded.astype(np.float64) > values
+    rounded[up] = np.nextafter(rounded[up], np.float32(-np.inf))
+    return rounded
+
+
+def export_model(model_path, output_dir):
+    """Load model pickle, ratakan forest-nya dan simpan ke `output_dir`"""
+    with open(model_path, 'rb') as f:
+        artifacts = pickle.load(f)
+    forest = FlatForest.from_sklearn(artifacts['model'])
+    forest.save(output_dir)
+    return forest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flat forest export")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help="Export model pickle ke array .npy")
+    export.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    export.add_argument('--output', default=os.path.join('models', 'flat_forest'))
+    args = parser.parse_args(argv)
+
+    forest = export_model(args.model, args.output)
+    print(f"✓ Exported {forest.n_trees} trees / {forest.n_nodes:,} nodes "
+          f"(max depth {forest.max_depth}) to {os.path.abspath(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Geo - Fitur lokasi dari koordinat pemegang kartu dan merchant
+
+- merchant_distance_km: jarak haversine rumah pemegang kartu (lat/long) ke
+  merchant (merch_lat/merch_long)
+- travel_speed_kmh: kecepatan "perjalanan" antar merchant dari transaksi
+  sebelumnya pada kartu yang sama (impossible travel: ratusan km dalam
+  hitungan menit). 0 untuk transaksi pertama sebuah kartu.
+
+Seperti core/velocity.py ada dua implementasi:
+- `geo_features`   : batch, satu pass vectorized setelah sort (kartu, waktu)
+- `GeoStore`       : streaming, O(1) per event (lokasi terakhir per kartu)
+
+Tidak ada `DataFrame.apply` per baris di kedua jalur.
+"""
+import math
+import threading
+
+import numpy as np
+
+from core.velocity import card_time_order
+
+GEO_COLUMNS = ['merchant_distance_km', 'travel_speed_kmh']
+
+# Kolom mentah yang dibutuhkan untuk menghitung fitur geo
+GEO_INPUT_COLUMNS = ['lat', 'long', 'merch_lat', 'merch_long', 'cc_num', 'unix_time']
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Jeda minimum untuk menghitung kecepatan: dua transaksi di detik yang sama
+# tidak menghasilkan kecepatan tak hingga
+MIN_TRAVEL_SECONDS = 60
+
+# Nilai fitur untuk record tanpa koordinat / tanpa histori
+EMPTY_GEO = {'merchant_distance_km': 0.0, 'travel_speed_kmh': 0.0}
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak great-circle (km) antar array koordinat derajat, vectorized"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64))
+                              for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2
+    a += np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    np.clip(a, 0.0, 1.0, out=a)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _haversine_scalar(lat1, lon1, lat2, lon2):
+    """Versi skalar `haversine_km` (modul math, tanpa overhead numpy) untuk streaming"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(max(a, 0.0), 1.0)))
+
+
+def record_geo(record):
+    """Fitur geo untuk satu record tanpa state (travel speed dari record atau 0)"""
+    features = dict(EMPTY_GEO)
+    if all(col in record for col in ['lat', 'long', 'merch_lat', 'merch_long']):
+        features['merchant_distance_km'] = _haversine_scalar(
+            record['lat'], record['long'], record['merch_lat'], record['merch_long'])
+    for col in GEO_COLUMNS:
+        if col in record:
+            features[col] = record[col]
+    return features
+
+
+def _speed_kmh(distance_km, seconds):
+    return distance_km / (np.maximum(seconds, MIN_TRAVEL_SECONDS) / 3600)
+
+
+def geo_features(df):
+    """
+    Hitung fitur geo untuk seluruh baris DataFrame secara vectorized
+
+    Jarak ke merchant dihitung langsung per baris. Untuk travel speed,
+    baris diurutkan stabil per (kartu, waktu) sehingga transaksi sebelumnya
+    dari kartu yang sama selalu berada tepat di baris sebelumnya.
+
+    Args:
+        df: DataFrame dengan kolom GEO_INPUT_COLUMNS
+
+    Returns:
+        Dict {nama_fitur: numpy array} dengan urutan baris sama seperti `df`
+    """
+    n = len(df)
+    merch_lat = np.asarray(df['merch_lat'], dtype=np.float64)
+    merch_long = np.asarray(df['merch_long'], dtype=np.float64)
+    distance = haversine_km(df['lat'], df['long'], merch_lat, merch_long)
+
+    order, cards, times = card_time_order(df['cc_num'], df['unix_time'])
+
+    speed = np.zeros(n, dtype=np.float64)
+    if n > 1:
+        sorted_lat, sorted_long = merch_lat[order], merch_long[order]
+        hop = haversine_km(sorted_lat[:-1], sorted_long[:-1], sorted_lat[1:], sorted_long[1:])
+        hop_speed = _speed_kmh(hop, np.diff(times[order]))
+        same_card = cards[order][1:] == cards[order][:-1]
+        speed[order[1:]] = np.where(same_card, hop_speed, 0.0)
+
+    return {'merchant_distance_km': distance, 'travel_speed_kmh': speed}
+
+
+class GeoStore:
+    """
+    State store streaming untuk travel speed: lokasi merchant terakhir per kartu
+
+    Args:
+        n_cards: Jumlah baris kartu yang dialokasikan di awal
+
+    Usage:
+        store = GeoStore()
+        features = store.update(cc_num, unix_time, lat, long, merch_lat, merch_long)
+    """
+
+    def __init__(self, n_cards=1024):
+        self._index = {}
+        self._last = np.zeros((n_cards, 3), dtype=np.float64)  # unix_time, lat, long
+        self._lock = threading.Lock()
+
+    @property
+    def n_cards(self):
+        return len(self._index)
+
+    def update(self, card, unix_time, lat, long, merch_lat, merch_long):
+        """
+        Hitung fitur geo untuk transaksi baru lalu simpan lokasinya
+
+        Returns:
+            Dict {nama_fitur: nilai} sesuai GEO_COLUMNS
+        """
+        t, merch_lat, merch_long = int(unix_time), float(merch_lat), float(merch_long)
+        distance = _haversine_scalar(float(lat), float(long), merch_lat, merch_long)
+        key = int(card)
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                speed = 0.0
+                row = len(self._index)
+                if row == len(self._last):
+                    self._last = np.concatenate([self._last, np.zeros_like(self._last)])
+                self._index[key] = row
+            else:
+                last_t, last_lat, last_long = self._last[row].tolist()
+                hop = _haversine_scalar(last_lat, last_long, merch_lat, merch_long)
+                speed = hop / (max(t - int(last_t), MIN_TRAVEL_SECONDS) / 3600)
+            self._last[row] = (t, merch_lat, merch_long)
+        return {'merchant_distance_km': distance, 'travel_speed_kmh': speed}
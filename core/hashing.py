@@ -0,0 +1,70 @@
+"""
+Hashing - Feature hashing untuk kolom high-cardinality (merchant, job, city, zip)
+
+Setiap nilai `kolom=nilai` di-hash (MurmurHash3, sama dengan sklearn
+`FeatureHasher`) ke salah satu dari `n_buckets` kolom. Hasilnya matriks CSR
+dengan satu nilai 1 per kolom sumber per baris, jadi memori sebanding
+dengan jumlah baris, bukan jumlah bucket.
+
+Hash hanya dihitung sekali per nilai unik (lewat kategori pandas), lalu
+dipetakan ke semua baris secara vectorized.
+
+Usage:
+    block = HashedBlock(n_buckets=4096)
+    H = block.transform(df)          # scipy.sparse.csr_matrix (n, 4096)
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.utils import murmurhash3_32
+
+HASHED_COLUMNS = ['merchant', 'job', 'city', 'zip']
+DEFAULT_BUCKETS = 2 ** 12
+
+
+class HashedBlock:
+    """
+    Blok fitur sparse hasil hashing beberapa kolom kategorikal
+
+    Args:
+        n_buckets: Jumlah kolom output (bucket hash)
+        columns: Kolom mentah yang di-hash
+    """
+
+    def __init__(self, n_buckets=DEFAULT_BUCKETS, columns=None):
+        self.n_buckets = int(n_buckets)
+        self.columns = list(columns or HASHED_COLUMNS)
+
+    @property
+    def column_names(self):
+        return [f'hash_{i}' for i in range(self.n_buckets)]
+
+    def bucket(self, col, value):
+        """Indeks bucket untuk satu nilai (dipakai juga oleh jalur single-record)"""
+        return murmurhash3_32(f'{col}={value}', seed=0, positive=True) % self.n_buckets
+
+    def transform(self, df):
+        """DataFrame → CSR float32 (n, n_buckets); nilai kosong (NaN) dilewati"""
+        n = len(df)
+        buckets = np.empty((n, len(self.columns)), dtype=np.int64)
+        for j, col in enumerate(self.columns):
+            cat = pd.Categorical(df[col])
+            lut = np.array([self.bucket(col, value) for value in cat.categories] + [-1],
+                           dtype=np.int64)
+            # cat.codes bernilai -1 untuk NaN → indeks terakhir (-1 = tanpa fitur)
+            buckets[:, j] = lut[cat.codes]
+
+        valid = buckets >= 0
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        indices = buckets[valid]
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(n, self.n_buckets))
+        # Dua kolom sumber bisa jatuh di bucket yang sama dalam satu baris
+        matrix.sum_duplicates()
+        return matrix
+
+    def record_buckets(self, record):
+        """Daftar bucket untuk satu record dict (kolom yang tidak ada dilewati)"""
+        return [self.bucket(col, record[col]) for col in self.columns
+                if col in record and record[col] is not None]
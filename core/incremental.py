@@ -0,0 +1,192 @@
+"""
+Incremental - Retrain warm-start: tambah tree dari data baru, pensiunkan tree lama
+
+Satu siklus retrain (mis. harian) untuk RandomForest di model artifacts:
+
+1. Pipeline diperluas (`FeaturePipeline.extend`): kategori baru mendapat
+   kode baru di akhir vocabulary, scaler dan spatial index dibekukan.
+2. Data baru di-encode dengan pipeline *sebelum* label barunya masuk ke
+   tabel target encoding (sama seperti yang dilihat scoring saat itu),
+   lalu tabel diupdate dengan label tersebut.
+3. `warm_start=True`: `n_new_trees` tree baru di-fit hanya pada data baru
+   dan ditambahkan ke forest. Jika model dilatih dengan downsampling mode
+   'prior' (`prior_neg_rate`, core/sampling.py), data baru di-downsample
+   dengan rate yang sama agar koreksi prior tetap berlaku untuk semua tree.
+4. Tree tertua dipensiunkan sehingga forest tidak melebihi `max_trees`;
+   forest menjadi jendela geser atas data beberapa siklus terakhir.
+
+Fitur velocity/geo pada batch path dihitung dari baris di data baru itu
+sendiri, jadi sertakan histori kartu yang cukup di `df_new` jika fitur
+tersebut aktif.
+
+Usage:
+    python -m core.incremental --model models/fraud_detection_model.pkl \\
+        --data data/new_labelled.csv --new-trees 50 --output models/fraud_detection_model.pkl
+"""
+import argparse
+import copy
+import os
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+
+from core.compact_artifact import save_compact
+from core.data_loader import read_transactions_csv
+from core.features import get_feature_pipeline
+from core.forest import FlatForest
+from core.registry import DEFAULT_REGISTRY_DIR, ModelRegistry
+from core.sampling import downsample_majority
+
+# Hasil yang diturunkan dari forest lama (metrik test set, surrogate distilasi,
+# metrik cv, trial search, kurva OOB); tidak berlaku lagi setelah forest berubah.
+# Data retrain sudah dipakai untuk fit, jadi tidak bisa menggantikan test set.
+STALE_KEYS = ['performance', 'surrogate', 'cv', 'search', 'oob_curve']
+
+
+def append_trees(model, X, y, n_new_trees, max_trees=None):
+    """
+    Tambah `n_new_trees` tree yang di-fit pada (X, y) lalu pensiunkan yang tertua
+
+    Model diubah di tempat. Tree baru memakai seed lanjutan dari
+    `random_state` model (mekanisme warm_start sklearn).
+
+    Args:
+        max_trees: Ukuran forest maksimum setelah retrain (default: ukuran
+            forest sebelum retrain, jadi jumlah tree tetap)
+
+    Returns:
+        Jumlah tree yang dipensiunkan
+    """
+    if len(np.unique(y)) < len(model.classes_):
+        raise ValueError("Data baru harus berisi semua kelas (fraud dan non-fraud)")
+    max_trees = max_trees or len(model.estimators_)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+
+    retired = max(0, len(model.estimators_) - max_trees)
+    if retired:
+        model.estimators_ = model.estimators_[retired:]
+        model.n_estimators = len(model.estimators_)
+    return retired
+
+
+def retrain_incremental(artifacts, df_new, n_new_trees=50, max_trees=None):
+    """
+    Satu siklus retrain incremental atas model artifacts
+
+    Args:
+        artifacts: Dict model artifacts (tidak diubah; hasil berupa salinan)
+        df_new: DataFrame transaksi baru berlabel (kolom mentah + `is_fraud`)
+        n_new_trees: Jumlah tree baru yang di-fit pada data baru
+        max_trees: Ukuran forest maksimum (default: ukuran saat ini)
+
+    Returns:
+        (artifacts_baru, report) dengan report berisi waktu dan jumlah tree.
+        Entry STALE_KEYS di-set None (nama yang dihapus ada di
+        report['dropped']); jalankan training penuh dengan --distill untuk
+        surrogate baru.
+    """
+    start = time.perf_counter()
+    pipeline = copy.deepcopy(get_feature_pipeline(artifacts))
+    model = copy.deepcopy(artifacts['model'])
+    y = df_new['is_fraud'].to_numpy()
+    vocab_sizes = {col: len(mapping) for col, mapping in pipeline.vocab.items()}
+
+    pipeline.extend(df_new)
+    X = pipeline.transform_model_input(df_new)
+    if pipeline.target_encoders is not None:
+        pipeline.update_target_encoding(df_new, y)
+    if hasattr(model, 'feature_names_in_') and not hasattr(X, 'tocsr'):
+        # Model dilatih dengan DataFrame; tanpa nama kolom sklearn memberi warning
+        import pandas as pd
+        X = pd.DataFrame(X, columns=model.feature_names_in_)
+
+    neg_rate = artifacts.get('prior_neg_rate')
+    n_fit_rows = len(y)
+    if neg_rate is not None:
+        index = downsample_majority(y, neg_rate)
+        X = X.iloc[index] if hasattr(X, 'iloc') else X[index]
+        y = y[index]
+        n_fit_rows = len(index)
+
+    fit_start = time.perf_counter()
+    retired = append_trees(model, X, y, n_new_trees, max_trees)
+    fit_seconds = time.perf_counter() - fit_start
+
+    new_artifacts = dict(artifacts)
+    new_artifacts.update({
+        'model': model,
+        'feature_pipeline': pipeline,
+        'label_encoders': pipeline.label_encoders(),
+        'target_encoders': pipeline.target_encoders,
+    })
+    dropped = [key for key in STALE_KEYS if new_artifacts.get(key) is not None]
+    for key in STALE_KEYS:
+        new_artifacts[key] = None
+    report = {
+        'rows': len(df_new),
+        'fit_rows': n_fit_rows,
+        'new_trees': n_new_trees,
+        'retired_trees': retired,
+        'n_trees': len(model.estimators_),
+        'new_categories': {col: len(pipeline.vocab[col]) - n for col, n in vocab_sizes.items()
+                           if len(pipeline.vocab[col]) > n},
+        'dropped': dropped,
+        'fit_seconds': fit_seconds,
+        'total_seconds': time.perf_counter() - start,
+        'retrained_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    info = dict(new_artifacts.get('model_info', {}))
+    info['n_estimators'] = len(model.estimators_)
+    info['incremental_retrains'] = info.get('incremental_retrains', []) + [report]
+    new_artifacts['model_info'] = info
+    return new_artifacts, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain incremental (warm-start) model fraud detection")
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--data', required=True, help="CSV transaksi baru berlabel")
+    parser.add_argument('--new-trees', type=int, default=50)
+    parser.add_argument('--max-trees', type=int, help="Default: ukuran forest saat ini")
+    parser.add_argument('--output', help="Default: timpa --model")
+    parser.add_argument('--registry', nargs='?', const=DEFAULT_REGISTRY_DIR,
+                        help="Publish hasil retrain ke registry dan aktifkan (hot-swap di app)")
+    args = parser.parse_args(argv)
+
+    with open(args.model, 'rb') as f:
+        artifacts = pickle.load(f)
+    df_new = read_transactions_csv(args.data)
+    print(f"📂 {len(df_new):,} transaksi baru ({int(df_new['is_fraud'].sum()):,} fraud)")
+
+    artifacts, report = retrain_incremental(artifacts, df_new, args.new_trees, args.max_trees)
+    print(f"✓ +{report['new_trees']} tree baru, -{report['retired_trees']} tree lama "
+          f"→ {report['n_trees']} tree | fit {report['fit_seconds']:.2f}s")
+    for col, n in report['new_categories'].items():
+        print(f"✓ {n} kategori baru di '{col}'")
+    if report['dropped']:
+        print(f"⚠️  Dihapus karena berasal dari forest lama: {', '.join(report['dropped'])}"
+              + (" (--model-choice surrogate tidak tersedia sampai distill ulang)"
+                 if 'surrogate' in report['dropped'] else ""))
+
+    output = args.output or args.model
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'wb') as f:
+        pickle.dump(artifacts, f)
+    forest_dir = os.path.join(os.path.dirname(os.path.abspath(output)), 'flat_forest')
+    FlatForest.from_sklearn(artifacts['model']).save(forest_dir)
+    try:
+        save_compact(artifacts, os.path.join(os.path.dirname(os.path.abspath(output)), 'compact'))
+    except ValueError as e:
+        print(f"⚠️  Compact artifact dilewati (folder compact lama dihapus): {e}")
+    print(f"✓ Model saved to: {os.path.abspath(output)}")
+    if args.registry:
+        version = ModelRegistry(args.registry).publish(output)
+        print(f"✓ Registry: versi {version} aktif")
+
+
+if __name__ == '__main__':
+    main()
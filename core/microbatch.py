@@ -0,0 +1,152 @@
+"""
+Micro-batching - Gabungkan request konkuren menjadi satu panggilan model
+
+Setiap request dimasukkan ke antrian. Satu worker thread mengambil request
+dari antrian dan menutup batch ketika:
+- jumlah baris mencapai `max_batch_size`, atau
+- `max_wait_ms` terlampaui sejak request pertama di batch, atau
+- antrian kosong dan tidak ada request lain yang sedang diproses handler
+  (adaptif: satu klien tidak perlu menunggu `max_wait_ms`).
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class BatchStats:
+    """Statistik batch: jumlah request, baris, batch dan histogram ukuran batch"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.histogram = {}
+
+    def record(self, n_requests, n_rows):
+        # Bucket pangkat dua: 1, 2, 4, 8, ... (batas atas inklusif)
+        bucket = 1
+        while bucket < n_rows:
+            bucket *= 2
+        with self._lock:
+            self.requests += n_requests
+            self.rows += n_rows
+            self.batches += 1
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'mean_batch_size': self.rows / self.batches if self.batches else 0.0,
+                'batch_size_histogram': {f"<={k}": v for k, v in sorted(self.histogram.items())},
+            }
+
+
+class MicroBatcher:
+    """
+    Kumpulkan request konkuren menjadi micro-batch sebelum scoring
+
+    Args:
+        score_fn: Fungsi `f(list_of_records) -> array probabilitas`; dengan
+            `prepare_fn`, menerima gabungan hasil `prepare_fn` (baris fitur)
+        max_batch_size: Maksimum baris per batch (1 = tanpa batching)
+        max_wait_ms: Maksimum waktu tunggu sejak request pertama di batch
+        prepare_fn: Fungsi opsional `f(list_of_records) -> array fitur` yang
+            dijalankan per request sebelum masuk batch (validasi + fitur)
+
+    Usage:
+        batcher = MicroBatcher(scorer.predict_proba_many, max_batch_size=64)
+        probabilities = batcher.submit(records).result()
+    """
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=2.0, prepare_fn=None):
+        self.score_fn = score_fn
+        self.prepare_fn = prepare_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = BatchStats()
+        self._queue = queue.Queue()
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def enter(self):
+        """Tandai sebuah request mulai diproses (sebelum parsing body)"""
+        with self._active_lock:
+            self._active += 1
+
+    def exit(self):
+        with self._active_lock:
+            self._active -= 1
+
+    def submit(self, records):
+        """
+        Masukkan list record ke antrian, return Future berisi probabilitas
+
+        Dengan `prepare_fn`, record diubah menjadi baris fitur di thread
+        pemanggil; request yang gagal di tahap ini langsung mendapat error
+        dan tidak pernah masuk batch (request lain tidak ikut gagal).
+        """
+        future = Future()
+        if self.prepare_fn is not None:
+            try:
+                records = self.prepare_fn(records)
+            except Exception as e:
+                future.set_exception(e)
+                return future
+        self._queue.put((records, future))
+        return future
+
+    def _collect(self):
+        items = [self._queue.get()]
+        rows = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while rows < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                # Adaptif: tunggu hanya jika masih ada request lain di handler
+                if self._active <= len(items):
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            items.append(item)
+            rows += len(item[0])
+        return items, rows
+
+    def _run(self):
+        while True:
+            items, rows = self._collect()
+            if self.prepare_fn is None:
+                records = [record for batch, _ in items for record in batch]
+            else:
+                records = np.concatenate([batch for batch, _ in items])
+            try:
+                probabilities = self.score_fn(records)
+            except Exception as e:  # diteruskan ke setiap request di batch
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch, future in items:
+                future.set_result(probabilities[offset:offset + len(batch)])
+                offset += len(batch)
+            self.stats.record(len(items), rows)
@@ -0,0 +1,151 @@
+"""
+OOB - Ukuran forest ditentukan dari kurva out-of-bag
+
+Forest ditumbuhkan bertahap (`warm_start`, `step` tree per langkah).
+Setiap tree hanya melihat sampel bootstrap-nya, jadi baris di luar sampel
+itu (out-of-bag) adalah validasi gratis untuk tree tersebut. Probabilitas
+OOB diakumulasi secara incremental (hanya tree baru yang diprediksi per
+langkah) dan dari situ dihitung recall/precision/F1/AUC. Pertumbuhan
+berhenti jika metrik tidak naik lebih dari `tol` selama `patience` langkah
+berturut-turut, atau saat `max_trees` tercapai.
+
+Setiap titik kurva juga mencatat latency scoring satu baris lewat
+FlatForest, karena biaya inference naik linear dengan jumlah tree.
+`smallest_forest` memilih titik terkecil yang memenuhi target recall dan
+`trim_forest` memotong forest ke ukuran tersebut (tree bersifat iid, jadi
+n tree pertama adalah forest n-tree yang valid).
+
+Usage:
+    model = RandomForestClassifier(max_depth=15, random_state=42)
+    curve = grow_forest(model, X_train, y_train, step=25, max_trees=500)
+    point = smallest_forest(curve, target=0.97)
+    trim_forest(model, point['n_trees'])
+"""
+import time
+
+import numpy as np
+
+from core.cv import classification_metrics
+from core.sampling import correct_prior, majority_weights, prior_neg_rate
+from core.search import single_row_latency_us
+
+
+def _tree_input(X):
+    """X dalam format yang diterima langsung oleh DecisionTree di forest"""
+    if hasattr(X, 'tocsr'):
+        return X.tocsr().astype(np.float32)
+    return np.asarray(X, dtype=np.float32)
+
+
+def grow_forest(model, X, y, step=25, max_trees=500, tol=1e-3, patience=2, metric='recall',
+                neg_rate=1.0, correction='prior', verbose=True):
+    """
+    Tumbuhkan RandomForest bertahap dan catat kurva OOB
+
+    Args:
+        model: RandomForestClassifier belum di-fit (bootstrap=True);
+            `n_estimators` awal diabaikan. Model diubah di tempat.
+        step: Jumlah tree per langkah
+        max_trees: Batas atas ukuran forest
+        tol: Kenaikan metrik minimum agar dianggap membaik
+        patience: Jumlah langkah tanpa perbaikan sebelum berhenti
+        metric: Metrik OOB untuk early stopping (lihat core.cv.METRICS)
+        neg_rate, correction: Jika X hasil downsampling (core/sampling.py)
+
+    Returns:
+        List titik kurva: n_trees, semua metrik OOB, oob_coverage,
+        latency_us, fit_seconds (kumulatif)
+    """
+    if not model.bootstrap:
+        raise ValueError("OOB butuh bootstrap=True")
+    y = np.asarray(y)
+    X_tree = _tree_input(X)
+    n_samples = len(y)
+    weights = majority_weights(y, neg_rate) if neg_rate < 1 else None
+    fit_weights = weights if correction == 'weights' else None
+    prior = prior_neg_rate(neg_rate, correction)
+    positive = None
+
+    proba_sum = np.zeros(n_samples)
+    n_votes = np.zeros(n_samples, dtype=np.int32)
+    curve = []
+    best, stale, fit_seconds = -np.inf, 0, 0.0
+    model.set_params(warm_start=True, oob_score=False)
+
+    while len(getattr(model, 'estimators_', [])) < max_trees:
+        n_before = len(getattr(model, 'estimators_', []))
+        model.set_params(n_estimators=min(max_trees, n_before + step))
+        start = time.perf_counter()
+        model.fit(X, y, sample_weight=fit_weights)
+        new_trees = model.estimators_[n_before:]
+        fit_seconds += time.perf_counter() - start
+        if positive is None:
+            positive = int(np.flatnonzero(model.classes_ == 1)[0])
+
+        # OOB incremental: hanya tree baru yang diprediksi
+        in_bag = model.estimators_samples_[n_before:]
+        for tree, sampled in zip(new_trees, in_bag):
+            unsampled = np.flatnonzero(np.bincount(sampled, minlength=n_samples) == 0)
+            proba_sum[unsampled] += tree.predict_proba(X_tree[unsampled],
+                                                       check_input=False)[:, positive]
+            n_votes[unsampled] += 1
+
+        covered = n_votes > 0
+        oob_proba = proba_sum[covered] / n_votes[covered]
+        if prior is not None:
+            oob_proba = correct_prior(oob_proba, prior)
+        point = {
+            'n_trees': len(model.estimators_),
+            **classification_metrics(y[covered], oob_proba,
+                                     sample_weight=None if weights is None else weights[covered]),
+            'oob_coverage': float(covered.mean()),
+            'latency_us': single_row_latency_us(model, X),
+            'fit_seconds': fit_seconds,
+        }
+        curve.append(point)
+        if verbose:
+            print(f"   {point['n_trees']:>4} trees | OOB recall {point['recall']:.4f} "
+                  f"auc {point['roc_auc']:.4f} | {point['latency_us']:.1f} µs/row")
+
+        if point[metric] > best + tol:
+            best, stale = point[metric], 0
+        else:
+            stale += 1
+            if stale >= patience:
+                break
+
+    model.set_params(warm_start=False)
+    return curve
+
+
+def smallest_forest(curve, target=None, metric='recall'):
+    """
+    Titik kurva terkecil dengan `metric >= target`
+
+    Tanpa target (atau jika tidak ada titik yang memenuhi): titik dengan
+    metrik tertinggi, ukuran terkecil jika seri.
+    """
+    if target is not None:
+        for point in curve:
+            if point[metric] >= target:
+                return point
+    return max(curve, key=lambda p: (p[metric], -p['n_trees']))
+
+
+def trim_forest(model, n_trees):
+    """Pertahankan `n_trees` tree pertama (di tempat)"""
+    model.estimators_ = model.estimators_[:n_trees]
+    model.n_estimators = len(model.estimators_)
+    return model
+
+
+def print_growth_report(curve, chosen=None):
+    """Tabel jumlah tree vs metrik OOB vs latency satu baris"""
+    print(f"\n{'trees':>6}{'recall':>9}{'prec':>8}{'f1':>8}{'auc':>8}{'cover':>8}"
+          f"{'µs/row':>9}{'fit s':>8}")
+    print("-" * 64)
+    for p in curve:
+        mark = '  ←' if chosen is not None and p['n_trees'] == chosen['n_trees'] else ''
+        print(f"{p['n_trees']:>6}{p['recall']:>9.4f}{p['precision']:>8.4f}{p['f1_score']:>8.4f}"
+              f"{p['roc_auc']:>8.4f}{p['oob_coverage']:>8.3f}{p['latency_us']:>9.1f}"
+              f"{p['fit_seconds']:>8.2f}{mark}")
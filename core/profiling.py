@@ -0,0 +1,113 @@
+"""
+Profiling - Waktu dan memori (RSS) per stage pipeline
+"""
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_mb():
+    """Resident set size proses saat ini (MB)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024**2
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Peak RSS sepanjang umur proses (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def memory_breakdown_mb():
+    """
+    Rincian memori proses (MB): rss, anon, file, dan pss jika tersedia
+
+    `pss` (proportional set size) membagi page yang dipakai bersama secara
+    proporsional antar proses, jadi cocok untuk mengukur memori per worker
+    yang berbagi model memory-mapped.
+    """
+    fields = {'VmRSS': 'rss', 'RssAnon': 'anon', 'RssFile': 'file'}
+    breakdown = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in fields:
+                    breakdown[fields[key]] = int(value.split()[0]) / 1024
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    breakdown['pss'] = int(line.split()[1]) / 1024
+    except OSError:
+        breakdown.setdefault('rss', current_rss_mb())
+    return breakdown
+
+
+class StageProfiler:
+    """
+    Catat durasi dan peak RSS untuk setiap stage
+
+    Peak per stage diukur dengan thread sampler yang membaca RSS secara
+    periodik, karena `ru_maxrss` hanya memberi peak seumur proses.
+
+    Usage:
+        profiler = StageProfiler()
+        with profiler.stage('load'):
+            ...
+        profiler.print_report()
+    """
+
+    def __init__(self, interval=0.01, verbose=True):
+        self.interval = interval
+        self.verbose = verbose
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        state = {'peak': current_rss_mb()}
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(self.interval):
+                state['peak'] = max(state['peak'], current_rss_mb())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stop.set()
+            sampler.join()
+            rss = current_rss_mb()
+            record = {
+                'stage': name,
+                'seconds': elapsed,
+                'rss_mb': rss,
+                'peak_rss_mb': max(state['peak'], rss),
+            }
+            self.records.append(record)
+            if self.verbose:
+                print(f"   ⏱ [{name}] {elapsed:.2f}s | RSS {rss:,.0f} MB "
+                      f"| peak {record['peak_rss_mb']:,.0f} MB")
+
+    def print_report(self):
+        print("\n" + "-" * 60)
+        print(f"{'Stage':<20}{'Time (s)':>12}{'RSS (MB)':>14}{'Peak (MB)':>14}")
+        print("-" * 60)
+        for r in self.records:
+            print(f"{r['stage']:<20}{r['seconds']:>12.2f}{r['rss_mb']:>14,.0f}"
+                  f"{r['peak_rss_mb']:>14,.0f}")
+        print("-" * 60)
+        print(f"{'TOTAL':<20}{sum(r['seconds'] for r in self.records):>12.2f}"
+              f"{'':>14}{peak_rss_mb():>14,.0f}")
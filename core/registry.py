@@ -0,0 +1,310 @@
+"""
+Registry - Model berversi dengan pointer CURRENT dan hot-swap di proses berjalan
+
+Layout folder registry:
+
+    models/registry/
+        CURRENT                         nama versi aktif (satu baris)
+        20261017-093000/
+            fraud_detection_model.pkl   artifacts lengkap
+            compact/                    format compact (jika ada)
+        20261018-093000/
+            ...
+
+`publish` menyalin artifacts ke folder versi baru (ditulis ke folder
+sementara lalu di-rename, jadi versi tidak pernah terlihat setengah jadi)
+dan memindahkan pointer. Pointer ditulis ke file sementara lalu
+`os.replace`, jadi pembaca selalu melihat versi lama atau versi baru.
+
+`ModelWatcher` memegang model aktif dan memantau CURRENT dari thread
+background. Versi baru di-load, dibangun menjadi scorer dan divalidasi
+(`validate_artifacts`) di thread tersebut, baru kemudian ditukar dengan
+satu assignment. Pemanggil mengambil `snapshot()` sekali per request dan
+memakainya sampai selesai, jadi prediksi yang sedang berjalan tetap
+memakai model lama. Versi yang gagal validasi tidak dipasang; model lama
+tetap melayani dan error dicatat di `status()`.
+
+Usage:
+    python -m core.registry publish --model models/fraud_detection_model.pkl
+    python -m core.registry activate 20261017-093000      # rollback
+    python -m core.registry list
+
+    watcher = ModelWatcher('models/registry').start()
+    scorer = watcher.snapshot()['scorer']
+"""
+import argparse
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from core.compact_artifact import load_artifacts
+from core.features import get_feature_pipeline
+from core.scoring import TransactionScorer
+
+DEFAULT_REGISTRY_DIR = os.path.join('models', 'registry')
+POINTER_FILE = 'CURRENT'
+MODEL_FILE = 'fraud_detection_model.pkl'
+COMPACT_DIR = 'compact'
+POLL_INTERVAL_SECONDS = 2.0
+
+
+class ModelRegistry:
+    """
+    Folder berisi versi artifacts dan pointer CURRENT
+
+    Args:
+        root: Folder registry (dibuat saat publish pertama)
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR):
+        self.root = root
+
+    def versions(self):
+        """Nama versi yang sudah dipublish, terurut (nama default = timestamp)"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if not name.startswith('.') and os.path.isdir(os.path.join(self.root, name)))
+
+    def current_version(self):
+        """Versi yang ditunjuk CURRENT, None jika belum ada"""
+        try:
+            with open(os.path.join(self.root, POINTER_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def artifacts_path(self, version):
+        """Pickle versi tersebut, atau folder compact jika hanya itu yang ada"""
+        directory = os.path.join(self.root, version)
+        pickle_path = os.path.join(directory, MODEL_FILE)
+        if os.path.exists(pickle_path):
+            return pickle_path
+        compact_path = os.path.join(directory, COMPACT_DIR)
+        if os.path.isdir(compact_path):
+            return compact_path
+        raise FileNotFoundError(f"Versi '{version}' tidak berisi artifacts di {directory}")
+
+    def load(self, version=None):
+        """Load artifacts sebuah versi (default: versi aktif)"""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Registry {self.root} belum punya versi aktif")
+        return load_artifacts(self.artifacts_path(version))
+
+    def publish(self, model_path, version=None, activate=True):
+        """
+        Salin artifacts ke versi baru
+
+        Args:
+            model_path: File pickle hasil training; folder `compact/` di
+                sebelahnya ikut disalin jika ada. Boleh juga folder compact.
+            version: Nama versi (default: timestamp YYYYmmdd-HHMMSS)
+            activate: Pindahkan CURRENT ke versi ini
+
+        Returns:
+            Nama versi
+        """
+        version = version or datetime.now().strftime('%Y%m%d-%H%M%S')
+        target = os.path.join(self.root, version)
+        if os.path.exists(target):
+            raise FileExistsError(f"Versi '{version}' sudah ada di {self.root}")
+
+        staging = os.path.join(self.root, f'.{version}.tmp-{os.getpid()}')
+        os.makedirs(staging)
+        try:
+            if os.path.isdir(model_path):
+                shutil.copytree(model_path, os.path.join(staging, COMPACT_DIR))
+            else:
+                shutil.copy2(model_path, os.path.join(staging, MODEL_FILE))
+                compact = os.path.join(os.path.dirname(os.path.abspath(model_path)), COMPACT_DIR)
+                if os.path.isdir(compact):
+                    shutil.copytree(compact, os.path.join(staging, COMPACT_DIR))
+            os.rename(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """Pindahkan CURRENT ke `version` secara atomik (juga untuk rollback)"""
+        self.artifacts_path(version)
+        tmp = os.path.join(self.root, f'.{POINTER_FILE}.tmp-{os.getpid()}')
+        with open(tmp, 'w') as f:
+            f.write(version + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.root, POINTER_FILE))
+
+
+def probe_record(pipeline):
+    """Transaksi sintetis minimal yang bisa di-score oleh pipeline manapun"""
+    record = {'amt': 100.0, 'age': 40, 'hour': 12, 'is_weekend': 0}
+    for col in pipeline.categorical_cols:
+        values = pipeline.classes(col)
+        record[col] = values[0] if values else None
+    return record
+
+
+def validate_artifacts(artifacts, scorer):
+    """
+    Cek artifacts sebelum dipasang; ValueError jika tidak layak melayani
+
+    - model dan pipeline konsisten (jumlah input model sama)
+    - transaksi probe bisa di-score dan probabilitasnya valid
+    """
+    for key in ('model', 'feature_columns'):
+        if key not in artifacts:
+            raise ValueError(f"Artifacts tidak berisi '{key}'")
+    pipeline = get_feature_pipeline(artifacts)
+    n_inputs = getattr(artifacts['model'], 'n_features_in_', pipeline.n_model_inputs)
+    if n_inputs != pipeline.n_model_inputs:
+        raise ValueError(f"Model butuh {n_inputs} fitur, pipeline menghasilkan "
+                         f"{pipeline.n_model_inputs}")
+    proba = np.asarray(scorer.predict_proba(probe_record(pipeline)), dtype=np.float64)
+    if proba.shape != (2,) or not np.all(np.isfinite(proba)) or abs(proba.sum() - 1.0) > 1e-3:
+        raise ValueError(f"Probabilitas probe tidak valid: {proba}")
+
+
+class ModelWatcher:
+    """
+    Model aktif yang ditukar otomatis saat pointer CURRENT registry berubah
+
+    Args:
+        root: Folder registry
+        fallback_path: Artifacts yang dipakai selama registry belum punya
+            versi aktif (mis. models/fraud_detection_model.pkl)
+        interval: Jeda polling pointer (detik)
+        build_scorer: Fungsi artifacts -> scorer (default TransactionScorer)
+
+    Usage:
+        watcher = ModelWatcher('models/registry', 'models/fraud_detection_model.pkl').start()
+        active = watcher.snapshot()      # satu kali per request
+        active['scorer'].score(record)
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR, fallback_path=None,
+                 interval=POLL_INTERVAL_SECONDS, build_scorer=TransactionScorer.from_artifacts):
+        self.registry = ModelRegistry(root)
+        self.fallback_path = fallback_path
+        self.interval = interval
+        self.build_scorer = build_scorer
+        self._active = None
+        self._failed_version = None
+        self._last_error = None
+        self._swaps = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self, version):
+        start = time.perf_counter()
+        if version is None:
+            if self.fallback_path is None:
+                raise FileNotFoundError(f"Registry {self.registry.root} belum punya versi aktif")
+            artifacts = load_artifacts(self.fallback_path)
+        else:
+            artifacts = self.registry.load(version)
+        scorer = self.build_scorer(artifacts)
+        validate_artifacts(artifacts, scorer)
+        return {
+            'version': version,
+            'artifacts': artifacts,
+            'scorer': scorer,
+            'loaded_at': datetime.now().isoformat(timespec='seconds'),
+            'load_seconds': time.perf_counter() - start,
+        }
+
+    def start(self):
+        """Load versi aktif (blocking, sekali) lalu mulai thread polling"""
+        self._active = self._load(self.registry.current_version())
+        if self.interval and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def snapshot(self):
+        """Dict model aktif: version, artifacts, scorer, loaded_at, load_seconds"""
+        return self._active
+
+    def poll(self):
+        """
+        Satu pengecekan pointer; True jika model ditukar
+
+        Versi yang gagal tidak dicoba ulang sampai pointer berpindah lagi.
+        """
+        version = self.registry.current_version()
+        if version is None or version == self._active['version'] or version == self._failed_version:
+            return False
+        try:
+            loaded = self._load(version)
+        except Exception as e:
+            self._failed_version = version
+            self._last_error = f"{version}: {type(e).__name__}: {e}"
+            return False
+        # Satu assignment: request yang sudah memegang snapshot lama tidak terpengaruh
+        self._active = loaded
+        self._failed_version = None
+        self._last_error = None
+        self._swaps += 1
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+
+    def status(self):
+        active = self._active or {}
+        return {
+            'version': active.get('version'),
+            'loaded_at': active.get('loaded_at'),
+            'load_seconds': active.get('load_seconds'),
+            'swaps': self._swaps,
+            'last_error': self._last_error,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registry model berversi")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    publish = sub.add_parser('publish', help="Salin artifacts ke versi baru dan aktifkan")
+    publish.add_argument('--model', default=os.path.join('models', MODEL_FILE),
+                         help="File pickle atau folder compact")
+    publish.add_argument('--version', help="Default: timestamp")
+    publish.add_argument('--no-activate', action='store_true')
+    activate = sub.add_parser('activate', help="Pindahkan CURRENT (deploy / rollback)")
+    activate.add_argument('version')
+    sub.add_parser('list', help="Daftar versi")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.registry)
+    if args.command == 'publish':
+        version = registry.publish(args.model, args.version, activate=not args.no_activate)
+        state = 'aktif' if not args.no_activate else 'belum aktif'
+        print(f"✓ Versi {version} dipublish ({state}) → {os.path.abspath(registry.root)}")
+    elif args.command == 'activate':
+        registry.activate(args.version)
+        print(f"✓ CURRENT → {args.version}")
+    else:
+        current = registry.current_version()
+        for version in registry.versions():
+            print(f"{'*' if version == current else ' '} {version}")
+
+
+if __name__ == '__main__':
+    main()
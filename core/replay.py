@@ -0,0 +1,312 @@
+"""
+Replay - Putar ulang transaksi historis berurutan `unix_time` ke jalur scoring
+
+Setiap transaksi dijadwalkan pada `t0 + (unix_time - unix_time_awal) / speed`
+lalu dikirim ke scorer oleh N thread klien. Latency end-to-end diukur dari
+waktu jadwal sampai hasil scoring diterima, sehingga antrian yang menumpuk
+(scorer lebih lambat dari arus transaksi) langsung terlihat di p99.
+
+Mode:
+    --speed 1      kecepatan asli
+    --speed 3600   satu jam data per detik
+    --speed 0      secepat mungkin (mengukur throughput maksimum)
+
+Target:
+    tanpa --url    ScoringService in-process (scorer + micro-batching yang sama
+                   dengan core/service.py, tanpa HTTP)
+    --url          service HTTP yang sudah berjalan (`python -m core.service`)
+
+Usage:
+    python -m core.replay --data data/credit_card_transactions2.csv --speed 0
+    python -m core.replay --speed 86400 --url http://127.0.0.1:8080/score \\
+        --concurrency 32 --alerts alerts.csv
+"""
+import argparse
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from core.compact_artifact import load_artifacts
+from core.data_loader import load_transactions
+from core.distill import MODEL_CHOICES, select_model
+from core.features import RAW_COLUMNS
+from core.scoring import TransactionScorer
+from core.service import ScoringService
+from core.geo import GEO_INPUT_COLUMNS
+from core.hashing import HASHED_COLUMNS
+from core.velocity import VELOCITY_INPUT_COLUMNS
+
+META_COLUMNS = ['trans_num', 'cc_num', 'unix_time']
+# Field yang dikirim per transaksi: input fitur dasar + velocity/geo + kolom hashing
+RECORD_COLUMNS = list(dict.fromkeys(
+    [c for c in RAW_COLUMNS if c != 'is_fraud'] + VELOCITY_INPUT_COLUMNS + GEO_INPUT_COLUMNS
+    + HASHED_COLUMNS))
+ALERT_COLUMNS = ['trans_num', 'cc_num', 'unix_time', 'category', 'amt',
+                 'fraud_probability', 'latency_ms', 'is_fraud']
+PERCENTILES = [50, 90, 99, 99.9]
+
+# Jumlah baris yang diubah ke dict record sekaligus
+_RECORD_CHUNK = 10_000
+
+
+def load_events(path, limit=None):
+    """
+    Load transaksi yang dibutuhkan untuk replay, terurut `unix_time`
+
+    Hanya kolom input scoring + metadata yang dibaca dari typed cache
+    (core/data_loader.py), jadi extract berukuran besar tetap muat di memori.
+
+    Args:
+        path: CSV berskema credit_card_transactions2.csv
+        limit: Ambil hanya N transaksi pertama (setelah diurutkan)
+    """
+    columns = list(dict.fromkeys(META_COLUMNS + RAW_COLUMNS + RECORD_COLUMNS))
+    events = load_transactions(path, columns=columns)
+    events = events.sort_values('unix_time', kind='stable', ignore_index=True)
+    if limit is not None:
+        events = events.iloc[:limit]
+    return events
+
+
+def iter_records(events):
+    """
+    Yield record JSON-serializable (format body `POST /score`) per transaksi
+
+    Timestamp dikirim sebagai string, sama seperti dari sistem otorisasi;
+    age/hour/is_weekend diturunkan oleh scorer. `cc_num`, `unix_time` dan
+    koordinat ikut dikirim untuk state fitur velocity/geo.
+    """
+    columns = RECORD_COLUMNS
+    for start in range(0, len(events), _RECORD_CHUNK):
+        chunk = events.iloc[start:start + _RECORD_CHUNK][columns].copy()
+        for col in ['trans_date_trans_time', 'dob']:
+            chunk[col] = chunk[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+        for col in ['category', 'gender', 'state', 'merchant', 'job', 'city']:
+            chunk[col] = chunk[col].astype(str)
+        for col in ['amt', 'lat', 'long', 'merch_lat', 'merch_long']:
+            chunk[col] = chunk[col].astype(np.float64)
+        yield from chunk.to_dict('records')
+
+
+# ============================================================================
+# TARGET SCORING
+# ============================================================================
+def inprocess_client(service):
+    """
+    Factory klien untuk ScoringService in-process
+
+    Returns:
+        Fungsi tanpa argumen yang dipanggil sekali per thread klien dan
+        mengembalikan `score(record) -> {'fraud_probability', 'label'}`
+    """
+    def factory():
+        def score(record):
+            service.batcher.enter()
+            try:
+                return service.score([record])[0]
+            finally:
+                service.batcher.exit()
+        return score
+    return factory
+
+
+def http_client(url):
+    """Factory klien HTTP keep-alive (satu koneksi per thread) ke `POST /score`"""
+    parts = urlsplit(url)
+    path = parts.path or '/score'
+
+    def factory():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+
+        def score(record):
+            # Body bytes dikirim bersama header dalam satu send()
+            conn.request('POST', path, body=json.dumps(record).encode('utf-8'),
+                         headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            body = json.loads(response.read())
+            if response.status != 200:
+                raise RuntimeError(body.get('error', response.status))
+            return body
+        return score
+    return factory
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+def replay(events, client_factory, speed=0.0, concurrency=8, progress_every=5.0):
+    """
+    Putar ulang `events` ke scorer dan ukur latency per transaksi
+
+    Args:
+        events: DataFrame dari `load_events` (terurut unix_time)
+        client_factory: Hasil `inprocess_client` atau `http_client`
+        speed: Pengali kecepatan waktu data; 0 = secepat mungkin
+        concurrency: Jumlah thread klien
+        progress_every: Interval print progress (detik), None untuk diam
+
+    Returns:
+        Dict hasil: latency_ms (end-to-end), service_ms, fraud_probability,
+        label (-1 = error), seconds, events_per_sec, errors
+    """
+    n = len(events)
+    unix_time = events['unix_time'].to_numpy(dtype=np.float64)
+    scheduled = np.zeros(n)
+    started = np.zeros(n)
+    finished = np.zeros(n)
+    probability = np.full(n, np.nan, dtype=np.float32)
+    label = np.full(n, -1, dtype=np.int8)
+    errors = []
+
+    # Antrian terbatas: jika scorer tertinggal, emitter ikut tertahan dan
+    # keterlambatannya tercatat sebagai latency (waktu jadwal tetap dipakai)
+    work = queue.Queue(maxsize=concurrency * 4)
+
+    def client():
+        score = client_factory()
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            i, record = item
+            started[i] = time.perf_counter()
+            try:
+                result = score(record)
+                probability[i] = result['fraud_probability']
+                label[i] = result['label']
+            except Exception as e:  # dicatat, replay tetap jalan
+                errors.append((i, repr(e)))
+            finished[i] = time.perf_counter()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    next_progress = start + progress_every if progress_every else None
+    for i, record in enumerate(iter_records(events)):
+        if speed > 0:
+            due = start + (unix_time[i] - unix_time[0]) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            scheduled[i] = due
+        else:
+            scheduled[i] = time.perf_counter()
+        work.put((i, record))
+
+        if next_progress is not None and time.perf_counter() >= next_progress:
+            now = time.perf_counter()
+            behind = max(0.0, now - scheduled[i]) * 1e3
+            print(f"   {i + 1:,}/{n:,} events | {(i + 1) / (now - start):,.0f} ev/s | "
+                  f"emitter lag {behind:,.1f} ms", flush=True)
+            next_progress = now + progress_every
+
+    for _ in threads:
+        work.put(None)
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    return {
+        'latency_ms': (finished - scheduled) * 1e3,
+        'service_ms': (finished - started) * 1e3,
+        'fraud_probability': probability,
+        'label': label,
+        'seconds': seconds,
+        'events_per_sec': n / seconds if seconds else 0.0,
+        'errors': errors,
+    }
+
+
+def alerts_frame(events, result):
+    """DataFrame transaksi yang diberi label fraud oleh scorer"""
+    flagged = result['label'] == 1
+    alerts = events.loc[flagged, [c for c in ALERT_COLUMNS if c in events.columns]].copy()
+    alerts['fraud_probability'] = result['fraud_probability'][flagged]
+    alerts['latency_ms'] = result['latency_ms'][flagged]
+    return alerts[[c for c in ALERT_COLUMNS if c in alerts.columns]]
+
+
+def print_report(events, result):
+    ok = result['label'] >= 0
+    print("\n" + "=" * 60)
+    print(" REPLAY REPORT")
+    print("=" * 60)
+    print(f"Events      : {len(events):,} ({len(result['errors']):,} errors)")
+    print(f"Wall time   : {result['seconds']:.2f}s")
+    print(f"Throughput  : {result['events_per_sec']:,.0f} events/sec")
+
+    print(f"\n{'Latency (ms)':<14}" + ''.join(f"{'p' + format(p, 'g'):>10}" for p in PERCENTILES)
+          + f"{'max':>10}")
+    for name, key in [('end-to-end', 'latency_ms'), ('service', 'service_ms')]:
+        values = result[key][ok]
+        if len(values):
+            row = np.percentile(values, PERCENTILES).tolist() + [values.max()]
+            print(f"{name:<14}" + ''.join(f"{v:>10.2f}" for v in row))
+
+    alerts = result['label'] == 1
+    print(f"\nFraud alerts: {int(alerts.sum()):,}")
+    if 'is_fraud' in events.columns:
+        actual = events['is_fraud'].to_numpy() == 1
+        caught = int((alerts & actual).sum())
+        print(f"   True fraud tertangkap : {caught:,} / {int(actual.sum()):,}")
+        if alerts.any():
+            print(f"   Precision alert       : {caught / alerts.sum():.2%}")
+    if result['errors']:
+        print(f"\nContoh error: {result['errors'][0][1]}")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay transaksi historis ke jalur scoring")
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'),
+                        help="File pickle atau folder compact (core/compact_artifact.py)")
+    parser.add_argument('--url', help="Endpoint service HTTP (default: scorer in-process)")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="Pengali kecepatan (1 = real time, 0 = secepat mungkin)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Jumlah thread klien")
+    parser.add_argument('--limit', type=int, help="Replay hanya N transaksi pertama")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--model-choice', default='teacher', choices=MODEL_CHOICES,
+                        help="surrogate = model distilasi di artifacts (lihat core/distill.py)")
+    parser.add_argument('--alerts', help="Simpan alert fraud ke CSV")
+    args = parser.parse_args(argv)
+
+    events = load_events(args.data, limit=args.limit)
+    if args.url:
+        factory = http_client(args.url)
+        target = args.url
+    else:
+        scorer = TransactionScorer.from_artifacts(select_model(load_artifacts(args.model),
+                                                               args.model_choice))
+        service = ScoringService(scorer, max_batch_size=args.max_batch_size,
+                                 max_wait_ms=args.max_wait_ms, threshold=args.threshold)
+        factory = inprocess_client(service)
+        target = f"in-process (max batch {args.max_batch_size})"
+
+    span = pd.to_timedelta(events['unix_time'].iloc[-1] - events['unix_time'].iloc[0], unit='s')
+    mode = f"{args.speed:g}x" if args.speed > 0 else "as fast as possible"
+    print(f"Replay {len(events):,} events spanning {span} → {target}, {mode}, "
+          f"{args.concurrency} clients", flush=True)
+
+    result = replay(events, factory, speed=args.speed, concurrency=args.concurrency)
+    print_report(events, result)
+
+    if args.alerts:
+        alerts_frame(events, result).to_csv(args.alerts, index=False)
+        print(f"✓ Alerts: {os.path.abspath(args.alerts)}")
+
+
+if __name__ == '__main__':
+    main()
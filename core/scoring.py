@@ -0,0 +1,288 @@
+"""
+Scoring - Jalur scoring low-latency untuk satu transaksi
+
+`TransactionScorer` dibangun sekali dari artifacts (model + FeaturePipeline):
+encoder menjadi dict lookup, scaler menjadi array mean/scale, dan vektor
+fitur float32 dialokasikan sekali per thread. Setiap request hanya mengisi
+vektor tersebut lalu memanggil `predict_proba` satu kali (tanpa pandas,
+tanpa `LabelEncoder.transform`, tanpa `scaler.transform`).
+
+Target latency (di luar model itu sendiri, lihat benchmarks/bench_scorer.py):
+    build_features  p50 < 20 µs, p99 < 100 µs
+"""
+import copy
+import threading
+
+import numpy as np
+
+from core.features import UNKNOWN_CODE, get_feature_pipeline
+from core.forest import FlatForest
+from core.geo import GEO_INPUT_COLUMNS, GeoStore, record_geo
+from core.sampling import correct_prior
+from core.velocity import EMPTY_HISTORY, VELOCITY_COLUMNS, VelocityStore
+
+# Di atas ukuran ini traversal Cython sklearn (semua core) lebih cepat dari FlatForest
+FLAT_FOREST_MAX_BATCH = 512
+
+
+def _array_model(model, n_jobs=1):
+    """
+    Salinan dangkal model yang siap dipanggil dengan numpy array
+
+    - `n_jobs`: untuk satu baris, dispatch joblib ke thread pool jauh lebih
+      mahal daripada traversal tree itu sendiri, jadi default 1.
+    - `feature_names_in_` dihapus agar sklearn tidak memberi warning saat
+      menerima array tanpa nama kolom. Tree (`estimators_`) tetap dibagi,
+      tidak ada duplikasi memori.
+    """
+    fast = copy.copy(model)
+    if hasattr(fast, 'n_jobs'):
+        fast.n_jobs = n_jobs
+    if hasattr(fast, 'feature_names_in_'):
+        del fast.feature_names_in_
+    return fast
+
+
+def _single_row_engine(model):
+    """
+    Engine untuk scoring satu baris
+
+    Random Forest diratakan ke FlatForest (core/forest.py): hasil identik
+    dengan sklearn tetapi tanpa dispatch Python per tree (~50x lebih cepat
+    untuk batch 1). Model lain memakai salinan `_array_model`.
+    """
+    if hasattr(model, 'classes_') and all(hasattr(e, 'tree_') for e in getattr(model, 'estimators_', [None])):
+        return FlatForest.from_sklearn(model)
+    return _array_model(model)
+
+
+class TransactionScorer:
+    """
+    Scorer satu transaksi yang sudah "dikompilasi" dari artifacts
+
+    Args:
+        model: Trained classifier dengan `predict_proba`
+        feature_pipeline: Fitted FeaturePipeline (core/features.py)
+        prior_neg_rate: Jika model dilatih pada sampel non-fraud (core/sampling.py,
+            mode 'prior'), probabilitas dikoreksi dengan `correct_prior`
+
+    Usage:
+        scorer = TransactionScorer(model, feature_pipeline)
+        proba = scorer.predict_proba({'category': 'misc_net', 'amt': 120.0,
+                                      'gender': 'F', 'state': 'NY', 'age': 40,
+                                      'hour': 23, 'is_weekend': 1})
+    """
+
+    def __init__(self, model, feature_pipeline, prior_neg_rate=None):
+        self.model = model
+        self.feature_pipeline = feature_pipeline
+        self.prior_neg_rate = prior_neg_rate
+        self.feature_columns = list(feature_pipeline.feature_columns)
+        self._model = _single_row_engine(model)
+        self._batch_model = _array_model(model, n_jobs=-1)
+        # State histori per kartu, diisi oleh setiap transaksi yang di-score
+        self.velocity_store = VelocityStore() if feature_pipeline.velocity else None
+        self.geo_store = GeoStore() if feature_pipeline.geo else None
+        self._hasher = feature_pipeline.hasher
+
+        n_features = len(self.feature_columns)
+        self._offset = np.zeros(n_features, dtype=np.float64)
+        self._scale = np.ones(n_features, dtype=np.float64)
+        self._categorical_slots = []
+        self._numerical_slots = []
+
+        mean, scale = feature_pipeline.scaler.mean_, feature_pipeline.scaler.scale_
+        for j, col in enumerate(self.feature_columns):
+            if col in feature_pipeline.vocab:
+                self._categorical_slots.append((j, col, dict(feature_pipeline.vocab[col])))
+            else:
+                k = feature_pipeline.numerical_cols.index(col)
+                self._offset[j] = mean[k]
+                self._scale[j] = scale[k]
+                self._numerical_slots.append((j, col))
+
+        self._local = threading.local()
+
+    @classmethod
+    def from_artifacts(cls, artifacts):
+        """Bangun scorer dari dict model artifacts (hasil pickle training)"""
+        return cls(artifacts['model'], get_feature_pipeline(artifacts),
+                   artifacts.get('prior_neg_rate'))
+
+    def _buffers(self):
+        local = self._local
+        if not hasattr(local, 'row'):
+            n_features = len(self.feature_columns)
+            local.raw = np.empty(n_features, dtype=np.float64)
+            # Kolom bucket hashing (jika ada) berada setelah kolom dense
+            local.row = np.zeros((1, self.feature_pipeline.n_model_inputs), dtype=np.float32)
+            local.hashed = []
+        return local.raw, local.row
+
+    def build_features(self, record):
+        """
+        Isi vektor fitur (1, n_features) float32 untuk satu transaksi
+
+        Vektor yang dikembalikan adalah buffer milik thread ini dan akan
+        ditimpa oleh panggilan berikutnya.
+        """
+        return self._fill(*self._read_record(record))
+
+    def _read_record(self, record):
+        """
+        Bagian tanpa state: kolom wajib, kode kategori dan fitur numerik dasar
+
+        Semua KeyError/TypeError karena record tidak valid terjadi di sini,
+        sebelum velocity/geo store diupdate oleh `_fill`.
+        """
+        if 'age' not in record or 'hour' not in record or 'is_weekend' not in record:
+            record = self.feature_pipeline._record_numeric(record)
+
+        hour = record['hour']
+        values = {
+            'amt': record['amt'],
+            'age': record['age'],
+            'hour': hour,
+            'is_weekend': int(record['is_weekend']),
+            'amt_per_hour_ratio': record['amt'] / (hour + 1),
+        }
+        codes = [mapping.get(record[col], UNKNOWN_CODE)
+                 for _, col, mapping in self._categorical_slots]
+        if self.velocity_store is not None or self.geo_store is not None:
+            # Input store harus numerik sebelum store diupdate
+            for col in ('unix_time', 'lat', 'long', 'merch_lat', 'merch_long'):
+                if col in record:
+                    float(record[col])
+        return record, values, codes
+
+    def _fill(self, record, values, codes):
+        if self.velocity_store is not None:
+            values.update(self._velocity(record))
+        if self.geo_store is not None:
+            values.update(self._geo(record))
+        if self.feature_pipeline.spatial_radius_km:
+            values.update(self.feature_pipeline._record_spatial(record))
+        if self.feature_pipeline.target_encoders is not None:
+            values.update(self.feature_pipeline._record_target(record))
+
+        raw, row = self._buffers()
+        for (j, _, _), code in zip(self._categorical_slots, codes):
+            raw[j] = code
+        for j, col in self._numerical_slots:
+            raw[j] = values[col]
+
+        np.subtract(raw, self._offset, out=raw)
+        np.divide(raw, self._scale, out=raw)
+        row[0, :len(raw)] = raw
+        if self._hasher is not None:
+            self._set_hashed(row, record)
+        return row
+
+    def _set_hashed(self, row, record):
+        # Hanya bucket record sebelumnya yang di-nol-kan: O(jumlah kolom hash)
+        local = self._local
+        offset = len(self.feature_columns)
+        for bucket in local.hashed:
+            row[0, offset + bucket] = 0
+        local.hashed = self._hasher.record_buckets(record)
+        for bucket in local.hashed:
+            row[0, offset + bucket] += 1
+
+    def _velocity(self, record):
+        if 'cc_num' in record and 'unix_time' in record:
+            return self.velocity_store.update(record['cc_num'], record['unix_time'], record['amt'])
+        return {col: record.get(col, EMPTY_HISTORY[col]) for col in VELOCITY_COLUMNS}
+
+    def _geo(self, record):
+        if all(col in record for col in GEO_INPUT_COLUMNS):
+            return self.geo_store.update(record['cc_num'], record['unix_time'],
+                                         record['lat'], record['long'],
+                                         record['merch_lat'], record['merch_long'])
+        return record_geo(record)
+
+    def record_label(self, record, label):
+        """
+        Umpan balik label (chargeback / konfirmasi) untuk transaksi yang sudah di-score
+
+        Tabel target encoding diupdate di tempat, jadi transaksi berikutnya
+        langsung melihat fraud rate terbaru. Tanpa target encoding: no-op.
+        """
+        if self.feature_pipeline.target_encoders is not None:
+            self.feature_pipeline.update_target_record(record, label)
+
+    def build_many(self, records):
+        """
+        Matriks fitur (n, n_model_inputs) float32 untuk satu request
+
+        Semua record dibaca dan divalidasi dulu; jika ada yang tidak valid,
+        error dilempar sebelum state velocity/geo diubah oleh record manapun.
+        """
+        parsed = [self._read_record(record) for record in records]
+        X = np.empty((len(records), self.feature_pipeline.n_model_inputs), dtype=np.float32)
+        for i, item in enumerate(parsed):
+            X[i] = self._fill(*item)[0]
+        return X
+
+    def predict_proba_rows(self, X):
+        """
+        Probabilitas fraud untuk matriks hasil `build_many`
+
+        Engine dipilih berdasarkan ukuran batch: FlatForest untuk batch kecil,
+        sklearn dengan semua core untuk batch besar.
+        """
+        engine = self._model if len(X) <= FLAT_FOREST_MAX_BATCH else self._batch_model
+        proba = engine.predict_proba(X)[:, 1]
+        return proba if self.prior_neg_rate is None else correct_prior(proba, self.prior_neg_rate)
+
+    def predict_proba_many(self, records):
+        """Probabilitas fraud untuk beberapa transaksi dalam satu panggilan model"""
+        return self.predict_proba_rows(self.build_many(records))
+
+    def predict_proba(self, record):
+        """Probabilitas [aman, fraud] untuk satu transaksi (satu pass model)"""
+        proba = self._model.predict_proba(self.build_features(record))[0]
+        if self.prior_neg_rate is None:
+            return proba
+        r, p = self.prior_neg_rate, proba[1]
+        fraud = r * p / (r * p + 1.0 - p)
+        return np.array([1.0 - fraud, fraud])
+
+    def score(self, record):
+        """
+        Returns:
+            (prediction, proba) dengan prediction = 1 jika fraud.
+            Sama dengan `model.predict`, tanpa traversal tree kedua.
+        """
+        proba = self.predict_proba(record)
+        return int(proba[1] > proba[0]), proba
+
+
+class BatchScorer:
+    """
+    Scorer untuk batch besar (DataFrame mentah → probabilitas fraud)
+
+    Memakai traversal Cython sklearn dengan semua core (`n_jobs=-1`), yang
+    lebih cepat daripada FlatForest untuk ribuan baris ke atas.
+
+    Args:
+        model: Trained classifier dengan `predict_proba`
+        feature_pipeline: Fitted FeaturePipeline (core/features.py)
+        prior_neg_rate: Koreksi prior downsampling (lihat TransactionScorer)
+    """
+
+    def __init__(self, model, feature_pipeline, n_jobs=-1, prior_neg_rate=None):
+        self.model = model
+        self.feature_pipeline = feature_pipeline
+        self.prior_neg_rate = prior_neg_rate
+        self._model = _array_model(model, n_jobs=n_jobs)
+
+    @classmethod
+    def from_artifacts(cls, artifacts, n_jobs=-1):
+        return cls(artifacts['model'], get_feature_pipeline(artifacts), n_jobs=n_jobs,
+                   prior_neg_rate=artifacts.get('prior_neg_rate'))
+
+    def predict_proba(self, df):
+        """Probabilitas fraud (kelas 1) untuk setiap baris DataFrame mentah"""
+        # Dengan blok hashing input berupa CSR; sklearn menerima sparse tanpa densify
+        proba = self._model.predict_proba(self.feature_pipeline.transform_model_input(df))[:, 1]
+        return proba if self.prior_neg_rate is None else correct_prior(proba, self.prior_neg_rate)
@@ -0,0 +1,217 @@
+"""
+Search - Successive halving untuk hyperparameter RandomForest
+
+Kandidat diambil acak dari `PARAM_GRID`. Pada setiap rung semua kandidat
+yang tersisa di-fit paralel (satu kandidat per core) dengan budget baris
+dan budget tree yang sama-sama naik `factor` kali per rung; hanya 1/factor
+kandidat terbaik yang lanjut. Rung terakhir memakai seluruh baris fit dan
+`n_estimators` penuh dari kandidat.
+
+Setiap trial mencatat semua metrik validasi, waktu fit, waktu predict
+batch, dan latency scoring satu baris lewat FlatForest (engine yang dipakai
+jalur serving). Pareto frontier recall vs latency dihitung hanya dari
+trial full-budget (seluruh baris fit dan `n_estimators` penuh): trial yang
+tidak bisa dikalahkan trial lain sekaligus di recall (lebih tinggi) dan
+latency (lebih rendah). Trial rung awal memakai forest yang lebih kecil
+dari `params`, jadi angkanya tidak mewakili konfigurasi tersebut.
+
+Usage:
+    result = successive_halving(X_train, y_train, n_candidates=24, factor=3)
+    model = RandomForestClassifier(**result['best_params'])
+"""
+import os
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterSampler, train_test_split
+
+from core.cv import classification_metrics, take_rows
+from core.forest import FlatForest
+from core.sampling import fit_downsampled, fraud_proba, majority_weights, prior_neg_rate
+
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200, 400],
+    'max_depth': [8, 12, 15, 20, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', 0.5],
+}
+
+# Parameter tetap untuk setiap kandidat (n_jobs diatur oleh search)
+BASE_PARAMS = {'random_state': 42}
+
+MIN_TREES = 10
+LATENCY_SAMPLES = 200
+
+
+def _subsample(y, n_rows, random_state):
+    """Indeks stratified sebanyak `n_rows` (semua baris jika n_rows >= len(y))"""
+    if n_rows >= len(y):
+        return np.arange(len(y))
+    index, _ = train_test_split(np.arange(len(y)), train_size=n_rows,
+                                random_state=random_state, stratify=y)
+    return np.sort(index)
+
+
+def single_row_latency_us(model, X_valid):
+    """Median latency FlatForest untuk satu baris (µs)"""
+    forest = FlatForest.from_sklearn(model)
+    rows = take_rows(X_valid, np.arange(min(LATENCY_SAMPLES, X_valid.shape[0])))
+    rows = rows.toarray() if hasattr(rows, 'toarray') else np.asarray(rows)
+    rows = rows.astype(np.float32)
+    timings = np.empty(len(rows))
+    for i in range(len(rows)):
+        row = rows[i:i + 1]
+        start = time.perf_counter()
+        forest.predict_proba(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1e6)
+
+
+def _run_trial(candidate, params, rung, n_trees, X_fit, y_fit, X_valid, y_valid,
+               full_budget=False, neg_rate=1.0, correction='prior'):
+    model = RandomForestClassifier(**{**BASE_PARAMS, **params, 'n_estimators': n_trees,
+                                      'n_jobs': 1})
+    start = time.perf_counter()
+    fit_downsampled(model, X_fit, y_fit, neg_rate, correction)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proba = fraud_proba(model, X_valid, prior_neg_rate(neg_rate, correction))
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'candidate': candidate,
+        'rung': rung,
+        'params': params,
+        'n_rows': len(y_fit),
+        'n_trees': n_trees,
+        'full_budget': bool(full_budget),
+        **classification_metrics(y_valid, proba, sample_weight=(
+            majority_weights(y_valid, neg_rate) if neg_rate < 1 else None)),
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+        'latency_us': single_row_latency_us(model, X_valid),
+    }
+
+
+def pareto_frontier(trials, score='recall', cost='latency_us'):
+    """
+    Trial yang tidak didominasi: tidak ada trial lain dengan score >= dan
+    cost <= (salah satunya strict). Diurutkan dari cost terendah.
+    """
+    ordered = sorted(trials, key=lambda t: (t[cost], -t[score]))
+    frontier = []
+    best = -np.inf
+    for trial in ordered:
+        if trial[score] > best:
+            frontier.append(trial)
+            best = trial[score]
+    return frontier
+
+
+def successive_halving(X, y, param_grid=None, n_candidates=24, factor=3, min_rows=None,
+                       metric='recall', valid_size=0.2, n_jobs=-1, random_state=42,
+                       neg_rate=1.0, correction='prior', verbose=True):
+    """
+    Jalankan successive halving atas kandidat RandomForest
+
+    Args:
+        X, y: Data training (DataFrame, ndarray atau CSR); sebagian
+            (`valid_size`) dipisah stratified sebagai validasi
+        param_grid: Ruang parameter (default PARAM_GRID)
+        n_candidates: Jumlah kandidat awal
+        factor: Pengali budget dan pembagi jumlah kandidat per rung
+        min_rows: Budget baris rung pertama (default: diturunkan dari jumlah rung)
+        metric: Metrik validasi untuk seleksi (lihat core.cv.METRICS)
+        n_jobs: Worker paralel (-1 = semua core)
+        neg_rate, correction: Jika X hasil downsampling (core/sampling.py);
+            setiap trial di-fit dengan koreksi yang sama dengan model final
+            dan metrik validasi diberi bobot 1/neg_rate, seperti core.cv
+
+    Returns:
+        Dict dengan 'best_params', 'best_trial', 'trials', 'pareto', 'config'
+    """
+    y = np.asarray(y)
+    fit_index, valid_index = train_test_split(np.arange(len(y)), test_size=valid_size,
+                                              random_state=random_state, stratify=y)
+    X_fit_all, y_fit_all = take_rows(X, fit_index), y[fit_index]
+    X_valid, y_valid = take_rows(X, valid_index), y[valid_index]
+
+    candidates = list(ParameterSampler(param_grid or PARAM_GRID, n_iter=n_candidates,
+                                       random_state=random_state))
+    n_rungs = max(1, int(np.ceil(np.log(len(candidates)) / np.log(factor))))
+    if min_rows is None:
+        min_rows = max(1000, len(y_fit_all) // factor ** (n_rungs - 1))
+    n_workers = (os.cpu_count() or 1) if n_jobs is None or n_jobs < 0 else n_jobs
+
+    trials = []
+    alive = list(range(len(candidates)))
+    for rung in range(n_rungs):
+        last = rung == n_rungs - 1 or len(alive) == 1
+        fraction = 1.0 if last else float(factor) ** (rung - n_rungs + 1)
+        n_rows = len(y_fit_all) if last else min(len(y_fit_all), int(min_rows * factor ** rung))
+        rows = _subsample(y_fit_all, n_rows, random_state)
+        X_fit, y_fit = take_rows(X_fit_all, rows), y_fit_all[rows]
+
+        start = time.perf_counter()
+        results = Parallel(n_jobs=min(n_workers, len(alive)))(
+            delayed(_run_trial)(c, candidates[c], rung, n_trees, X_fit, y_fit, X_valid, y_valid,
+                                full_budget=(n_rows == len(y_fit_all)
+                                             and n_trees == candidates[c]['n_estimators']),
+                                neg_rate=neg_rate, correction=correction)
+            for c in alive
+            for n_trees in [max(MIN_TREES, int(round(candidates[c]['n_estimators'] * fraction)))]
+        )
+        trials.extend(results)
+        if verbose:
+            best = max(results, key=lambda t: t[metric])
+            print(f"   rung {rung}: {len(alive):>3} kandidat | {n_rows:,} rows | "
+                  f"trees x{fraction:.2f} | best {metric} {best[metric]:.4f} "
+                  f"| {time.perf_counter() - start:.1f}s")
+        if last:
+            break
+        ranked = sorted(results, key=lambda t: (-t[metric], t['latency_us']))
+        alive = [t['candidate'] for t in ranked[:max(1, len(ranked) // factor)]]
+
+    final = [t for t in trials if t['rung'] == trials[-1]['rung']]
+    best_trial = max(final, key=lambda t: (t[metric], -t['latency_us']))
+    return {
+        'best_params': {**BASE_PARAMS, **best_trial['params']},
+        'best_trial': best_trial,
+        'trials': trials,
+        'pareto': pareto_frontier([t for t in trials if t['full_budget']]),
+        'config': {'n_candidates': len(candidates), 'factor': factor, 'n_rungs': n_rungs,
+                   'min_rows': min_rows, 'metric': metric, 'neg_rate': neg_rate,
+                   'correction': correction},
+    }
+
+
+def print_search_report(result, top=10):
+    """Trial terbaik di rung terakhir + Pareto frontier recall vs latency"""
+    metric = result['config']['metric']
+    header = (f"{'rung':>4}{'rows':>9}{'trees':>7}{'depth':>7}{'split':>7}{'leaf':>6}"
+              f"{'feat':>7}{'recall':>9}{'prec':>8}{'f1':>8}{'auc':>8}{'fit s':>8}{'µs/row':>9}")
+
+    def line(t):
+        p = t['params']
+        return (f"{t['rung']:>4}{t['n_rows']:>9,}{t['n_trees']:>7}{str(p['max_depth']):>7}"
+                f"{p['min_samples_split']:>7}{p['min_samples_leaf']:>6}{str(p['max_features']):>7}"
+                f"{t['recall']:>9.4f}{t['precision']:>8.4f}{t['f1_score']:>8.4f}{t['roc_auc']:>8.4f}"
+                f"{t['fit_seconds']:>8.2f}{t['latency_us']:>9.1f}")
+
+    final_rung = result['trials'][-1]['rung']
+    final = sorted((t for t in result['trials'] if t['rung'] == final_rung),
+                   key=lambda t: -t[metric])
+    print(f"\nRung terakhir ({len(final)} kandidat, {len(result['trials'])} trial total, "
+          f"seleksi: {metric}):")
+    print(header)
+    for t in final[:top]:
+        print(line(t))
+    print("\nPareto frontier (recall vs latency satu baris, hanya trial full-budget):")
+    print(header)
+    for t in result['pareto']:
+        print(line(t))
+    print(f"\n✓ Best params: {result['best_params']}")
@@ -0,0 +1,179 @@
+"""
+Scoring Service - HTTP microservice untuk scoring transaksi
+
+Model di-load sekali saat start. Request konkuren digabung menjadi
+micro-batch (core/microbatch.py) sebelum satu panggilan `predict_proba`.
+
+Endpoints:
+    POST /score    body: satu transaksi (object) atau {"transactions": [...]}
+    POST /feedback body: {"transactions": [...]} dengan label `is_fraud`
+                   (update tabel target encoding secara incremental)
+    GET  /metrics  queue depth, jumlah request/batch, histogram ukuran batch
+    GET  /health   status service
+
+Usage:
+    python -m core.service --model models/fraud_detection_model.pkl \\
+        --port 8080 --max-batch-size 64 --max-wait-ms 2
+"""
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.compact_artifact import load_artifacts
+from core.distill import MODEL_CHOICES, select_model
+from core.microbatch import MicroBatcher
+from core.scoring import TransactionScorer
+
+
+class ScoringService:
+    """
+    Gabungan scorer + micro-batcher yang dipakai oleh HTTP handler
+
+    Args:
+        scorer: TransactionScorer (core/scoring.py)
+        max_batch_size: Maksimum baris per micro-batch (1 = tanpa batching)
+        max_wait_ms: Maksimum waktu tunggu untuk mengisi batch
+        threshold: Batas probabilitas untuk label fraud
+    """
+
+    def __init__(self, scorer, max_batch_size=64, max_wait_ms=2.0, threshold=0.5):
+        self.scorer = scorer
+        self.threshold = threshold
+        # Fitur dibangun per request sebelum masuk batch: record yang tidak
+        # valid hanya menggagalkan request-nya sendiri
+        self.batcher = MicroBatcher(scorer.predict_proba_rows,
+                                    max_batch_size=max_batch_size,
+                                    max_wait_ms=max_wait_ms,
+                                    prepare_fn=scorer.build_many)
+
+    def score(self, records):
+        probabilities = self.batcher.submit(records).result()
+        return [
+            {'fraud_probability': float(p), 'label': int(p > self.threshold)}
+            for p in probabilities
+        ]
+
+    def feedback(self, records):
+        """Terapkan label baru ke scorer, return jumlah record yang diproses"""
+        for record in records:
+            self.scorer.record_label(record, int(record['is_fraud']))
+        return len(records)
+
+    def metrics(self):
+        metrics = self.batcher.stats.snapshot()
+        metrics['queue_depth'] = self.batcher.queue_depth
+        metrics['max_batch_size'] = self.batcher.max_batch_size
+        metrics['max_wait_ms'] = self.batcher.max_wait * 1000
+        return metrics
+
+
+def make_handler(service):
+    """Buat class request handler yang terikat ke sebuah ScoringService"""
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 agar klien bisa memakai keep-alive
+        protocol_version = 'HTTP/1.1'
+        # Header dan body ditulis terpisah; tanpa TCP_NODELAY, Nagle + delayed
+        # ACK menambah ~40 ms per response
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._send_json(200, service.metrics())
+            elif self.path == '/health':
+                self._send_json(200, {'status': 'ok'})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path == '/feedback':
+                self._feedback()
+                return
+            if self.path != '/score':
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            service.batcher.enter()
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                single = isinstance(payload, dict) and 'transactions' not in payload
+                records = [payload] if single else payload['transactions']
+                results = service.score(records)
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': f"invalid transaction: {e}"})
+                return
+            finally:
+                service.batcher.exit()
+
+            self._send_json(200, results[0] if single else {'results': results})
+
+        def _feedback(self):
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length))
+                count = service.feedback(payload['transactions'])
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': f"invalid feedback: {e}"})
+                return
+            self._send_json(200, {'updated': count})
+
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # Access log per request terlalu mahal di jalur otorisasi
+            pass
+
+    return ScoringHandler
+
+
+class _ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog default (5) terlalu kecil untuk ratusan klien konkuren
+    request_queue_size = 1024
+
+
+def make_server(service, host='127.0.0.1', port=8080):
+    return _ScoringHTTPServer((host, port), make_handler(service))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP scoring service dengan micro-batching")
+    parser.add_argument('--model', default=os.path.join('models', 'fraud_detection_model.pkl'),
+                        help="File pickle atau folder compact (core/compact_artifact.py)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help="Maksimum baris per micro-batch (1 = satu panggilan model per request)")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help="Maksimum waktu tunggu untuk mengisi micro-batch")
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--model-choice', default='teacher', choices=MODEL_CHOICES,
+                        help="surrogate = model distilasi di artifacts (lihat core/distill.py)")
+    args = parser.parse_args(argv)
+
+    scorer = TransactionScorer.from_artifacts(select_model(load_artifacts(args.model),
+                                                           args.model_choice))
+    service = ScoringService(scorer, max_batch_size=args.max_batch_size,
+                             max_wait_ms=args.max_wait_ms, threshold=args.threshold)
+
+    server = make_server(service, args.host, args.port)
+    print(f"✓ Scoring service listening on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch_size}, max wait {args.max_wait_ms} ms)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
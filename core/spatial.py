@@ -0,0 +1,227 @@
+"""
+Spatial - Grid index lokasi merchant untuk fitur kepadatan
+
+Index dibangun offline dari data training (merch_lat/merch_long + label
+fraud) dan disimpan di dalam FeaturePipeline (ikut di model pickle). Untuk
+sebuah lokasi, index menjawab "berapa transaksi dan berapa fraud dalam
+radius r km" tanpa memindai seluruh titik:
+
+- Bumi dibagi menjadi grid sel lat/long berukuran r km (arah lintang).
+- Titik diurutkan per sel (key `baris * n_kolom + kolom`), jadi satu baris
+  grid dengan rentang kolom yang berurutan adalah satu slice kontigu.
+- Query hanya memeriksa 3 baris grid di sekitar titik; jarak diuji dengan
+  dot product vektor satuan (`dot >= cos(r / R)` ⇔ haversine <= r).
+
+Keterbatasan: wrap-around di garis bujur ±180° tidak ditangani.
+
+Usage:
+    index = MerchantGridIndex.build(lat, long, is_fraud, radius_km=10)
+    count, fraud = index.query(40.7, -74.0)
+"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+SPATIAL_COLUMNS = ['nearby_txn_count', 'nearby_fraud_count']
+SPATIAL_INPUT_COLUMNS = ['merch_lat', 'merch_long']
+
+# Slice lebih kecil dari ini diperiksa dengan loop Python (lebih murah
+# daripada overhead beberapa panggilan numpy)
+_SCALAR_SLICE = 64
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _grid(radius_km):
+    """Ukuran sel (derajat) dan jumlah kolom grid untuk sebuah radius"""
+    cell_deg = radius_km / KM_PER_DEGREE
+    return cell_deg, int(math.ceil(360 / cell_deg)) + 1
+
+
+def _cell_keys(lat, lon, cell_deg, n_cols):
+    row = np.floor((lat + 90) / cell_deg).astype(np.int64)
+    col = np.floor((lon + 180) / cell_deg).astype(np.int64)
+    return row * n_cols + col
+
+
+def _unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _unit_vector(lat, lon):
+    """Versi skalar `_unit_vectors` (modul math) untuk query tunggal"""
+    lat, lon = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+class MerchantGridIndex:
+    """
+    Grid index titik merchant dengan hitungan transaksi dan fraud per radius
+
+    Dibuat lewat `build`. Atribut array (points, fraud, cell_keys,
+    cell_starts) bersifat read-only setelah build sehingga aman dipakai
+    bersama oleh banyak thread.
+    """
+
+    def __init__(self, radius_km, points, fraud, cell_keys, cell_starts):
+        self.radius_km = float(radius_km)
+        self.cell_deg, self.n_cols = _grid(self.radius_km)
+        self.cos_radius = math.cos(self.radius_km / EARTH_RADIUS_KM)
+        self.points = points
+        self.fraud = fraud
+        self.cell_keys = cell_keys
+        self.cell_starts = cell_starts
+        self._init_scalar_views()
+
+    @classmethod
+    def build(cls, lat, lon, fraud, radius_km=10.0):
+        """
+        Bangun index dari koordinat training
+
+        Args:
+            lat, lon: Koordinat merchant (derajat)
+            fraud: Label 0/1 per titik
+            radius_km: Radius query (juga ukuran sel grid)
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        keys = _cell_keys(lat, lon, *_grid(float(radius_km)))
+        order = np.argsort(keys, kind='stable')
+        cell_keys, starts = np.unique(keys[order], return_index=True)
+        return cls(
+            radius_km,
+            points=_unit_vectors(lat[order], lon[order]),
+            fraud=np.asarray(fraud, dtype=np.float64)[order],
+            cell_keys=cell_keys.astype(np.int64),
+            cell_starts=np.append(starts, len(order)).astype(np.int64),
+        )
+
+    @property
+    def n_points(self):
+        return len(self.points)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.points, self.fraud, self.cell_keys, self.cell_starts))
+
+    # ----------------------------------------
+    # QUERY
+    # ----------------------------------------
+    def query(self, lat, lon):
+        """
+        Jumlah transaksi dan fraud dalam radius dari satu lokasi
+
+        Returns:
+            (count, fraud_count) sebagai int
+        """
+        lat, lon = float(lat), float(lon)
+        q = _unit_vector(lat, lon)
+        count = 0
+        fraud = 0.0
+        for start, stop in self._candidate_slices(lat, lon):
+            if stop - start <= _SCALAR_SLICE:
+                xyz, labels, cos_radius = self._xyz, self._fraud, self.cos_radius
+                qx, qy, qz = q
+                for i in range(start, stop):
+                    if xyz[3 * i] * qx + xyz[3 * i + 1] * qy + xyz[3 * i + 2] * qz >= cos_radius:
+                        count += 1
+                        fraud += labels[i]
+            else:
+                within = self.points[start:stop] @ q >= self.cos_radius
+                count += int(np.count_nonzero(within))
+                fraud += float(self.fraud[start:stop] @ within)
+        return count, int(round(fraud))
+
+    def query_many(self, lat, lon, own_fraud=None):
+        """
+        Query vectorized untuk banyak lokasi (dikelompokkan per sel grid)
+
+        Args:
+            lat, lon: Array koordinat query
+            own_fraud: Label baris query yang juga ada di index (baris
+                training). Jika diberikan, kontribusi titik itu sendiri
+                dikurangi (leave-one-out) agar label tidak bocor ke fitur.
+
+        Returns:
+            (count, fraud_count) sebagai array float64
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        n = len(lat)
+        count = np.zeros(n)
+        fraud = np.zeros(n)
+        if n == 0:
+            return count, fraud
+
+        queries = _unit_vectors(lat, lon)
+        keys = _cell_keys(lat, lon, self.cell_deg, self.n_cols)
+        order = np.argsort(keys, kind='stable')
+        cells, starts = np.unique(keys[order], return_index=True)
+        bounds = np.append(starts, n)
+
+        for k in range(len(cells)):
+            rows = order[bounds[k]:bounds[k + 1]]
+            # Batas kolom dihitung dari lintang paling ekstrem di sel ini
+            extreme = np.abs(lat[rows]).max()
+            slices = self._candidate_slices(lat[rows[0]], lon[rows[0]], extreme)
+            candidates = [(self.points[a:b], self.fraud[a:b]) for a, b in slices if b > a]
+            if not candidates:
+                continue
+            points = np.concatenate([p for p, _ in candidates])
+            labels = np.concatenate([f for _, f in candidates])
+            within = queries[rows] @ points.T >= self.cos_radius
+            count[rows] = within.sum(axis=1)
+            fraud[rows] = within @ labels
+
+        if own_fraud is not None:
+            count -= 1
+            fraud -= np.asarray(own_fraud, dtype=np.float64)
+        return count, fraud
+
+    def brute_force(self, lat, lon):
+        """Referensi O(n): periksa semua titik (untuk verifikasi dan benchmark)"""
+        q = np.array(_unit_vector(float(lat), float(lon)))
+        within = self.points @ q >= self.cos_radius
+        return int(np.count_nonzero(within)), int(round(float(self.fraud @ within)))
+
+    # ----------------------------------------
+    # HELPERS
+    # ----------------------------------------
+    def _init_scalar_views(self):
+        # Salinan ringkas untuk query tunggal: bisect atas list Python dan
+        # akses elemen array.array jauh lebih murah daripada indexing numpy
+        self._keys = self.cell_keys.tolist()
+        self._xyz = array('d', self.points.ravel().tobytes())
+        self._fraud = array('d', self.fraud.tobytes())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_keys', '_xyz', '_fraud'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_scalar_views()
+
+    def _candidate_slices(self, lat, lon, extreme_lat=None):
+        """Slice titik di 3 baris grid yang bisa berisi titik dalam radius"""
+        row = math.floor((lat + 90) / self.cell_deg)
+        col = math.floor((lon + 180) / self.cell_deg)
+        # Lebar radius dalam derajat bujur membesar ke arah kutub
+        worst = min(89.9, (abs(lat) if extreme_lat is None else extreme_lat) + self.cell_deg)
+        span = math.ceil(self.cell_deg / math.cos(math.radians(worst)) / self.cell_deg)
+
+        slices = []
+        for r in (row - 1, row, row + 1):
+            lo = bisect_left(self._keys, r * self.n_cols + col - span)
+            hi = bisect_right(self._keys, r * self.n_cols + col + span)
+            if hi > lo:
+                slices.append((int(self.cell_starts[lo]), int(self.cell_starts[hi])))
+        return slices
@@ -0,0 +1,244 @@
+"""
+Streaming Training - Out-of-core training mode untuk dataset besar
+
+CSV dibaca per chunk. Untuk setiap chunk dilakukan feature engineering yang
+sama dengan `fraud_detection_rf.py` (via `FeaturePipeline`), StandardScaler
+di-fit secara incremental (`partial_fit`), vocabulary kategorikal
+dikumpulkan, dan sampel training
+stratified per kelas dipertahankan dengan memori terbatas (bottom-k sampling
+dengan random key = uniform sample tanpa replacement).
+
+Test set disisihkan dari stream *sebelum* batas per kelas diterapkan
+(`test_size` dari setiap chunk, tidak ikut partial_fit). Test set juga
+dibatasi per kelas, jadi metrik test diberi bobot kebalikan dari laju
+sampling setiap kelas dan mencerminkan distribusi asli. Batas per kelas
+mengubah fraud rate sampel training; rasio laju sampling kelas disimpan di
+artifacts `prior_neg_rate` dan dikoreksi saat scoring (core/sampling.py).
+
+Usage:
+    python -m core.streaming_train --data data/credit_card_transactions2.csv \\
+        --chunksize 250000 --max-legit 1000000 --max-fraud 1000000
+    python fraud_detection_rf.py --streaming --chunksize 250000
+"""
+import argparse
+import os
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from core.compact_artifact import save_compact
+from core.cv import classification_metrics
+from core.data_loader import COLUMN_DTYPES, DATETIME_COLS
+from core.features import CATEGORICAL_COLS, RAW_COLUMNS, FeaturePipeline
+from core.forest import FlatForest
+from core.profiling import StageProfiler
+from core.sampling import fraud_proba
+
+
+class ClassAwareSampler:
+    """
+    Uniform sample per kelas dengan batas jumlah baris (bottom-k sampling)
+
+    Setiap baris diberi random key; untuk setiap kelas hanya `cap` baris
+    dengan key terkecil yang disimpan. Hasilnya identik dengan uniform sample
+    tanpa replacement atas seluruh stream, dengan memori O(sum(caps)).
+
+    Args:
+        caps: Dict {label_kelas: jumlah_baris_maksimum}
+        random_state: Seed RNG
+    """
+
+    def __init__(self, caps, random_state=42):
+        self.caps = caps
+        self.rng = np.random.default_rng(random_state)
+        self.parts = {cls: None for cls in caps}
+        self.seen = {cls: 0 for cls in caps}
+
+    def add(self, chunk, target_col='is_fraud'):
+        keys = self.rng.random(len(chunk))
+        labels = chunk[target_col].to_numpy()
+        for cls, cap in self.caps.items():
+            mask = labels == cls
+            n = int(mask.sum())
+            if n == 0:
+                continue
+            self.seen[cls] += n
+            part = chunk[mask].assign(_key=keys[mask])
+            if self.parts[cls] is not None:
+                part = pd.concat([self.parts[cls], part], ignore_index=True)
+            if len(part) > cap:
+                keep = np.argpartition(part['_key'].to_numpy(), cap - 1)[:cap]
+                part = part.iloc[np.sort(keep)].reset_index(drop=True)
+            self.parts[cls] = part
+
+    def sample(self):
+        parts = [p for p in self.parts.values() if p is not None]
+        return pd.concat(parts, ignore_index=True).drop(columns='_key')
+
+    def inclusion_rates(self):
+        """Fraksi baris setiap kelas di stream yang masuk ke sampel"""
+        return {cls: (len(self.parts[cls]) / self.seen[cls] if self.seen[cls] else 1.0)
+                for cls in self.caps}
+
+
+def iter_raw_chunks(path, chunksize):
+    """Baca kolom yang dibutuhkan dari CSV per chunk"""
+    dtypes = {c: COLUMN_DTYPES[c] for c in RAW_COLUMNS if c not in DATETIME_COLS}
+    # Kategori per chunk berbeda-beda, jadi baca sebagai string biasa
+    for col in CATEGORICAL_COLS:
+        dtypes[col] = 'str'
+    return pd.read_csv(path, usecols=RAW_COLUMNS, dtype=dtypes,
+                       parse_dates=DATETIME_COLS, date_format='ISO8601',
+                       chunksize=chunksize)
+
+
+def scan(path, chunksize, caps, test_caps, pipeline, test_size=0.2, random_state=42):
+    """
+    Satu pass atas CSV: sisihkan test set, partial_fit pipeline, kumpulkan sampel
+
+    Baris test dipilih acak per baris sebelum batas per kelas diterapkan dan
+    tidak ikut partial_fit (scaler/vocabulary hanya dari baris training).
+
+    Returns:
+        (sampler training, sampler test, total_rows)
+    """
+    sampler = ClassAwareSampler(caps, random_state=random_state)
+    test_sampler = ClassAwareSampler(test_caps, random_state=random_state + 1)
+    rng = np.random.default_rng(random_state)
+    total_rows = 0
+
+    for i, chunk in enumerate(iter_raw_chunks(path, chunksize)):
+        chunk = pipeline.add_features(chunk).drop(columns=['dob', 'trans_date_trans_time'])
+        holdout = rng.random(len(chunk)) < test_size
+        train = chunk[~holdout]
+        pipeline.partial_fit(train)
+        sampler.add(train)
+        test_sampler.add(chunk[holdout])
+        total_rows += len(chunk)
+        print(f"   chunk {i + 1}: {total_rows:,} rows scanned")
+
+    return sampler, test_sampler, total_rows
+
+
+def train_streaming(data_path, output_path, chunksize=250_000,
+                    max_legit=1_000_000, max_fraud=1_000_000, test_size=0.2, random_state=42):
+    """
+    Jalankan training streaming end-to-end dan simpan model artifacts
+
+    Returns:
+        Dict model artifacts (format sama dengan `fraud_detection_rf.py`)
+    """
+    profiler = StageProfiler()
+    pipeline = FeaturePipeline()
+    caps = {0: max_legit, 1: max_fraud}
+    # Test set sebanding dengan sampel training (rasio test_size : 1 - test_size)
+    test_caps = {cls: int(np.ceil(cap * test_size / (1 - test_size))) for cls, cap in caps.items()}
+
+    print("📂 Streaming scan (scaler + vocabulary + stratified sample + test holdout)...")
+    with profiler.stage('scan'):
+        sampler, test_sampler, total_rows = scan(data_path, chunksize, caps, test_caps,
+                                                 pipeline, test_size, random_state)
+        sample, test = sampler.sample(), test_sampler.sample()
+    print(f"✓ Rows scanned: {total_rows:,} | Legit: {sampler.seen[0] + test_sampler.seen[0]:,} "
+          f"| Fraud: {sampler.seen[1] + test_sampler.seen[1]:,}")
+    print(f"✓ Training sample: {len(sample):,} rows | Test holdout: {len(test):,} rows")
+
+    with profiler.stage('encode'):
+        X_train = pd.DataFrame(pipeline.transform(sample), columns=pipeline.feature_columns)
+        y_train = sample['is_fraud'].astype(int)
+        X_test = pd.DataFrame(pipeline.transform(test), columns=pipeline.feature_columns)
+        y_test = test['is_fraud'].astype(int).to_numpy()
+        del sample, test
+
+    # Batas per kelas = downsampling; laju relatif non-fraud dikoreksi saat scoring
+    rates = sampler.inclusion_rates()
+    neg_rate = rates[0] / rates[1]
+    prior = None if np.isclose(neg_rate, 1.0) else float(neg_rate)
+    test_rates = test_sampler.inclusion_rates()
+    test_weights = np.where(y_test == 1, 1.0 / test_rates[1], 1.0 / test_rates[0])
+
+    model = RandomForestClassifier(
+        n_estimators=200,
+        max_depth=15,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        random_state=random_state,
+        n_jobs=-1,
+        verbose=0
+    )
+    with profiler.stage('fit'):
+        model.fit(X_train, y_train)
+
+    with profiler.stage('evaluate'):
+        # Probabilitas dikoreksi seperti saat scoring; bobot = 1 / laju sampling kelas
+        y_pred_proba = fraud_proba(model, X_test, prior)
+        performance = classification_metrics(y_test, y_pred_proba, sample_weight=test_weights)
+    for name, value in performance.items():
+        print(f"   {name:<10}: {value:.4f}")
+
+    model_artifacts = {
+        'model': model,
+        'prior_neg_rate': prior,
+        'scaler': pipeline.scaler,
+        'label_encoders': pipeline.label_encoders(),
+        'feature_pipeline': pipeline,
+        'feature_columns': pipeline.feature_columns,
+        'numerical_cols': pipeline.numerical_cols,
+        'categorical_cols': pipeline.categorical_cols,
+        'performance': performance,
+        'model_info': {
+            'algorithm': 'Random Forest',
+            'n_estimators': model.n_estimators,
+            'max_depth': model.max_depth,
+            'trained_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'training_mode': 'streaming',
+            'rows_scanned': total_rows,
+            'training_rows': len(X_train),
+            'test_rows': len(X_test),
+            'sampling': {'inclusion_rates': rates, 'test_inclusion_rates': test_rates,
+                         'neg_rate': prior},
+        },
+    }
+
+    with profiler.stage('save'):
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'wb') as f:
+            pickle.dump(model_artifacts, f)
+        forest_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), 'flat_forest')
+        FlatForest.from_sklearn(model).save(forest_dir)
+        try:
+            save_compact(model_artifacts,
+                         os.path.join(os.path.dirname(os.path.abspath(output_path)), 'compact'))
+        except ValueError as e:
+            print(f"⚠️  Compact artifact dilewati (folder compact lama dihapus): {e}")
+    print(f"✓ Model saved to: {os.path.abspath(output_path)}")
+    print(f"✓ Flat forest (mmap) saved to: {forest_dir}")
+
+    profiler.print_report()
+    return model_artifacts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core training mode (chunked CSV)")
+    parser.add_argument('--data', default=os.path.join('data', 'credit_card_transactions2.csv'))
+    parser.add_argument('--output', default=os.path.join('models', 'fraud_detection_model.pkl'))
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--max-legit', type=int, default=1_000_000,
+                        help="Maksimum baris non-fraud di sampel training")
+    parser.add_argument('--max-fraud', type=int, default=1_000_000,
+                        help="Maksimum baris fraud di sampel training")
+    parser.add_argument('--test-size', type=float, default=0.2,
+                        help="Fraksi baris stream yang disisihkan sebagai test set")
+    parser.add_argument('--random-state', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    train_streaming(args.data, args.output, chunksize=args.chunksize,
+                    max_legit=args.max_legit, max_fraud=args.max_fraud,
+                    test_size=args.test_size, random_state=args.random_state)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Target Encoding - Fraud rate ter-smoothing per kategori (category, state, merchant)
+
+Setiap kolom punya satu `TargetEncoder`: vocabulary nilai → indeks dan dua
+array ringkas (jumlah transaksi dan jumlah fraud per nilai). Nilai encoding
+dihitung saat lookup dengan smoothing ke arah fraud rate global:
+
+    rate = (fraud + m * prior) / (count + m)
+
+sehingga kategori dengan sedikit transaksi tidak mendapat rate ekstrem.
+
+- Training: `oof_transform` memberi setiap baris training nilai yang
+  dihitung tanpa fold-nya sendiri (out-of-fold), jadi label baris itu
+  tidak bocor ke fiturnya.
+- Scoring: `lookup` O(1) (dict + dua elemen array).
+- Label baru: `update` / `update_one` menambah hitungan tanpa recompute.
+
+Tulis dan baca (`lookup`/`transform`) memakai lock yang sama: update bisa
+menambah nilai baru ke `index` dan mengganti array `counts`/`frauds`, jadi
+tanpa lock scoring konkuren bisa melihat kode yang belum punya slot array.
+
+Usage:
+    encoder = TargetEncoder(smoothing=20).fit(df['category'], y)
+    rate = encoder.lookup('misc_net')
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+TARGET_ENCODED_COLS = ['category', 'state', 'merchant']
+TARGET_COLUMNS = [f'{col}_fraud_rate' for col in TARGET_ENCODED_COLS]
+
+DEFAULT_SMOOTHING = 20.0
+DEFAULT_FOLDS = 5
+
+
+def fold_ids(n_rows, n_folds=DEFAULT_FOLDS, random_state=42):
+    """Fold acak tetapi deterministik untuk n baris (sama di fit dan transform)"""
+    return np.random.default_rng(random_state).integers(0, n_folds, n_rows)
+
+
+class TargetEncoder:
+    """
+    Tabel target encoding incremental untuk satu kolom kategorikal
+
+    Args:
+        smoothing: Bobot prior `m` (jumlah transaksi "semu" dengan rate global)
+    """
+
+    def __init__(self, smoothing=DEFAULT_SMOOTHING):
+        self.smoothing = float(smoothing)
+        self.index = {}
+        self.counts = np.zeros(0, dtype=np.float64)
+        self.frauds = np.zeros(0, dtype=np.float64)
+        self.total_count = 0.0
+        self.total_fraud = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def prior(self):
+        return self.total_fraud / self.total_count if self.total_count else 0.0
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.frauds.nbytes
+
+    # ----------------------------------------
+    # FIT / UPDATE
+    # ----------------------------------------
+    def fit(self, values, y):
+        """Bangun tabel dari nol"""
+        self.index = {}
+        self.counts = np.zeros(0, dtype=np.float64)
+        self.frauds = np.zeros(0, dtype=np.float64)
+        self.total_count = self.total_fraud = 0.0
+        return self.update(values, y)
+
+    def update(self, values, y):
+        """
+        Tambahkan transaksi berlabel ke tabel (vectorized, tanpa recompute)
+
+        Nilai baru mendapat slot di akhir array; nilai lama hanya ditambah.
+        """
+        codes = self._codes(values, grow=True)
+        y = np.asarray(y, dtype=np.float64)
+        # Nilai kosong (NaN) tidak masuk ke tabel mana pun
+        known = codes >= 0
+        codes, y = codes[known], y[known]
+        with self._lock:
+            n = len(self.counts)
+            self.counts += np.bincount(codes, minlength=n)
+            self.frauds += np.bincount(codes, weights=y, minlength=n)
+            self.total_count += len(y)
+            self.total_fraud += float(y.sum())
+        return self
+
+    def update_one(self, value, label):
+        """Update O(1) untuk satu transaksi berlabel (jalur feedback)"""
+        with self._lock:
+            code = self.index.get(str(value))
+            if code is None:
+                code = len(self.index)
+                self._grow(code + 1)
+                self.index[str(value)] = code
+            self.counts[code] += 1
+            self.frauds[code] += label
+            self.total_count += 1
+            self.total_fraud += label
+
+    # ----------------------------------------
+    # ENCODE
+    # ----------------------------------------
+    def lookup(self, value):
+        """Rate ter-smoothing untuk satu nilai (nilai tidak dikenal → prior)"""
+        key = str(value)
+        with self._lock:
+            prior = self.prior
+            code = self.index.get(key)
+            if code is None:
+                return prior
+            return (self.frauds[code] + self.smoothing * prior) / (self.counts[code] + self.smoothing)
+
+    def transform(self, values):
+        """Rate ter-smoothing untuk array nilai (jalur batch/scoring)"""
+        cat, labels = self._categories(values)
+        with self._lock:
+            prior = self.prior
+            codes = self._lookup_codes(cat, labels)
+            rates = np.append((self.frauds + self.smoothing * prior) / (self.counts + self.smoothing),
+                              prior)
+        # Kode -1 (tidak dikenal) → elemen terakhir (prior)
+        return rates[codes]
+
+    def oof_transform(self, values, y, folds):
+        """
+        Rate out-of-fold untuk baris yang sudah masuk ke tabel
+
+        Kontribusi fold baris itu sendiri (dihitung dari `values`/`y`)
+        dikurangi dari tabel, termasuk dari prior. Setelah `fit(values, y)`
+        hasilnya sama dengan tabel yang dibangun hanya dari fold lain.
+
+        Args:
+            values, y: Baris training (sudah ada di tabel)
+            folds: Fold id per baris (lihat `fold_ids`)
+        """
+        codes = self._codes(values)
+        y = np.asarray(y, dtype=np.float64)
+        folds = np.asarray(folds)
+        if (codes < 0).any():
+            raise ValueError("oof_transform hanya untuk baris yang sudah ada di tabel")
+        n_folds, n_codes = int(folds.max()) + 1, len(self.counts)
+
+        key = folds * n_codes + codes
+        fold_counts = np.bincount(key, minlength=n_folds * n_codes).reshape(n_folds, n_codes)
+        fold_frauds = np.bincount(key, weights=y, minlength=n_folds * n_codes).reshape(n_folds, n_codes)
+
+        out_count = self.total_count - np.bincount(folds, minlength=n_folds)
+        out_fraud = self.total_fraud - np.bincount(folds, weights=y, minlength=n_folds)
+        prior = np.divide(out_fraud, out_count, out=np.zeros(n_folds), where=out_count > 0)[folds]
+
+        counts = self.counts[codes] - fold_counts[folds, codes]
+        frauds = self.frauds[codes] - fold_frauds[folds, codes]
+        return (frauds + self.smoothing * prior) / (counts + self.smoothing)
+
+    # ----------------------------------------
+    # HELPERS
+    # ----------------------------------------
+    def _codes(self, values, grow=False):
+        """Indeks tabel per baris (hanya satu lookup dict per nilai unik)"""
+        cat, labels = self._categories(values)
+        if grow:
+            with self._lock:
+                # Array diperbesar sebelum kode baru terlihat di `index`
+                self._grow(len(self.index) + sum(label not in self.index for label in labels))
+                for label in labels:
+                    if label not in self.index:
+                        self.index[label] = len(self.index)
+        return self._lookup_codes(cat, labels)
+
+    @staticmethod
+    def _categories(values):
+        cat = pd.Categorical(np.asarray(values, dtype=object))
+        return cat, [str(c) for c in cat.categories]
+
+    def _lookup_codes(self, cat, labels):
+        lut = np.array([self.index.get(label, -1) for label in labels] + [-1], dtype=np.int64)
+        return lut[cat.codes]
+
+    def _grow(self, size):
+        if size > len(self.counts):
+            extra = np.zeros(size - len(self.counts), dtype=np.float64)
+            self.counts = np.concatenate([self.counts, extra])
+            self.frauds = np.concatenate([self.frauds, extra])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,231 @@
+"""
+Velocity - Fitur histori per kartu (cc_num)
+
+Untuk setiap transaksi dihitung dari transaksi SEBELUMNYA pada kartu yang
+sama (transaksi itu sendiri tidak ikut dihitung):
+- txn_count_<w>, amt_sum_<w>: jumlah transaksi dan total amount dalam
+  window 1h/24h/7d terakhir (transaksi lama dengan `t_prev > t - w`)
+- secs_since_last: detik sejak transaksi sebelumnya (-1 jika belum ada)
+
+Dua implementasi dengan hasil identik:
+- `VelocityStore`       : streaming, O(1) amortized per event, ring buffer
+                          berbasis array per kartu (untuk scoring real-time)
+- `velocity_features`   : backfill vectorized untuk data historis (training)
+
+Amount dijumlahkan dalam sen (int64) sehingga penjumlahan bergeser di
+ring buffer tidak menumpuk error floating point dan hasilnya sama persis
+dengan backfill. Urutan transaksi dengan `unix_time` yang sama mengikuti
+urutan baris input (sort stabil), jadi stream harus diumpankan dalam
+urutan `unix_time` yang stabil (lihat core/replay.py).
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+VELOCITY_WINDOWS = {'1h': 3600, '24h': 86400, '7d': 7 * 86400}
+VELOCITY_COLUMNS = [
+    f'{stat}_{name}' for name in VELOCITY_WINDOWS for stat in ('txn_count', 'amt_sum')
+] + ['secs_since_last']
+
+# Kolom mentah yang dibutuhkan untuk menghitung fitur velocity
+VELOCITY_INPUT_COLUMNS = ['cc_num', 'unix_time']
+
+# Nilai secs_since_last untuk transaksi pertama sebuah kartu
+NO_PREVIOUS = -1
+
+# Nilai fitur untuk kartu tanpa histori (record tanpa cc_num/unix_time)
+EMPTY_HISTORY = {col: (NO_PREVIOUS if col == 'secs_since_last' else 0)
+                 for col in VELOCITY_COLUMNS}
+
+
+def _to_cents(amt):
+    return np.rint(np.asarray(amt, dtype=np.float64) * 100).astype(np.int64)
+
+
+def card_time_order(cc_num, unix_time):
+    """
+    Urutan baris stabil per (kartu, waktu)
+
+    Satu argsort stabil atas key int64 `kartu * span + waktu` (~3x lebih
+    cepat daripada `np.lexsort` dua kunci untuk puluhan juta baris).
+
+    Returns:
+        (order, kode kartu int64, unix_time int64) dalam urutan baris asli
+    """
+    cards = pd.factorize(np.asarray(cc_num))[0].astype(np.int64)
+    times = np.asarray(unix_time, dtype=np.int64)
+    if len(times) == 0:
+        return np.zeros(0, dtype=np.int64), cards, times
+    rel = times - times.min()
+    key = cards * (int(rel.max()) + 1) + rel
+    return np.argsort(key, kind='stable'), cards, times
+
+
+def velocity_features(df, windows=VELOCITY_WINDOWS):
+    """
+    Backfill vectorized fitur velocity untuk seluruh baris DataFrame
+
+    Baris diurutkan per (kartu, waktu), lalu batas bawah setiap window dicari
+    dengan satu `searchsorted` atas key gabungan `kartu * span + waktu`.
+    Jumlah amount diambil dari prefix sum. Tanpa groupby dan tanpa loop per
+    kartu.
+
+    Args:
+        df: DataFrame dengan kolom `cc_num`, `unix_time` dan `amt`
+        windows: Dict {nama: detik}
+
+    Returns:
+        Dict {nama_fitur: numpy array} dengan urutan baris sama seperti `df`
+    """
+    n = len(df)
+    if n == 0:
+        return {col: np.zeros(0, dtype=np.float64) for col in VELOCITY_COLUMNS}
+
+    # Sort stabil: transaksi dengan waktu sama tetap dalam urutan input
+    order, cards, times = card_time_order(df['cc_num'], df['unix_time'])
+    cents = _to_cents(df['amt'])
+    rel = times[order] - times.min()
+    # span > rentang waktu + window terbesar → key `t - w` tidak pernah
+    # jatuh ke rentang kartu lain
+    span = int(rel.max()) + max(windows.values()) + 1
+    key = cards[order] * span + rel
+    prefix = np.concatenate([[0], np.cumsum(cents[order])])
+    position = np.arange(n)
+
+    features = {}
+    for name, seconds in windows.items():
+        lower = np.searchsorted(key, key - seconds, side='right')
+        count = np.empty(n, dtype=np.float64)
+        total = np.empty(n, dtype=np.float64)
+        count[order] = position - lower
+        total[order] = (prefix[position] - prefix[lower]) / 100
+        features[f'txn_count_{name}'] = count
+        features[f'amt_sum_{name}'] = total
+
+    same_card = np.zeros(n, dtype=bool)
+    same_card[1:] = cards[order][1:] == cards[order][:-1]
+    gap = np.full(n, NO_PREVIOUS, dtype=np.int64)
+    gap[1:] = np.where(same_card[1:], np.diff(rel), NO_PREVIOUS)
+    since_last = np.empty(n, dtype=np.float64)
+    since_last[order] = gap
+    features['secs_since_last'] = since_last
+    return {col: features[col] for col in VELOCITY_COLUMNS}
+
+
+class VelocityStore:
+    """
+    State store streaming untuk fitur velocity per kartu
+
+    Setiap kartu mendapat satu baris di array 2D (ring buffer waktu + amount
+    dalam sen). Per window disimpan indeks absolut transaksi tertua yang
+    masih di dalam window dan total amount-nya; setiap event hanya menggeser
+    indeks tersebut ke depan, jadi biaya amortized O(1) per event.
+    Kapasitas ring buffer digandakan jika sebuah kartu punya lebih banyak
+    transaksi di window terbesar daripada kapasitasnya.
+
+    Args:
+        windows: Dict {nama: detik}, sama dengan yang dipakai saat training
+        capacity: Kapasitas awal ring buffer per kartu
+        n_cards: Jumlah baris kartu yang dialokasikan di awal
+
+    Usage:
+        store = VelocityStore()
+        features = store.update(cc_num, unix_time, amt)
+    """
+
+    def __init__(self, windows=VELOCITY_WINDOWS, capacity=16, n_cards=1024):
+        # Diurutkan naik: window terakhir menentukan data yang masih dibutuhkan
+        items = sorted(windows.items(), key=lambda item: item[1])
+        self.window_names = [name for name, _ in items]
+        self.window_seconds = [int(seconds) for _, seconds in items]
+        n_windows = len(items)
+
+        self._index = {}
+        self._times = np.zeros((n_cards, capacity), dtype=np.int64)
+        self._cents = np.zeros((n_cards, capacity), dtype=np.int64)
+        self._head = np.zeros(n_cards, dtype=np.int64)
+        self._tail = np.zeros((n_cards, n_windows), dtype=np.int64)
+        self._sum = np.zeros((n_cards, n_windows), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @property
+    def n_cards(self):
+        return len(self._index)
+
+    @property
+    def capacity(self):
+        return self._times.shape[1]
+
+    def update(self, card, unix_time, amt):
+        """
+        Hitung fitur untuk transaksi baru lalu catat transaksi tersebut
+
+        Returns:
+            Dict {nama_fitur: nilai} sesuai VELOCITY_COLUMNS
+        """
+        t = int(unix_time)
+        cents = int(round(float(amt) * 100))
+        with self._lock:
+            row = self._row(card)
+            head = int(self._head[row])
+            capacity = self.capacity
+            times = self._times[row]
+            amounts = self._cents[row]
+            tails = self._tail[row]
+            sums = self._sum[row]
+
+            features = {}
+            for k, (name, seconds) in enumerate(zip(self.window_names, self.window_seconds)):
+                tail = int(tails[k])
+                total = int(sums[k])
+                limit = t - seconds
+                while tail < head and times[tail % capacity] <= limit:
+                    total -= int(amounts[tail % capacity])
+                    tail += 1
+                tails[k] = tail
+                sums[k] = total
+                features[f'txn_count_{name}'] = head - tail
+                features[f'amt_sum_{name}'] = total / 100
+            features['secs_since_last'] = (
+                t - int(times[(head - 1) % capacity]) if head else NO_PREVIOUS
+            )
+
+            if head - int(tails[-1]) >= capacity:
+                self._grow_capacity()
+                capacity = self.capacity
+            self._times[row, head % capacity] = t
+            self._cents[row, head % capacity] = cents
+            self._sum[row] += cents
+            self._head[row] = head + 1
+        return features
+
+    def _row(self, card):
+        key = int(card)
+        row = self._index.get(key)
+        if row is None:
+            row = len(self._index)
+            if row == len(self._head):
+                self._grow_cards()
+            self._index[key] = row
+        return row
+
+    def _grow_cards(self):
+        def grow(array):
+            return np.concatenate([array, np.zeros_like(array)])
+        self._times, self._cents = grow(self._times), grow(self._cents)
+        self._head, self._tail, self._sum = grow(self._head), grow(self._tail), grow(self._sum)
+
+    def _grow_capacity(self):
+        old = self.capacity
+        new = old * 2
+        times = np.zeros((len(self._head), new), dtype=np.int64)
+        cents = np.zeros_like(times)
+        rows = np.arange(len(self._head))
+        # Pindahkan `old` entry terakhir setiap kartu ke posisi baru (idx % new)
+        for offset in range(old):
+            absolute = self._head - old + offset
+            valid = absolute >= 0
+            times[rows[valid], absolute[valid] % new] = self._times[rows[valid], absolute[valid] % old]
+            cents[rows[valid], absolute[valid] % new] = self._cents[rows[valid], absolute[valid] % old]
+        self._times, self._cents = times, cents
@@ -0,0 +1,115 @@
+"""
+Worker Pool - Scoring paralel multi-proses dengan model memory-mapped
+
+Forest disimpan sebagai array `.npy` (core/forest.py) dan setiap worker
+membukanya dengan `np.load(mmap_mode='r')`. Semua worker berbagi page fisik
+yang sama di page cache, jadi menambah worker tidak menambah RSS sebesar
+ukuran model dan tidak ada biaya unpickle per proses.
+
+Usage:
+    with ForestWorkerPool('models/flat_forest', n_workers=4) as pool:
+        proba = pool.predict_proba(X)
+"""
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+from core.forest import FlatForest
+from core.profiling import memory_breakdown_mb
+from core.sampling import correct_prior
+
+_FOREST = None
+
+
+def _init_worker(forest_dir):
+    global _FOREST
+    _FOREST = FlatForest.load(forest_dir, mmap_mode='r')
+
+
+def _score_chunk(X):
+    return _FOREST.predict_proba(X)
+
+
+def _worker_memory(_):
+    return os.getpid(), memory_breakdown_mb()
+
+
+class ForestWorkerPool:
+    """
+    Pool proses yang masing-masing memegang FlatForest memory-mapped
+
+    Args:
+        forest_dir: Folder hasil `FlatForest.save` / `python -m core.forest export`
+        n_workers: Jumlah proses (default: semua core)
+        chunk_rows: Jumlah baris per task yang dikirim ke worker
+
+    Worker dibuat dengan start method 'spawn' agar setiap proses benar-benar
+    me-load model sendiri (via mmap), bukan mewarisi memori parent lewat fork.
+    """
+
+    def __init__(self, forest_dir, n_workers=None, chunk_rows=512):
+        self.forest_dir = forest_dir
+        self.n_workers = n_workers or os.cpu_count()
+        self.chunk_rows = chunk_rows
+        context = mp.get_context('spawn')
+        self._pool = context.Pool(self.n_workers, initializer=_init_worker,
+                                  initargs=(forest_dir,))
+
+    def predict_proba(self, X):
+        """Probabilitas kelas untuk X, dibagi per chunk ke seluruh worker"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        chunks = [X[i:i + self.chunk_rows] for i in range(0, len(X), self.chunk_rows)]
+        return np.concatenate(self._pool.map(_score_chunk, chunks))
+
+    def imap_predict_proba(self, matrices):
+        """Scoring iterable matriks fitur secara paralel, urutan hasil dipertahankan"""
+        return self._pool.imap(_score_chunk, matrices)
+
+    def worker_memory(self):
+        """
+        Rincian memori setiap worker (MB), dict {pid: {'rss', 'anon', 'file', 'pss'}}
+
+        Task kecil dikirim berkali-kali sampai semua pid terlihat.
+        """
+        memory = {}
+        for _ in range(50):
+            for pid, breakdown in self._pool.map(_worker_memory, range(self.n_workers * 4),
+                                                 chunksize=1):
+                memory[pid] = breakdown
+            if len(memory) >= self.n_workers:
+                break
+        return memory
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PooledBatchScorer:
+    """
+    Pengganti BatchScorer yang mendistribusikan scoring ke ForestWorkerPool
+
+    Feature engineering dan koreksi prior downsampling (`prior_neg_rate`,
+    core/sampling.py) tetap di proses utama; hanya traversal forest yang
+    dibagi ke worker.
+    """
+
+    def __init__(self, feature_pipeline, pool, prior_neg_rate=None):
+        if feature_pipeline.hasher is not None:
+            raise ValueError("FlatForest butuh input dense; model dengan blok hashing "
+                             "sparse dijalankan dengan BatchScorer (--workers 0)")
+        self.feature_pipeline = feature_pipeline
+        self.pool = pool
+        self.prior_neg_rate = prior_neg_rate
+
+    def predict_proba(self, df):
+        """Probabilitas fraud (kelas 1) untuk setiap baris DataFrame mentah"""
+        proba = self.pool.predict_proba(self.feature_pipeline.transform(df))[:, 1]
+        return proba if self.prior_neg_rate is None else correct_prior(proba, self.prior_neg_rate)
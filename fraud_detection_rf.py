@@ -1,589 +1,936 @@
 # -*- coding: utf-8 -*-
-"""Fraud_detection_RF.ipynb
-
-Automatically generated by Colab.
-
-Original file is located at
-    https://colab.research.google.com/drive/1UpDWW93DiK5-wm4hvz8p3zZM0WhnBOhu
-
-# FRAUD DETECTION MODEL TRAINING with Random Forest
-
-# Import Libraries
 """
+FRAUD DETECTION MODEL TRAINING with Random Forest
+
+Diturunkan dari notebook `notebook/Fraud_detection_RF.ipynb`, sekarang
+sebagai CLI dengan stage bernama dan timing per stage (StageProfiler):
+
+    load → eda → features → split → encode → cv → fit → evaluate → save
+
+- EDA (ringkasan, plot distribusi, heatmap korelasi) bisa dilewati dengan
+  `--skip-eda`. Dengan `--no-plots` juga, matplotlib/seaborn tidak di-import
+  sama sekali, jadi aman untuk job nightly di mesin headless.
+- Encoding, scaler, spatial index dan tabel target encoding di-fit hanya
+  pada baris training setelah split; test set di-transform seperti saat
+  serving (tanpa label), jadi metrik test tidak bocor dari label test.
+- Jika EDA dilewati dan feature cache hit (core/feature_cache.py), CSV
+  tidak dibaca: retrain langsung ke fit (X_train/X_test dari cache).
+- `--plot-dir` menyimpan semua plot sebagai PNG (backend Agg) alih-alih
+  menampilkannya.
+
+Stage opsional `search` (sebelum cv) mencari hyperparameter RandomForest
+dengan successive halving (core/search.py); hasilnya menggantikan
+MODEL_PARAMS untuk cv dan fit.
+
+Stage opsional `sample` (`--neg-rate`, core/sampling.py) mempertahankan
+semua fraud dan hanya sebagian non-fraud dari X_train untuk search, cv dan
+fit. Dengan koreksi 'prior' (default) probabilitas forest dikoreksi dengan
+`correct_prior` di evaluasi dan semua jalur scoring (`prior_neg_rate` di
+artifacts); 'weights' hanya memakai sample weight dan tidak terkalibrasi
+(lihat core/sampling.py). Test set tidak di-sample.
+
+Stage opsional `grow` (`--oob-grow`, core/oob.py) menggantikan
+`n_estimators` tetap: forest ditumbuhkan bertahap dengan warm_start sampai
+recall/AUC out-of-bag berhenti naik, lalu dipotong ke forest terkecil yang
+memenuhi `--oob-target`. Kurva jumlah tree vs OOB vs latency disimpan di
+artifacts `oob_curve`, dan cv memakai ukuran forest yang terpilih.
+
+Stage opsional `distill` (`--distill`, core/distill.py) melatih surrogate
+kecil (tree / forest / gbm) pada probabilitas forest dan menyimpannya di
+artifacts `surrogate` berdampingan dengan forest (teacher).
+
+Mode `--streaming` (core/streaming_train.py) untuk extract yang tidak muat
+di memori: CSV dibaca per chunk, scaler di-fit incremental dan sampel
+training dibatasi per kelas; stage di atas (kecuali save) tidak dijalankan.
+
+Usage:
+    python fraud_detection_rf.py                                  # interaktif
+    python fraud_detection_rf.py --skip-eda --no-plots            # headless
+    python fraud_detection_rf.py --skip-eda --plot-dir reports/   # simpan plot
+    python fraud_detection_rf.py --streaming --chunksize 250000   # out-of-core
+"""
+import argparse
+import os
+import pickle
+import warnings
+from datetime import datetime
 
-# Commented out IPython magic to ensure Python compatibility.
-import pandas as pd
 import numpy as np
-from datetime import datetime
-from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_score
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+import pandas as pd
+from scipy import sparse
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import (accuracy_score, precision_score, recall_score,
                              f1_score, confusion_matrix, roc_auc_score)
-import pickle
-import warnings
-warnings.filterwarnings('ignore')
-
-import matplotlib.pyplot as plt
-import seaborn as sns
-sns.set_style('whitegrid')
-
-# Set matplotlib to display plots inline
-# %matplotlib inline
-
-print("✅ All libraries imported successfully!")
-
-"""# Load Dataset"""
-
-print("📂 Loading dataset...")
-
-# Pastikan file credit_card_transactions2.csv ada di folder yang sama
-# Atau sesuaikan path-nya
-df = pd.read_csv('../data/credit_card_transactions2.csv')
-print("✓ Dataset loaded from '../data/credit_card_transactions2.csv'")
-
-print(f"Total data: {len(df):,} rows")
-print(f"Columns: {len(df.columns)} columns")
-print(f"\nDataset Info:")
-df.info()
-
-"""# EXPLORATORY DATA ANALYSIS (EDA)
-
-## 1. Dataset Overview
-"""
-
-print("\n" + "="*70)
-print("EXPLORATORY DATA ANALYSIS (EDA)")
-print("="*70)
-
-print("\n DATASET OVERVIEW:")
-print(f"   Total Rows: {len(df):,}")
-print(f"   Total Columns: {len(df.columns)}")
-print(f"   Memory Usage: {df.memory_usage().sum() / 1024**2:.2f} MB")
-
-"""## 2. Missing Values Check"""
-
-print("\nMISSING VALUES CHECK:")
-missing = df.isnull().sum()
-if missing.sum() == 0:
-    print("\nNo missing values detected!")
-else:
-    print("\nMissing values found:")
-    print(missing[missing > 0])
-
-"""## 3. Duplicate Check"""
-
-duplicates = df.duplicated().sum()
-print(f"\nDUPLICATE ROWS: {duplicates:,}")
-if duplicates > 0:
-    print(f"   Removing {duplicates:,} duplicates...")
-    df = df.drop_duplicates()
-
-"""## 4. Target Distribution"""
-
-print("\nTARGET DISTRIBUTION (is_fraud):")
-fraud_counts = df['is_fraud'].value_counts()
-print(fraud_counts)
-print(f"\n   Not Fraud: {fraud_counts[0]:,} ({fraud_counts[0]/len(df)*100:.2f}%)")
-print(f"   Fraud:     {fraud_counts[1]:,} ({fraud_counts[1]/len(df)*100:.2f}%)")
-print(f"   Balance Ratio: {fraud_counts[0]/fraud_counts[1]:.2f}:1")
-
-"""## 5. Statistical Summary"""
-
-print("\nSTATISTICAL SUMMARY (Numerical Features):")
-print(df[['amt']].describe())
-
-"""# EDA VISUALIZATIONS
-
-## Target Distribution
-"""
-
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Setup Style
-sns.set_style('whitegrid')
-colors = ['#2ecc71', '#e74c3c']  # Hijau (Aman) & Merah (Fraud)
-
-# Persiapan Data Awal (agar cell bawah tidak error)
-fraud_counts = df['is_fraud'].value_counts()
-print("Setup Visualisasi Selesai. Lanjut ke cell berikutnya.")
-
-print("\n Generating EDA Visualizations...")
-
-plt.figure(figsize=(8, 6)) # Ukuran disesuaikan untuk single plot
-
-ax = fraud_counts.plot(kind='bar', color=colors, edgecolor='black')
-
-plt.title('Distribution: Fraud vs Not Fraud', fontsize=14, fontweight='bold')
-plt.xlabel('Transaction Type', fontsize=12)
-plt.ylabel('Count', fontsize=12)
-plt.xticks([0, 1], ['Not Fraud', 'Fraud'], rotation=0)
-
-# Menambahkan label angka di atas batang
-for i, v in enumerate(fraud_counts):
-    plt.text(i, v + 100, f'{v:,}', ha='center', fontsize=11, fontweight='bold')
-
-plt.tight_layout()
-plt.show()
-
-"""## Amount Distribution by Fraud"""
-
-plt.figure(figsize=(10, 6))
-
-sns.histplot(data=df, x='amt', hue='is_fraud', bins=50, kde=True, palette=colors)
-
-plt.title('Transaction Amount Distribution', fontsize=14, fontweight='bold')
-plt.xlabel('Amount ($)', fontsize=12)
-plt.ylabel('Frequency', fontsize=12)
-plt.xlim(0, 500) # Fokus ke transaksi di bawah $500 biar grafik terbaca
-
-plt.legend(title='Status', labels=['Fraud', 'Not Fraud'])
-plt.tight_layout()
-plt.show()
-
-"""## Boxplot - Amount by Fraud"""
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from core.compact_artifact import save_compact
+from core.cv import METRICS, cross_validate_oof, print_cv_report
+from core.data_loader import CACHE_DIR_NAME, load_transactions
+from core.distill import SURROGATES, distill, print_distill_report
+from core.feature_cache import FeatureCache
+from core.features import FeaturePipeline
+from core.forest import FlatForest
+from core.geo import GEO_COLUMNS
+from core.hashing import HASHED_COLUMNS, DEFAULT_BUCKETS
+from core.oob import grow_forest, print_growth_report, smallest_forest, trim_forest
+from core.profiling import StageProfiler
+from core.registry import DEFAULT_REGISTRY_DIR, ModelRegistry
+from core.sampling import (CORRECTIONS, downsample_majority, fit_downsampled, fraud_proba,
+                           prior_neg_rate)
+from core.search import print_search_report, successive_halving
+from core.streaming_train import train_streaming
+from core.spatial import SPATIAL_INPUT_COLUMNS
+from core.target_encoding import TARGET_ENCODED_COLS
+from core.velocity import VELOCITY_COLUMNS
 
-plt.figure(figsize=(8, 6))
-
-sns.boxplot(data=df, x='is_fraud', y='amt', palette=colors)
-
-plt.title('Amount Distribution (Boxplot)', fontsize=14, fontweight='bold')
-plt.xlabel('Transaction Type', fontsize=12)
-plt.ylabel('Amount ($)', fontsize=12)
-plt.xticks([0, 1], ['Not Fraud', 'Fraud'])
-plt.ylim(0, 1000) # Zoom in ke range 0-1000 dollar
-
-plt.tight_layout()
-plt.show()
-
-"""## Top 10 Categories"""
-
-plt.figure(figsize=(10, 6))
-
-top_categories = df['category'].value_counts().head(10).sort_values(ascending=True)
-top_categories.plot(kind='barh', color='steelblue', edgecolor='black')
-
-plt.title('Top 10 Transaction Categories', fontsize=14, fontweight='bold')
-plt.xlabel('Count', fontsize=12)
-plt.ylabel('Category', fontsize=12)
-
-plt.tight_layout()
-plt.show()
-
-"""## Fraud Rate by Category"""
-
-plt.figure(figsize=(10, 6))
-
-# Menghitung rata-rata fraud per kategori
-fraud_by_category = df.groupby('category')['is_fraud'].mean().sort_values(ascending=True).tail(10)
-
-fraud_by_category.plot(kind='barh', color='coral', edgecolor='black')
-
-plt.title('Top 10 Categories with Highest Fraud Rate', fontsize=14, fontweight='bold')
-plt.xlabel('Fraud Rate (Probability)', fontsize=12)
-plt.ylabel('Category', fontsize=12)
-
-plt.tight_layout()
-plt.show()
-
-"""## Gender Distribution"""
-
-plt.figure(figsize=(8, 6))
-
-gender_fraud = df.groupby(['gender', 'is_fraud']).size().unstack()
-gender_fraud.plot(kind='bar', stacked=False, color=colors, figsize=(8,6), edgecolor='black')
-
-plt.title('Fraud Distribution by Gender', fontsize=14, fontweight='bold')
-plt.xlabel('Gender', fontsize=12)
-plt.ylabel('Count', fontsize=12)
-plt.xticks(rotation=0)
-plt.legend(['Not Fraud', 'Fraud'])
-
-plt.tight_layout()
-plt.show()
-
-"""## State Distribution (Top 10)"""
-
-plt.figure(figsize=(12, 6))
-
-top_states = df['state'].value_counts().head(10)
-top_states.plot(kind='bar', color='teal', edgecolor='black')
-
-plt.title('Top 10 States by Transaction Count', fontsize=14, fontweight='bold')
-plt.xlabel('State', fontsize=12)
-plt.ylabel('Count', fontsize=12)
-plt.xticks(rotation=0)
-
-plt.tight_layout()
-plt.show()
-
-"""## Amount Statistics"""
-
-plt.figure(figsize=(10, 6))
-
-amount_stats = df.groupby('is_fraud')['amt'].agg(['mean', 'median', 'max'])
-
-# Pakai Log Scale biar 'max' yang besar tidak menutupi 'mean' yang kecil
-amount_stats.plot(kind='bar', color=['skyblue', 'orange', 'red'], figsize=(10,6), edgecolor='black')
-
-plt.title('Amount Statistics (Mean, Median, Max)', fontsize=14, fontweight='bold')
-plt.xlabel('Transaction Type', fontsize=12)
-plt.ylabel('Amount ($) - Log Scale', fontsize=12)
-plt.xticks([0, 1], ['Not Fraud', 'Fraud'], rotation=0)
-plt.yscale('log') # Menggunakan skala logaritmik agar visualisasi lebih jelas
-plt.legend(['Mean', 'Median', 'Max'])
-
-plt.tight_layout()
-plt.show()
-
-"""## Correlation Preview"""
-
-plt.figure(figsize=(10, 8))
-
-# Pilih kolom numerik saja untuk korelasi
-numeric_df = df.select_dtypes(include=['float64', 'int64'])
-corr_matrix = numeric_df.corr()
-
-# Gambar Heatmap
-sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', linewidths=0.5)
-
-plt.title('Correlation Matrix Heatmap', fontsize=14, fontweight='bold')
-plt.tight_layout()
-plt.show()
-
-print("✅ EDA Visualizations Complete!\n")
-
-"""# FEATURE ENGINEERING"""
-
-print("="*70)
-print("🔧 FEATURE ENGINEERING")
-print("="*70)
-
-# Hitung umur dari DOB
-df['dob'] = pd.to_datetime(df['dob'])
-current_year = datetime.now().year
-df['age'] = current_year - df['dob'].dt.year
-print(f"✓ Feature 'age' created (range: {df['age'].min()}-{df['age'].max()})")
-
-# Extract jam dari trans_date_trans_time
-df['trans_date_trans_time'] = pd.to_datetime(df['trans_date_trans_time'])
-df['hour'] = df['trans_date_trans_time'].dt.hour
-print(f"✓ Feature 'hour' created (range: {df['hour'].min()}-{df['hour'].max()})")
-
-# Feature tambahan: deteksi pola weekend
-df['is_weekend'] = df['trans_date_trans_time'].dt.dayofweek.isin([5, 6]).astype(int)
-weekend_count = df['is_weekend'].sum()
-print(f"✓ Feature 'is_weekend' created ({weekend_count:,} weekend transactions)")
+warnings.filterwarnings('ignore')
 
-# Feature tambahan: amount per hour ratio
-df['amt_per_hour_ratio'] = df['amt'] / (df['hour'] + 1)
-print(f"✓ Feature 'amt_per_hour_ratio' created")
+DEFAULT_DATA_PATH = os.path.join('data', 'credit_card_transactions2.csv')
+DEFAULT_OUTPUT_DIR = 'models'
 
-# Drop kolom yang tidak relevan
-drop_cols = ['Unnamed: 0', 'cc_num', 'first', 'last', 'street', 'trans_num',
+# Kolom CSV yang tidak dipakai model (kecuali dibutuhkan oleh fitur opsional)
+DROP_COLS = ['Unnamed: 0', 'cc_num', 'first', 'last', 'street', 'trans_num',
              'unix_time', 'trans_date_trans_time', 'dob', 'merchant', 'job',
              'zip', 'lat', 'long', 'merch_lat', 'merch_long', 'merch_zipcode',
              'city_pop', 'city']
 
-df = df.drop(columns=drop_cols, errors='ignore')
-print(f"\n Final features: {df.columns.tolist()}")
-
-"""## Feature Correlation Analysis"""
+MODEL_PARAMS = {
+    'n_estimators': 200,        # 200 decision trees
+    'max_depth': 15,            # Maximum depth of trees
+    'min_samples_split': 5,     # Minimum samples to split
+    'min_samples_leaf': 2,      # Minimum samples in leaf
+    'random_state': 42,         # Reproducibility
+    'n_jobs': -1,               # Use all CPU cores
+    'verbose': 0,               # Matikan verbose biar output CV gak berantakan
+}
 
-print("\nAnalyzing Feature Correlations...")
+# Train/test split (juga bagian dari key feature cache: pipeline di-fit pada X_train)
+SPLIT_PARAMS = {'test_size': 0.2, 'random_state': 42}
+
+COLORS = ['#2ecc71', '#e74c3c']  # Hijau (Aman) & Merah (Fraud)
+
+
+# ============================================================================
+# PLOTTING (lazy: matplotlib hanya di-import jika ada plot yang dibuat)
+# ============================================================================
+
+class Plotter:
+    """
+    Tampilkan plot (`plt.show`), simpan ke PNG, atau lewati sama sekali
+
+    Args:
+        enabled: False = semua plot dilewati (tanpa import matplotlib)
+        plot_dir: Jika diisi, plot disimpan sebagai `<plot_dir>/<nama>.png`
+    """
+
+    def __init__(self, enabled=True, plot_dir=None):
+        self.enabled = enabled
+        self.plot_dir = plot_dir
+        self._plt = None
+        self._sns = None
+
+    @property
+    def plt(self):
+        self._import()
+        return self._plt
+
+    @property
+    def sns(self):
+        self._import()
+        return self._sns
+
+    def _import(self):
+        if self._plt is not None:
+            return
+        import matplotlib
+        if self.plot_dir:
+            matplotlib.use('Agg')
+            os.makedirs(self.plot_dir, exist_ok=True)
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        sns.set_style('whitegrid')
+        self._plt, self._sns = plt, sns
+
+    def finish(self, name):
+        plt = self.plt
+        plt.tight_layout()
+        if self.plot_dir:
+            plt.savefig(os.path.join(self.plot_dir, f'{name}.png'), dpi=100)
+            plt.close('all')
+        else:
+            plt.show()
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def feature_params(args):
+    """Parameter yang menentukan isi X (juga bagian dari key feature cache)"""
+    return {
+        'reference_year': datetime.now().year,
+        'drop_duplicates': True,
+        'velocity': args.velocity,
+        'geo': args.geo,
+        'spatial_radius_km': args.spatial_radius_km,
+        'hash_buckets': args.hash_buckets,
+        'target_encoding': args.target_encoding,
+    }
 
-# Prepare numerical data for correlation
-temp_df = df.copy()
-categorical_cols = ['category', 'gender', 'state']
 
-# Temporary encoding for correlation
-for col in categorical_cols:
-    if col in temp_df.columns:
+def drop_columns(params):
+    """
+    Kolom DROP_COLS yang benar-benar di-drop untuk kombinasi fitur `params`
+
+    Daftar ini ikut masuk key feature cache: modul ini tidak termasuk
+    FEATURE_MODULES (core/feature_cache.py), jadi perubahan DROP_COLS atau
+    aturan keep di bawah tetap menghasilkan key baru.
+    """
+    keep = set()
+    if params['spatial_radius_km']:
+        # Koordinat merchant dibutuhkan untuk membangun spatial index saat fit
+        keep.update(SPATIAL_INPUT_COLUMNS)
+    if params['hash_buckets']:
+        # Kolom high-cardinality tidak di-drop, tetapi di-hash ke blok sparse
+        keep.update(HASHED_COLUMNS)
+    if params['target_encoding']:
+        # merchant dibutuhkan untuk tabel target encoding
+        keep.update(TARGET_ENCODED_COLS)
+    return [c for c in DROP_COLS if c not in keep]
+
+
+def load_dataset(path):
+    """Stage load: baca CSV lewat typed Parquet cache, hapus duplikat"""
+    print("📂 Loading dataset...")
+    df = load_transactions(path)
+    print(f"✓ Dataset loaded from '{path}'")
+    print(f"Total data: {len(df):,} rows")
+    print(f"Columns: {len(df.columns)} columns")
+
+    duplicates = df.duplicated().sum()
+    print(f"\nDUPLICATE ROWS: {duplicates:,}")
+    if duplicates > 0:
+        print(f"   Removing {duplicates:,} duplicates...")
+        df = df.drop_duplicates()
+    return df
+
+
+def run_eda(df, params, plotter):
+    """Stage eda: ringkasan dataset, visualisasi dan korelasi fitur"""
+    print("\n" + "="*70)
+    print("EXPLORATORY DATA ANALYSIS (EDA)")
+    print("="*70)
+
+    print(f"\nDataset Info:")
+    df.info()
+
+    print("\n DATASET OVERVIEW:")
+    print(f"   Total Rows: {len(df):,}")
+    print(f"   Total Columns: {len(df.columns)}")
+    print(f"   Memory Usage: {df.memory_usage().sum() / 1024**2:.2f} MB")
+
+    print("\nMISSING VALUES CHECK:")
+    missing = df.isnull().sum()
+    if missing.sum() == 0:
+        print("\nNo missing values detected!")
+    else:
+        print("\nMissing values found:")
+        print(missing[missing > 0])
+
+    print("\nTARGET DISTRIBUTION (is_fraud):")
+    fraud_counts = df['is_fraud'].value_counts()
+    print(fraud_counts)
+    print(f"\n   Not Fraud: {fraud_counts[0]:,} ({fraud_counts[0]/len(df)*100:.2f}%)")
+    print(f"   Fraud:     {fraud_counts[1]:,} ({fraud_counts[1]/len(df)*100:.2f}%)")
+    print(f"   Balance Ratio: {fraud_counts[0]/fraud_counts[1]:.2f}:1")
+
+    print("\nSTATISTICAL SUMMARY (Numerical Features):")
+    print(df[['amt']].describe())
+
+    if plotter.enabled:
+        print("\n Generating EDA Visualizations...")
+        plot_eda(df, fraud_counts, plotter)
+        print("✅ EDA Visualizations Complete!\n")
+
+    # Korelasi dihitung dari fitur hasil engineering (kolom yang masuk model)
+    print("\nAnalyzing Feature Correlations...")
+    pipeline = FeaturePipeline(**{k: v for k, v in params.items() if k != 'drop_duplicates'})
+    temp_df = pipeline.add_features(df).drop(columns=DROP_COLS, errors='ignore')
+    for col in pipeline.categorical_cols:
         temp_df[col] = LabelEncoder().fit_transform(temp_df[col].astype(str))
-
-# Correlation matrix
-plt.figure(figsize=(12, 10)) # Increased figsize
-correlation = temp_df.corr()
-sns.heatmap(correlation, annot=True, fmt='.2f', cmap='coolwarm', center=0,
-            square=True, linewidths=1, cbar_kws={"shrink": 0.8})
-plt.title('Feature Correlation Heatmap', fontsize=16, fontweight='bold', pad=20) # Increased font size
-plt.tight_layout()
-plt.show()
-
-# Feature correlation with target
-print("\n🎯 Top Correlations with 'is_fraud':")
-target_corr = correlation['is_fraud'].abs().sort_values(ascending=False)
-print(target_corr.head(10))
-
-"""# Preprocessing"""
-
-print("\n" + "="*70)
-print("⚙️ DATA PREPROCESSING")
-print("="*70)
-
-# Pisahkan fitur dan target
-X = df.drop(columns=['is_fraud'])
-y = df['is_fraud']
-
-# Label Encoding untuk kolom kategorikal
-categorical_cols = ['category', 'gender', 'state']
-label_encoders = {}
-
-for col in categorical_cols:
-    if col in X.columns:
-        le = LabelEncoder()
-        X[col] = le.fit_transform(X[col].astype(str))
-        label_encoders[col] = le
-        print(f"✓ Encoded '{col}' → {len(le.classes_)} unique values")
-
-# Scaling untuk numerical features
-numerical_cols = ['amt', 'age', 'hour', 'is_weekend', 'amt_per_hour_ratio']
-scaler = StandardScaler()
-X[numerical_cols] = scaler.fit_transform(X[numerical_cols])
-print(f"\n✓ Scaled {len(numerical_cols)} numerical features")
-
-print(f"\n✅ Total features for training: {X.shape[1]}")
-print(f"✅ Feature names: {X.columns.tolist()}")
-
-"""# Split Data"""
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-print("\n📊 Data Split Summary:")
-print(f"   Training Set:   {len(X_train):,} samples ({len(X_train)/len(X)*100:.1f}%)")
-print(f"   Testing Set:    {len(X_test):,} samples ({len(X_test)/len(X)*100:.1f}%)")
-print(f"   Train Fraud:    {y_train.sum():,} ({y_train.sum()/len(y_train)*100:.1f}%)")
-print(f"   Test Fraud:     {y_test.sum():,} ({y_test.sum()/len(y_test)*100:.1f}%)")
-
-"""# Training Model (Random Forest)"""
-
-# 1. Import library
-from sklearn.model_selection import cross_val_score
-from sklearn.ensemble import RandomForestClassifier
-
-print("\n" + "="*70)
-print("TRAINING & VALIDATION PROCESS")
-print("="*70)
-
-# 2. DEFINISIKAN MODEL DULU (Ini harus paling atas)
-print("1. Menginisialisasi Model Random Forest...")
-model = RandomForestClassifier(
-    n_estimators=200,        # 200 decision trees
-    max_depth=15,            # Maximum depth of trees
-    min_samples_split=5,     # Minimum samples to split
-    min_samples_leaf=2,      # Minimum samples in leaf
-    random_state=42,         # Reproducibility
-    n_jobs=-1,               # Use all CPU cores
-    verbose=0                # Matikan verbose biar output CV gak berantakan
-)
-
-# 3. LAKUKAN CROSS-VALIDATION (Validasi Model)
-print("2. Melakukan Cross-Validation (5-Fold)...")
-# Note: Scoring bisa diganti 'f1' atau 'recall' karena kasus Fraud
-cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy')
-
-print(f"   ► Hasil per fold: {cv_scores}")
-print(f"   ► Rata-rata Accuracy CV: {cv_scores.mean():.4f}")
-
-if cv_scores.mean() > 0.90:
-    print("   ✅ Model Robust & Stabil (Konsisten Tinggi)")
-else:
-    print("   ⚠️ Model kurang stabil, perlu tuning lagi.")
-
-print("-" * 50)
-
-# 4. TRAINING FINAL (Fit ke seluruh data training)
-print("3. Final Training (Fitting model ke seluruh X_train)...")
-model.fit(X_train, y_train)
-
-print("\n✅ Training Complete! Model siap digunakan.")
-
-"""# Model Evaluation"""
-
-print("\n" + "="*70)
-print("📈 MODEL EVALUATION")
-print("="*70)
-
-# Cross-validation setup
-print("\n🔄 Performing Cross-Validation...")
-kfold = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-cv_scores = cross_val_score(model, X, y, cv=kfold, scoring='recall', n_jobs=-1)
-print(f"   Cross-validation Recall Scores: {cv_scores}")
-print(f"   Mean CV Recall: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
-
-y_pred = model.predict(X_test)
-y_pred_proba = model.predict_proba(X_test)[:, 1]
-
-accuracy = accuracy_score(y_test, y_pred)
-precision = precision_score(y_test, y_pred)
-recall = recall_score(y_test, y_pred)
-f1 = f1_score(y_test, y_pred)
-roc_auc = roc_auc_score(y_test, y_pred_proba)
-
-print("\n🎯 PERFORMANCE METRICS:")
-print("-" * 70)
-print(f"Accuracy  : {accuracy:.4f} ({accuracy*100:.2f}%)")
-print(f"Precision : {precision:.4f} ({precision*100:.2f}%) - Dari prediksi fraud, berapa yang benar")
-print(f"Recall    : {recall:.4f} ({recall*100:.2f}%) - Dari fraud asli, berapa yang terdeteksi")
-print(f"F1-Score  : {f1:.4f} - Harmonic mean of Precision & Recall")
-print(f"ROC-AUC   : {roc_auc:.4f} - Area Under ROC Curve")
-print("-" * 70)
-
-# Confusion Matrix
-cm = confusion_matrix(y_test, y_pred)
-print("\n🔍 CONFUSION MATRIX:")
-print("-" * 70)
-print(f"True Negative  (TN): {cm[0][0]:,} → Correctly predicted SAFE")
-print(f"False Positive (FP): {cm[0][1]:,} → False alarm (predicted FRAUD, actually SAFE)")
-print(f"False Negative (FN): {cm[1][0]:,} → MISSED FRAUD (predicted SAFE, actually FRAUD) ⚠️")
-print(f"True Positive  (TP): {cm[1][1]:,} → Correctly predicted FRAUD")
-print("-" * 70)
-
-# Visualize Confusion Matrix
-plt.figure(figsize=(10, 8))
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
-            xticklabels=['Not Fraud', 'Fraud'],
-            yticklabels=['Not Fraud', 'Fraud'],
-            cbar_kws={'label': 'Count'})
-plt.ylabel('Actual Label', fontsize=14, fontweight='bold')
-plt.xlabel('Predicted Label', fontsize=14, fontweight='bold')
-plt.title('Confusion Matrix - Random Forest', fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.show()
-
-"""# Feature Importance Analysis"""
-
-print("\n📊 FEATURE IMPORTANCE ANALYSIS")
-print("-" * 70)
-
-feature_importance = pd.DataFrame({
-    'feature': X.columns,
-    'importance': model.feature_importances_
-}).sort_values('importance', ascending=False)
-
-print("\nTop 10 Most Important Features:")
-print(feature_importance.head(10).to_string(index=False))
-
-# Visualize Feature Importance
-plt.figure(figsize=(12, 8)) # Increased figsize
-top_features = feature_importance.head(10)
-plt.barh(range(len(top_features)), top_features['importance'], color='steelblue')
-plt.yticks(range(len(top_features)), top_features['feature'], fontsize=12) # Increased font size
-plt.xlabel('Importance Score', fontsize=14, fontweight='bold') # Increased font size
-plt.title('Top 10 Feature Importance - Random Forest', fontsize=16, fontweight='bold', pad=20) # Increased font size
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.show()
-
-"""# Save Model"""
-
-print("\n" + "="*70)
-print(" SAVING MODEL & PREPROCESSORS")
-print("="*70)
-
-model_artifacts = {
-    'model': model,
-    'scaler': scaler,
-    'label_encoders': label_encoders,
-    'feature_columns': X.columns.tolist(),
-    'numerical_cols': numerical_cols,
-    'categorical_cols': categorical_cols,
-    'performance': {
-        'accuracy': accuracy,
-        'precision': precision,
-        'recall': recall,
-        'f1_score': f1,
-        'roc_auc': roc_auc
+    correlation = temp_df.corr(numeric_only=True)
+
+    if plotter.enabled:
+        plt = plotter.plt
+        plt.figure(figsize=(12, 10))
+        plotter.sns.heatmap(correlation, annot=True, fmt='.2f', cmap='coolwarm', center=0,
+                            square=True, linewidths=1, cbar_kws={"shrink": 0.8})
+        plt.title('Feature Correlation Heatmap', fontsize=16, fontweight='bold', pad=20)
+        plotter.finish('feature_correlation')
+
+    print("\n🎯 Top Correlations with 'is_fraud':")
+    print(correlation['is_fraud'].abs().sort_values(ascending=False).head(10))
+
+
+def plot_eda(df, fraud_counts, plotter):
+    plt, sns = plotter.plt, plotter.sns
+
+    # Target Distribution
+    plt.figure(figsize=(8, 6))
+    fraud_counts.plot(kind='bar', color=COLORS, edgecolor='black')
+    plt.title('Distribution: Fraud vs Not Fraud', fontsize=14, fontweight='bold')
+    plt.xlabel('Transaction Type', fontsize=12)
+    plt.ylabel('Count', fontsize=12)
+    plt.xticks([0, 1], ['Not Fraud', 'Fraud'], rotation=0)
+    # Menambahkan label angka di atas batang
+    for i, v in enumerate(fraud_counts):
+        plt.text(i, v + 100, f'{v:,}', ha='center', fontsize=11, fontweight='bold')
+    plotter.finish('target_distribution')
+
+    # Amount Distribution by Fraud
+    plt.figure(figsize=(10, 6))
+    sns.histplot(data=df, x='amt', hue='is_fraud', bins=50, kde=True, palette=COLORS)
+    plt.title('Transaction Amount Distribution', fontsize=14, fontweight='bold')
+    plt.xlabel('Amount ($)', fontsize=12)
+    plt.ylabel('Frequency', fontsize=12)
+    plt.xlim(0, 500)  # Fokus ke transaksi di bawah $500 biar grafik terbaca
+    plt.legend(title='Status', labels=['Fraud', 'Not Fraud'])
+    plotter.finish('amount_distribution')
+
+    # Boxplot - Amount by Fraud
+    plt.figure(figsize=(8, 6))
+    sns.boxplot(data=df, x='is_fraud', y='amt', palette=COLORS)
+    plt.title('Amount Distribution (Boxplot)', fontsize=14, fontweight='bold')
+    plt.xlabel('Transaction Type', fontsize=12)
+    plt.ylabel('Amount ($)', fontsize=12)
+    plt.xticks([0, 1], ['Not Fraud', 'Fraud'])
+    plt.ylim(0, 1000)  # Zoom in ke range 0-1000 dollar
+    plotter.finish('amount_boxplot')
+
+    # Top 10 Categories
+    plt.figure(figsize=(10, 6))
+    top_categories = df['category'].value_counts().head(10).sort_values(ascending=True)
+    top_categories.plot(kind='barh', color='steelblue', edgecolor='black')
+    plt.title('Top 10 Transaction Categories', fontsize=14, fontweight='bold')
+    plt.xlabel('Count', fontsize=12)
+    plt.ylabel('Category', fontsize=12)
+    plotter.finish('top_categories')
+
+    # Fraud Rate by Category
+    plt.figure(figsize=(10, 6))
+    fraud_by_category = (df.groupby('category', observed=True)['is_fraud'].mean()
+                         .sort_values(ascending=True).tail(10))
+    fraud_by_category.plot(kind='barh', color='coral', edgecolor='black')
+    plt.title('Top 10 Categories with Highest Fraud Rate', fontsize=14, fontweight='bold')
+    plt.xlabel('Fraud Rate (Probability)', fontsize=12)
+    plt.ylabel('Category', fontsize=12)
+    plotter.finish('fraud_rate_by_category')
+
+    # Gender Distribution
+    gender_fraud = df.groupby(['gender', 'is_fraud'], observed=True).size().unstack()
+    gender_fraud.plot(kind='bar', stacked=False, color=COLORS, figsize=(8, 6), edgecolor='black')
+    plt.title('Fraud Distribution by Gender', fontsize=14, fontweight='bold')
+    plt.xlabel('Gender', fontsize=12)
+    plt.ylabel('Count', fontsize=12)
+    plt.xticks(rotation=0)
+    plt.legend(['Not Fraud', 'Fraud'])
+    plotter.finish('gender_distribution')
+
+    # State Distribution (Top 10)
+    plt.figure(figsize=(12, 6))
+    df['state'].value_counts().head(10).plot(kind='bar', color='teal', edgecolor='black')
+    plt.title('Top 10 States by Transaction Count', fontsize=14, fontweight='bold')
+    plt.xlabel('State', fontsize=12)
+    plt.ylabel('Count', fontsize=12)
+    plt.xticks(rotation=0)
+    plotter.finish('top_states')
+
+    # Amount Statistics (log scale agar 'max' tidak menutupi 'mean')
+    amount_stats = df.groupby('is_fraud')['amt'].agg(['mean', 'median', 'max'])
+    amount_stats.plot(kind='bar', color=['skyblue', 'orange', 'red'], figsize=(10, 6),
+                      edgecolor='black')
+    plt.title('Amount Statistics (Mean, Median, Max)', fontsize=14, fontweight='bold')
+    plt.xlabel('Transaction Type', fontsize=12)
+    plt.ylabel('Amount ($) - Log Scale', fontsize=12)
+    plt.xticks([0, 1], ['Not Fraud', 'Fraud'], rotation=0)
+    plt.yscale('log')
+    plt.legend(['Mean', 'Median', 'Max'])
+    plotter.finish('amount_statistics')
+
+    # Correlation Preview (kolom numerik mentah)
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(df.select_dtypes(include='number').corr(), annot=True, fmt='.2f',
+                cmap='coolwarm', linewidths=0.5)
+    plt.title('Correlation Matrix Heatmap', fontsize=14, fontweight='bold')
+    plotter.finish('correlation_preview')
+
+
+def engineer_features(df, params):
+    """
+    Stage features: fitur turunan yang tidak memakai label
+
+    Returns:
+        (X, y, feature_pipeline); X masih berupa kolom mentah, pipeline
+        belum di-fit (lihat `encode_features`)
+    """
+    print("\n" + "="*70)
+    print("🔧 FEATURE ENGINEERING")
+    print("="*70)
+
+    # Semua fitur turunan dihitung oleh FeaturePipeline (dipakai juga oleh app)
+    feature_pipeline = FeaturePipeline(**{k: v for k, v in params.items() if k != 'drop_duplicates'})
+    df = feature_pipeline.add_features(df)
+    print(f"✓ Feature 'age' created (range: {df['age'].min()}-{df['age'].max()})")
+    print(f"✓ Feature 'hour' created (range: {df['hour'].min()}-{df['hour'].max()})")
+    print(f"✓ Feature 'is_weekend' created ({df['is_weekend'].sum():,} weekend transactions)")
+    print(f"✓ Feature 'amt_per_hour_ratio' created")
+    if params['velocity']:
+        print(f"✓ Velocity features created: {VELOCITY_COLUMNS}")
+    if params['geo']:
+        print(f"✓ Geo features created: {GEO_COLUMNS}")
+
+    df = df.drop(columns=drop_columns(params), errors='ignore')
+    print(f"\n Final features: {df.columns.tolist()}")
+
+    X = df.drop(columns=['is_fraud'])
+    y = df['is_fraud']
+    return X, y, feature_pipeline
+
+
+def encode_features(X_train, X_test, y_train, y_test, feature_pipeline, params,
+                    cache=None, cache_key=None):
+    """
+    Stage encode: fit FeaturePipeline pada X_train, transform X_train dan X_test
+
+    Spatial index dan tabel target encoding hanya berisi label training;
+    baris training mendapat nilai leave-one-out (spatial) / out-of-fold
+    (target encoding), baris test di-transform tanpa `y` seperti saat serving.
+
+    Returns:
+        (X_train, X_test, feature_columns); DataFrame, atau CSR jika blok
+        hashing aktif
+    """
+    feature_pipeline.fit(X_train, y_train)
+    feature_columns = feature_pipeline.output_columns
+    if feature_pipeline.hasher is not None:
+        # CSR end-to-end: cross-validation dan RandomForest menerima sparse
+        X_train = feature_pipeline.transform_sparse(X_train, y_train)
+        X_test = feature_pipeline.transform_sparse(X_test)
+        nbytes = sum(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes for X in (X_train, X_test))
+        print(f"✓ Hashed {HASHED_COLUMNS} → {params['hash_buckets']:,} buckets "
+              f"(CSR, {X_train.nnz + X_test.nnz:,} non-zero, {nbytes / 1024**2:.1f} MB)")
+    else:
+        X_train = pd.DataFrame(feature_pipeline.transform(X_train, y_train),
+                               columns=feature_columns, index=X_train.index)
+        X_test = pd.DataFrame(feature_pipeline.transform(X_test),
+                              columns=feature_columns, index=X_test.index)
+    print(f"✓ Pipeline di-fit pada {X_train.shape[0]:,} baris training")
+
+    if cache is not None:
+        if feature_pipeline.hasher is not None:
+            X = sparse.vstack([X_train, X_test], format='csr')
+        else:
+            X = np.vstack([X_train.to_numpy(), X_test.to_numpy()])
+        cache.save(cache_key, X, np.concatenate([y_train.to_numpy(), y_test.to_numpy()]),
+                   feature_pipeline, feature_columns, params=params, n_train=X_train.shape[0])
+        print(f"✓ Features cached ({cache_key[:12]})")
+    return X_train, X_test, feature_columns
+
+
+def features_from_cache(entry):
+    """
+    Stage features + split + encode saat cache hit
+
+    Returns:
+        (X_train, X_test, y_train, y_test, feature_pipeline, feature_columns);
+        X memory-mapped, pipeline sudah di-fit pada X_train
+    """
+    feature_pipeline = entry['pipeline']
+    feature_columns = entry['columns']
+    n_train = entry['meta']['n_train']
+    X = entry['X']
+    X_train, X_test = X[:n_train], X[n_train:]
+    if feature_pipeline.hasher is None:
+        X_train = pd.DataFrame(X_train, columns=feature_columns)
+        X_test = pd.DataFrame(X_test, columns=feature_columns)
+    y = pd.Series(entry['y'], name='is_fraud')
+    y_train, y_test = y.iloc[:n_train], y.iloc[n_train:]
+    print(f"✓ Feature cache hit ({entry['meta']['key'][:12]}): X_train {X_train.shape}, "
+          f"X_test {X_test.shape}, split/fit/transform dilewati")
+    return X_train, X_test, y_train, y_test, feature_pipeline, feature_columns
+
+
+def print_feature_summary(X, feature_pipeline):
+    label_encoders = feature_pipeline.label_encoders()
+    for col in feature_pipeline.categorical_cols:
+        print(f"✓ Encoded '{col}' → {len(label_encoders[col].classes_)} unique values")
+    print(f"\n✓ Scaled {len(feature_pipeline.numerical_cols)} numerical features")
+    if feature_pipeline.target_encoders is not None:
+        for col, encoder in feature_pipeline.target_encoders.items():
+            print(f"✓ Target-encoded '{col}' → {len(encoder.index)} values "
+                  f"({encoder.nbytes / 1024:.1f} KB, prior {encoder.prior:.4f})")
+
+    hasher = feature_pipeline.hasher
+    print(f"\n✅ Total features for training: {X.shape[1]}")
+    print(f"✅ Feature names: {feature_pipeline.feature_columns}"
+          + (f" + {hasher.n_buckets:,} hash buckets" if hasher is not None else ""))
+
+
+def split_data(X, y, test_size=0.2, random_state=42):
+    """Stage split: stratified train/test split (sebelum pipeline di-fit)"""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    print_split_summary(X_train, X_test, y_train, y_test)
+    return X_train, X_test, y_train, y_test
+
+
+def print_split_summary(X_train, X_test, y_train, y_test):
+    n_rows = X_train.shape[0] + X_test.shape[0]
+    print("\n📊 Data Split Summary:")
+    print(f"   Training Set:   {X_train.shape[0]:,} samples ({X_train.shape[0]/n_rows*100:.1f}%)")
+    print(f"   Testing Set:    {X_test.shape[0]:,} samples ({X_test.shape[0]/n_rows*100:.1f}%)")
+    print(f"   Train Fraud:    {y_train.sum():,} ({y_train.sum()/len(y_train)*100:.1f}%)")
+    print(f"   Test Fraud:     {y_test.sum():,} ({y_test.sum()/len(y_test)*100:.1f}%)")
+
+
+def downsample_train(X_train, y_train, neg_rate):
+    """Stage sample: semua fraud + `neg_rate` baris non-fraud dari X_train"""
+    index = downsample_majority(y_train, neg_rate)
+    X_sampled = X_train.iloc[index] if hasattr(X_train, 'iloc') else X_train[index]
+    y_sampled = y_train.iloc[index]
+    print(f"\n📉 Downsampling non-fraud: {neg_rate:.0%} dipertahankan → "
+          f"{len(index):,} / {len(y_train):,} baris training "
+          f"(fraud {y_sampled.mean()*100:.1f}%)")
+    return X_sampled, y_sampled
+
+
+def cross_validate(model, X_train, y_train, n_folds, neg_rate=1.0, correction='prior'):
+    """
+    Stage cv: satu pass stratified K-fold pada X_train (core/cv.py)
+
+    Setiap fold di-fit sekali dan menghasilkan semua metrik; probabilitas
+    out-of-fold disimpan di artifacts untuk tuning threshold/kalibrasi.
+    """
+    print(f"Melakukan Cross-Validation ({n_folds}-Fold, satu pass, fold paralel)...")
+    result = cross_validate_oof(model, X_train, y_train, n_folds=n_folds,
+                                neg_rate=neg_rate, correction=correction)
+    print_cv_report(result)
+    if result['mean']['accuracy'] > 0.90:
+        print("   ✅ Model Robust & Stabil (Konsisten Tinggi)")
+    else:
+        print("   ⚠️ Model kurang stabil, perlu tuning lagi.")
+    return result
+
+
+def evaluate(model, X_test, y_test, feature_columns, plotter, prior=None):
+    """
+    Stage evaluate: metrik, confusion matrix dan feature importance
+
+    Args:
+        prior: `prior_neg_rate` model; probabilitas dikoreksi seperti saat scoring
+    """
+    print("\n" + "="*70)
+    print("📈 MODEL EVALUATION")
+    print("="*70)
+
+    y_pred_proba = fraud_proba(model, X_test, prior)
+    y_pred = (y_pred_proba > 0.5).astype(int)
+    performance = {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'f1_score': f1_score(y_test, y_pred),
+        'roc_auc': roc_auc_score(y_test, y_pred_proba),
     }
-}
 
-import os
+    print("\n🎯 PERFORMANCE METRICS:")
+    print("-" * 70)
+    print(f"Accuracy  : {performance['accuracy']:.4f} ({performance['accuracy']*100:.2f}%)")
+    print(f"Precision : {performance['precision']:.4f} ({performance['precision']*100:.2f}%) - Dari prediksi fraud, berapa yang benar")
+    print(f"Recall    : {performance['recall']:.4f} ({performance['recall']*100:.2f}%) - Dari fraud asli, berapa yang terdeteksi")
+    print(f"F1-Score  : {performance['f1_score']:.4f} - Harmonic mean of Precision & Recall")
+    print(f"ROC-AUC   : {performance['roc_auc']:.4f} - Area Under ROC Curve")
+    print("-" * 70)
+
+    cm = confusion_matrix(y_test, y_pred)
+    print("\n🔍 CONFUSION MATRIX:")
+    print("-" * 70)
+    print(f"True Negative  (TN): {cm[0][0]:,} → Correctly predicted SAFE")
+    print(f"False Positive (FP): {cm[0][1]:,} → False alarm (predicted FRAUD, actually SAFE)")
+    print(f"False Negative (FN): {cm[1][0]:,} → MISSED FRAUD (predicted SAFE, actually FRAUD) ⚠️")
+    print(f"True Positive  (TP): {cm[1][1]:,} → Correctly predicted FRAUD")
+    print("-" * 70)
+
+    print("\n📊 FEATURE IMPORTANCE ANALYSIS")
+    print("-" * 70)
+    feature_importance = pd.DataFrame({
+        'feature': feature_columns,
+        'importance': model.feature_importances_
+    }).sort_values('importance', ascending=False)
+    print("\nTop 10 Most Important Features:")
+    print(feature_importance.head(10).to_string(index=False))
+
+    if plotter.enabled:
+        plt = plotter.plt
+        plt.figure(figsize=(10, 8))
+        plotter.sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
+                            xticklabels=['Not Fraud', 'Fraud'],
+                            yticklabels=['Not Fraud', 'Fraud'],
+                            cbar_kws={'label': 'Count'})
+        plt.ylabel('Actual Label', fontsize=14, fontweight='bold')
+        plt.xlabel('Predicted Label', fontsize=14, fontweight='bold')
+        plt.title('Confusion Matrix - Random Forest', fontsize=16, fontweight='bold', pad=20)
+        plotter.finish('confusion_matrix')
+
+        plt.figure(figsize=(12, 8))
+        top_features = feature_importance.head(10)
+        plt.barh(range(len(top_features)), top_features['importance'], color='steelblue')
+        plt.yticks(range(len(top_features)), top_features['feature'], fontsize=12)
+        plt.xlabel('Importance Score', fontsize=14, fontweight='bold')
+        plt.title('Top 10 Feature Importance - Random Forest', fontsize=16, fontweight='bold', pad=20)
+        plt.gca().invert_yaxis()
+        plotter.finish('feature_importance')
+
+    return performance
+
+
+def manual_prediction_test(model, feature_pipeline, feature_columns, prior=None):
+    """Dua transaksi contoh (mencurigakan vs normal) lewat jalur single-record"""
+    print("\n" + "="*70)
+    print(" MANUAL PREDICTION TEST")
+    print("="*70)
+    cases = [
+        ("Suspicious Transaction", "$1,500 transaction at 3 AM on weekend (Gas/Transport)",
+         {'category': 'gas_transport', 'amt': 1500.0, 'gender': 'M', 'state': 'TX',
+          'age': 25, 'hour': 3, 'is_weekend': 1}),
+        ("Normal Transaction", "$50 transaction at 2 PM on weekday (Grocery)",
+         {'category': 'grocery_pos', 'amt': 50.0, 'gender': 'F', 'state': 'CA',
+          'age': 35, 'hour': 14, 'is_weekend': 0}),
+    ]
+    for i, (title, description, record) in enumerate(cases, 1):
+        row = pd.DataFrame(feature_pipeline.transform_record(record), columns=feature_columns)
+        fraud = fraud_proba(model, row, prior)[0]
+        prob = np.array([1.0 - fraud, fraud])
+        pred = int(np.argmax(prob))
+        print(f"\n TEST CASE {i}: {title}")
+        print("-" * 70)
+        print(f"Input: {description}")
+        print(f"Result: {'FRAUD' if pred == 1 else 'SAFE'}")
+        print(f"Confidence: {prob[pred]*100:.2f}%")
+        print(f"Probability → Safe: {prob[0]*100:.1f}% | Fraud: {prob[1]*100:.1f}%")
+
+
+def grow_by_oob(model_params, X_train, y_train, args):
+    """
+    Stage grow: tumbuhkan forest sampai metrik OOB plateau, potong ke ukuran terkecil
+
+    Returns:
+        (model yang sudah di-fit, kurva OOB, titik kurva yang dipilih)
+    """
+    print(f"Menumbuhkan forest: +{args.oob_step} tree per langkah (max {args.oob_max_trees}), "
+          f"stop jika OOB {args.oob_metric} naik < {args.oob_tol}")
+    model = RandomForestClassifier(**model_params)
+    curve = grow_forest(model, X_train, y_train, step=args.oob_step,
+                        max_trees=args.oob_max_trees, tol=args.oob_tol,
+                        metric=args.oob_metric, neg_rate=args.neg_rate,
+                        correction=args.neg_correction)
+    chosen = smallest_forest(curve, args.oob_target, args.oob_metric)
+    trim_forest(model, chosen['n_trees'])
+    print_growth_report(curve, chosen)
+    print(f"\n✓ Forest dipotong ke {chosen['n_trees']} tree "
+          f"(OOB {args.oob_metric} {chosen[args.oob_metric]:.4f}, "
+          f"{chosen['latency_us']:.1f} µs/row)")
+    return model, curve, chosen
+
+
+def distill_surrogate(model, X_train, X_test, y_test, kinds):
+    """
+    Stage distill: surrogate kecil untuk scoring satu baris dalam hitungan µs
+
+    Soft label = probabilitas forest pada X_train. Surrogate meniru teacher
+    (bukan label asli), jadi output teacher itu sendiri yang ditiru; soft
+    label OOF dari cv memberi agreement lebih rendah pada test set.
+    """
+    print("\n" + "="*70)
+    print("🧪 DISTILLATION (surrogate untuk jalur otorisasi)")
+    print("="*70)
+    soft_labels = model.predict_proba(X_train)[:, 1]
+    print(f"Soft label: probabilitas forest pada X_train, kandidat: {kinds}")
+    result = distill(model, X_train, soft_labels, X_test, y_test, kinds)
+    print_distill_report(result)
+    best = result['fidelity']
+    print(f"\n✓ Surrogate '{result['kind']}': agreement {best['agreement']:.4f}, "
+          f"Δauc {best['auc_gap']:.4f}, {best['latency_us']:.1f} µs/row ({best['speedup']:.0f}x)")
+    return result
+
+
+def save_artifacts(model, feature_pipeline, feature_columns, performance, output_dir,
+                   model_info=None, cv_result=None, search_result=None, oob_curve=None,
+                   surrogate=None, prior=None):
+    """Stage save: model pickle + forest .npy untuk worker pool + folder compact"""
+    print("\n" + "="*70)
+    print(" SAVING MODEL & PREPROCESSORS")
+    print("="*70)
+
+    model_artifacts = {
+        'model': model,
+        # neg_rate downsampling mode 'prior': probabilitas model dikoreksi dengan
+        # core.sampling.correct_prior di semua jalur scoring (None = tanpa koreksi)
+        'prior_neg_rate': prior,
+        'scaler': feature_pipeline.scaler,
+        'label_encoders': feature_pipeline.label_encoders(),
+        # Tabel target encoding (dibagi dengan feature_pipeline, None jika nonaktif)
+        'target_encoders': feature_pipeline.target_encoders,
+        'feature_pipeline': feature_pipeline,
+        'feature_columns': feature_columns,
+        'numerical_cols': feature_pipeline.numerical_cols,
+        'categorical_cols': feature_pipeline.categorical_cols,
+        'performance': performance,
+        'model_info': model_info or {},
+        # Metrik per fold + probabilitas OOF baris training (core/cv.py)
+        'cv': cv_result,
+        # Semua trial successive halving + Pareto frontier recall vs latency (core/search.py)
+        'search': search_result,
+        # Jumlah tree vs metrik OOB vs latency per baris (core/oob.py)
+        'oob_curve': oob_curve,
+        # Model distilasi + fidelity, dipilih saat load dengan core.distill.select_model
+        'surrogate': surrogate,
+    }
 
-output_dir = os.path.join(os.getcwd(), '..', 'models')
-os.makedirs(output_dir, exist_ok=True)
-
-model_path = os.path.join(output_dir, 'fraud_detection_model.pkl')
-
-# 4. Simpan model
-with open(model_path, 'wb') as f:
-    pickle.dump(model_artifacts, f)
-
-print(f"Model successfully saved to: {os.path.abspath(model_path)}")
-
-# 5. Cek ukuran file
-if os.path.exists(model_path):
-    file_size = os.path.getsize(model_path) / 1024**2
-    print(f"File size: {file_size:.2f} MB")
-
-print("\n" + "="*70)
-print(" TRAINING PIPELINE COMPLETE!")
-print("="*70)
-print("\n NEXT STEPS:")
-print(f"1.  File '{model_path}' sudah tersimpan")
-print("2.  Jalankan: streamlit run app.py")
-print("3.  Test the fraud detection system!")
-print("="*70)
-
-"""# Test Prediction (Manual)"""
-
-print("\n" + "="*70)
-print(" MANUAL PREDICTION TEST")
-print("="*70)
-
-# Test Case 1: Suspicious Transaction
-print("\n TEST CASE 1: Suspicious Transaction")
-print("-" * 70)
-
-test_input_1 = pd.DataFrame({
-    'category': [label_encoders['category'].transform(['gas_transport'])[0]],
-    'amt': [1500.0],
-    'gender': [label_encoders['gender'].transform(['M'])[0]],
-    'state': [label_encoders['state'].transform(['TX'])[0]],
-    'age': [25],
-    'hour': [3],
-    'is_weekend': [1],
-    'amt_per_hour_ratio': [1500.0 / 4]
-})
-
-test_input_1 = test_input_1[X.columns]
-test_input_1[numerical_cols] = scaler.transform(test_input_1[numerical_cols])
-
-pred_1 = model.predict(test_input_1)[0]
-prob_1 = model.predict_proba(test_input_1)[0]
-
-print(f"Input: $1,500 transaction at 3 AM on weekend (Gas/Transport)")
-print(f"Result: {'FRAUD' if pred_1 == 1 else 'SAFE'}")
-print(f"Confidence: {prob_1[pred_1]*100:.2f}%")
-print(f"Probability → Safe: {prob_1[0]*100:.1f}% | Fraud: {prob_1[1]*100:.1f}%")
-
-# Test Case 2: Normal Transaction
-print("\nTEST CASE 2: Normal Transaction")
-print("-" * 70)
-
-test_input_2 = pd.DataFrame({
-    'category': [label_encoders['category'].transform(['grocery_pos'])[0]],
-    'amt': [50.0],
-    'gender': [label_encoders['gender'].transform(['F'])[0]],
-    'state': [label_encoders['state'].transform(['CA'])[0]],
-    'age': [35],
-    'hour': [14],
-    'is_weekend': [0],
-    'amt_per_hour_ratio': [50.0 / 15]
-})
-
-test_input_2 = test_input_2[X.columns]
-test_input_2[numerical_cols] = scaler.transform(test_input_2[numerical_cols])
-
-pred_2 = model.predict(test_input_2)[0]
-prob_2 = model.predict_proba(test_input_2)[0]
-
-print(f"Input: $50 transaction at 2 PM on weekday (Grocery)")
-print(f"Result: {'FRAUD' if pred_2 == 1 else 'SAFE'}")
-print(f"Confidence: {prob_2[pred_2]*100:.2f}%")
-print(f"Probability → Safe: {prob_2[0]*100:.1f}% | Fraud: {prob_2[1]*100:.1f}%")
-
-print("\nManual testing complete!")
-print("="*70)
\ No newline at end of file
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, 'fraud_detection_model.pkl')
+    with open(model_path, 'wb') as f:
+        pickle.dump(model_artifacts, f)
+    print(f"Model successfully saved to: {os.path.abspath(model_path)}")
+    print(f"File size: {os.path.getsize(model_path) / 1024**2:.2f} MB")
+
+    # Forest dalam format array .npy untuk worker pool (memory-mapped, core/worker_pool.py)
+    forest_dir = os.path.join(output_dir, 'flat_forest')
+    FlatForest.from_sklearn(model).save(forest_dir)
+    print(f"Flat forest saved to: {os.path.abspath(forest_dir)}")
+
+    # Format compact terkuantisasi untuk load cepat (core/compact_artifact.py)
+    compact_dir = os.path.join(output_dir, 'compact')
+    try:
+        size = save_compact(model_artifacts, compact_dir)
+        print(f"Compact artifact saved to: {os.path.abspath(compact_dir)} ({size / 1024**2:.2f} MB)")
+    except ValueError as e:
+        print(f"⚠️  Compact artifact dilewati (folder compact lama dihapus): {e}")
+    return model_path
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Training model fraud detection (Random Forest)")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--registry', nargs='?', const=DEFAULT_REGISTRY_DIR,
+                        help="Publish model ke registry berversi dan aktifkan (core/registry.py)")
+    parser.add_argument('--skip-eda', action='store_true', help="Lewati stage EDA")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="Tanpa plot sama sekali (matplotlib tidak di-import)")
+    parser.add_argument('--plot-dir', help="Simpan plot sebagai PNG di folder ini (headless)")
+    parser.add_argument('--cv-folds', type=int, default=5, help="0 = lewati stage cv")
+    parser.add_argument('--skip-manual-test', action='store_true')
+
+    search = parser.add_argument_group('hyperparameter search (successive halving)')
+    search.add_argument('--search', action='store_true', help="Jalankan stage search sebelum cv")
+    search.add_argument('--search-candidates', type=int, default=24)
+    search.add_argument('--search-factor', type=int, default=3)
+    search.add_argument('--search-metric', default='recall', choices=METRICS)
+
+    features = parser.add_argument_group('fitur opsional')
+    # Velocity per kartu (1h/24h/7d count & amount, jeda sejak transaksi sebelumnya)
+    features.add_argument('--velocity', action='store_true')
+    # Jarak rumah-merchant dan travel speed antar transaksi kartu
+    features.add_argument('--geo', action='store_true')
+    # Jumlah transaksi & fraud training dalam radius merchant (grid index)
+    features.add_argument('--spatial-radius-km', type=float)
+    # Blok sparse hasil hashing merchant/job/city/zip (CSR, tanpa densify)
+    features.add_argument('--hash-buckets', type=int, nargs='?', const=DEFAULT_BUCKETS)
+    # Fraud rate ter-smoothing (out-of-fold) per category/state/merchant
+    features.add_argument('--target-encoding', action='store_true')
+
+    parser.add_argument('--distill', nargs='*', choices=list(SURROGATES),
+                        help="Latih surrogate kecil (tanpa argumen: semua kandidat)")
+
+    oob = parser.add_argument_group('ukuran forest dari kurva OOB')
+    oob.add_argument('--oob-grow', action='store_true',
+                     help="Tumbuhkan forest bertahap alih-alih n_estimators tetap")
+    oob.add_argument('--oob-step', type=int, default=25)
+    oob.add_argument('--oob-max-trees', type=int, default=500)
+    oob.add_argument('--oob-tol', type=float, default=1e-3)
+    oob.add_argument('--oob-metric', default='recall', choices=METRICS)
+    oob.add_argument('--oob-target', type=float,
+                     help="Pilih forest terkecil dengan OOB metric >= target")
+
+    sampling = parser.add_argument_group('downsampling non-fraud')
+    sampling.add_argument('--neg-rate', type=float, default=1.0,
+                          help="Fraksi baris non-fraud training yang dipakai (1.0 = semua)")
+    sampling.add_argument('--neg-correction', default='prior', choices=CORRECTIONS,
+                          help="Koreksi bias downsampling: koreksi prior pada probabilitas "
+                               "saat scoring (terkalibrasi) atau sample weight saat fit")
+
+    streaming = parser.add_argument_group('streaming (out-of-core, core/streaming_train.py)')
+    streaming.add_argument('--streaming', action='store_true',
+                           help="Training per chunk dengan sampel terbatas per kelas")
+    streaming.add_argument('--chunksize', type=int, default=250_000)
+    streaming.add_argument('--max-legit', type=int, default=1_000_000,
+                           help="Maksimum baris non-fraud di sampel training")
+    streaming.add_argument('--max-fraud', type=int, default=1_000_000,
+                           help="Maksimum baris fraud di sampel training")
+
+    cache = parser.add_argument_group('feature cache')
+    cache.add_argument('--no-cache', action='store_true')
+    cache.add_argument('--cache-dir', help="Default: <folder CSV>/.cache/features")
+    cache.add_argument('--cache-max-gb', type=float, default=5.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.streaming:
+        model_path = os.path.join(args.output_dir, 'fraud_detection_model.pkl')
+        train_streaming(args.data, model_path, chunksize=args.chunksize,
+                        max_legit=args.max_legit, max_fraud=args.max_fraud)
+        if args.registry:
+            version = ModelRegistry(args.registry).publish(model_path)
+            print(f"Registry: versi {version} aktif di {os.path.abspath(args.registry)}")
+        return
+
+    profiler = StageProfiler()
+    plotter = Plotter(enabled=not args.no_plots, plot_dir=args.plot_dir)
+    params = feature_params(args)
+
+    cache = cache_key = entry = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or os.path.join(os.path.dirname(os.path.abspath(args.data)),
+                                                   CACHE_DIR_NAME, 'features')
+        cache = FeatureCache(cache_dir, max_bytes=args.cache_max_gb * 1024**3)
+        cache_key = cache.key(args.data, {**params, 'split': SPLIT_PARAMS,
+                                                'drop_cols': drop_columns(params)})
+        entry = cache.load(cache_key)
+
+    df = None
+    if entry is None or not args.skip_eda:
+        with profiler.stage('load'):
+            df = load_dataset(args.data)
+    if not args.skip_eda:
+        with profiler.stage('eda'):
+            run_eda(df, params, plotter)
+
+    if entry is not None:
+        with profiler.stage('features'):
+            (X_train, X_test, y_train, y_test,
+             feature_pipeline, feature_columns) = features_from_cache(entry)
+            print_split_summary(X_train, X_test, y_train, y_test)
+    else:
+        with profiler.stage('features'):
+            X, y, feature_pipeline = engineer_features(df, params)
+            del df
+        with profiler.stage('split'):
+            X_train, X_test, y_train, y_test = split_data(X, y, **SPLIT_PARAMS)
+            del X, y
+        with profiler.stage('encode'):
+            X_train, X_test, feature_columns = encode_features(
+                X_train, X_test, y_train, y_test, feature_pipeline, params, cache, cache_key)
+    print_feature_summary(X_train, feature_pipeline)
+    n_train_rows = X_train.shape[0]
+    prior = prior_neg_rate(args.neg_rate, args.neg_correction)
+    if args.neg_rate < 1:
+        with profiler.stage('sample'):
+            X_train, y_train = downsample_train(X_train, y_train, args.neg_rate)
+
+    print("\n" + "="*70)
+    print("TRAINING & VALIDATION PROCESS")
+    print("="*70)
+    model_params = dict(MODEL_PARAMS)
+    search_result = None
+    if args.search:
+        with profiler.stage('search'):
+            print(f"Hyperparameter search: {args.search_candidates} kandidat, "
+                  f"factor {args.search_factor}, metric {args.search_metric}")
+            search_result = successive_halving(X_train, y_train,
+                                               n_candidates=args.search_candidates,
+                                               factor=args.search_factor,
+                                               metric=args.search_metric,
+                                               neg_rate=args.neg_rate,
+                                               correction=args.neg_correction)
+            print_search_report(search_result)
+            model_params.update(search_result['best_params'])
+
+    oob_curve = None
+    if args.oob_grow:
+        with profiler.stage('grow'):
+            model, oob_curve, chosen = grow_by_oob(model_params, X_train, y_train, args)
+            model_params['n_estimators'] = chosen['n_trees']
+    else:
+        model = RandomForestClassifier(**model_params)
+
+    cv_result = None
+    if args.cv_folds:
+        with profiler.stage('cv'):
+            cv_result = cross_validate(model, X_train, y_train, args.cv_folds,
+                                       args.neg_rate, args.neg_correction)
+
+    if oob_curve is None:
+        with profiler.stage('fit'):
+            print("Final Training (Fitting model ke seluruh X_train)...")
+            fit_downsampled(model, X_train, y_train, args.neg_rate, args.neg_correction)
+    print("\n✅ Training Complete! Model siap digunakan.")
+
+    with profiler.stage('evaluate'):
+        performance = evaluate(model, X_test, y_test, feature_columns, plotter, prior)
+        if cv_result is not None:
+            performance.update({f'cv_{m}': v for m, v in cv_result['mean'].items()})
+        if not args.skip_manual_test:
+            manual_prediction_test(model, feature_pipeline, feature_columns, prior)
+
+    surrogate = None
+    if args.distill is not None:
+        if feature_pipeline.hasher is not None:
+            print("\n⚠️ Distillation dilewati: surrogate butuh input dense (tanpa --hash-buckets)")
+        else:
+            with profiler.stage('distill'):
+                surrogate = distill_surrogate(model, X_train, X_test, y_test,
+                                              args.distill or list(SURROGATES))
+
+    model_info = {
+        'algorithm': 'Random Forest',
+        'n_estimators': model.n_estimators,
+        'max_depth': model.max_depth,
+        'params': {k: v for k, v in model_params.items() if k not in ('n_jobs', 'verbose')},
+        'trained_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'training_mode': 'batch',
+        'training_rows': X_train.shape[0],
+        'sampling': {'neg_rate': args.neg_rate, 'correction': args.neg_correction,
+                     'rows_before': n_train_rows},
+        'feature_params': params,
+        'stage_seconds': {r['stage']: round(r['seconds'], 3) for r in profiler.records},
+    }
+    with profiler.stage('save'):
+        model_path = save_artifacts(model, feature_pipeline, feature_columns, performance,
+                                    args.output_dir, model_info, cv_result, search_result,
+                                    oob_curve, surrogate, prior)
+        if args.registry:
+            version = ModelRegistry(args.registry).publish(model_path)
+            print(f"Registry: versi {version} aktif di {os.path.abspath(args.registry)}")
+
+    profiler.print_report()
+    print("\n" + "="*70)
+    print(" TRAINING PIPELINE COMPLETE!")
+    print("="*70)
+    print("\n NEXT STEPS:")
+    print(f"1.  File '{model_path}' sudah tersimpan")
+    print("2.  Jalankan: streamlit run app.py")
+    print("3.  Test the fraud detection system!")
+    print("="*70)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 import altair as alt
 
+from core.features import FeaturePipeline
+
 
 def render(load_data_func):
     """
@@ -22,14 +24,8 @@ def render(load_data_func):
         df_raw = load_data_func()
         
         # --- FEATURE ENGINEERING untuk visualisasi ---
-        df = df_raw.copy()
-        df['trans_date_trans_time'] = pd.to_datetime(df['trans_date_trans_time'])
-        df['hour'] = df['trans_date_trans_time'].dt.hour
-        df['dob'] = pd.to_datetime(df['dob'])
-        today = pd.Timestamp.today()
-        df['age'] = ((today - df['dob']).dt.days / 365.25).astype(int)
-        df['day_of_week'] = df['trans_date_trans_time'].dt.dayofweek
-        df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
+        # Definisi fitur sama persis dengan training (core/features.py)
+        df = FeaturePipeline().add_features(df_raw)
         
         # ==============================================
         # SECTION 1: OVERVIEW METRICS
@@ -1,23 +1,26 @@
 """
-Fraud Detection Tab - Input form and fraud prediction
+Fraud Detection Tab - Input form, fraud prediction and batch file scoring
 """
+import os
+import tempfile
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
+from core.batch_scoring import score_file
+from core.scoring import BatchScorer
+
 
-def render(model, scaler, label_encoders, feature_columns, numerical_cols):
+def render(scorer):
     """
     Render tab Fraud Detection
     
     Args:
-        model: Trained model
-        scaler: Fitted scaler
-        label_encoders: Dict of label encoders
-        feature_columns: List of feature column names
-        numerical_cols: List of numerical column names
+        scorer: TransactionScorer (core/scoring.py) berisi model dan FeaturePipeline
     """
+    feature_pipeline = scorer.feature_pipeline
+    
     st.title("Fraud Detection System")
     st.markdown("### Sistem Peringatan Dini untuk Deteksi Transaksi Mencurigakan")
     st.markdown("---")
@@ -29,7 +32,7 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
     st.sidebar.markdown("Masukkan detail transaksi untuk dianalisis:")
     
     # Input Category
-    category_options = list(label_encoders['category'].classes_)
+    category_options = feature_pipeline.classes('category')
     
     def format_category(cat_name):
         return cat_name.replace('_', ' ').title()
@@ -52,7 +55,7 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
     )
     
     # Input Gender
-    gender_options = list(label_encoders['gender'].classes_)
+    gender_options = feature_pipeline.classes('gender')
     
     gender_map = {
         'M': 'Laki-laki',
@@ -67,7 +70,7 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
     )
     
     # Input State
-    state_options = list(label_encoders['state'].classes_)
+    state_options = feature_pipeline.classes('state')
     
     us_state_map = {
         'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
@@ -121,36 +124,17 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
     
     if analyze_clicked:
         
-        # Prepare input data
-        amt_per_hour_ratio = amt / (hour + 1)
-        
-        # Encode categorical variables
-        category_encoded = label_encoders['category'].transform([category])[0]
-        gender_encoded = label_encoders['gender'].transform([gender])[0]
-        state_encoded = label_encoders['state'].transform([state])[0]
-        
-        # Create dataframe
-        input_data = pd.DataFrame({
-            'category': [category_encoded],
-            'amt': [amt],
-            'gender': [gender_encoded],
-            'state': [state_encoded],
-            'age': [age],
-            'hour': [hour],
-            'is_weekend': [int(is_weekend)],
-            'amt_per_hour_ratio': [amt_per_hour_ratio]
+        # Prediction: satu pass model via precompiled scorer (core/scoring.py)
+        prediction, prediction_proba = scorer.score({
+            'category': category,
+            'amt': amt,
+            'gender': gender,
+            'state': state,
+            'age': age,
+            'hour': hour,
+            'is_weekend': is_weekend,
         })
         
-        # Reorder
-        input_data = input_data[feature_columns]
-        
-        # Scaling
-        input_data[numerical_cols] = scaler.transform(input_data[numerical_cols])
-        
-        # Prediction
-        prediction = model.predict(input_data)[0]
-        prediction_proba = model.predict_proba(input_data)[0]
-        
         confidence = prediction_proba[prediction] * 100
         
         # Save to history
@@ -312,7 +296,8 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
         viz_col1, viz_col2 = st.columns([1, 1])
         
         with viz_col1:
-            # Pie chart
+            # Pie chart (matplotlib di-import saat pertama kali ada hasil prediksi)
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(figsize=(6, 6))
             colors = ['#2ecc71', '#e74c3c']  # Green for Safe, Red for Fraud
             explode = (0.05, 0.05)
@@ -438,4 +423,87 @@ def render(model, scaler, label_encoders, feature_columns, numerical_cols):
             st.markdown("### Prediksi Terakhir")
             history_df = pd.DataFrame(st.session_state.prediction_history[-5:])  # Last 5
             st.dataframe(history_df, width='stretch')
+    
+    # ========================================
+    # BATCH SCORING
+    # ========================================
+    st.markdown("---")
+    with st.expander("Batch Scoring - Analisis File Transaksi"):
+        render_batch_scoring(scorer)
 
+
+def render_batch_scoring(scorer):
+    """
+    Scoring file CSV transaksi per chunk (memori tetap terbatas)
+    
+    Args:
+        scorer: TransactionScorer yang berisi model dan FeaturePipeline
+    """
+    st.markdown(
+        "Upload file CSV dengan skema `credit_card_transactions2.csv` atau masukkan path "
+        "file di server. Hasil berisi `trans_num`, probabilitas fraud, label dan faktor risiko. "
+        "Untuk backfill terjadwal gunakan CLI: `python -m core.batch_scoring <input.csv> -o <output>`."
+    )
+    
+    uploaded = st.file_uploader("Upload CSV Transaksi", type=['csv'])
+    server_path = st.text_input(
+        "Atau path file di server",
+        placeholder="data/credit_card_transactions2.csv"
+    )
+    out_format = st.radio("Format Output", ['CSV', 'Parquet'], horizontal=True)
+    
+    if not st.button("SCORE FILE", width='stretch'):
+        return
+    
+    source = uploaded if uploaded is not None else server_path.strip()
+    if not source:
+        st.warning("Silakan upload file atau isi path file terlebih dahulu.")
+        return
+    if isinstance(source, str) and not os.path.exists(source):
+        st.error(f"File `{source}` tidak ditemukan.")
+        return
+    
+    suffix = '.parquet' if out_format == 'Parquet' else '.csv'
+    # File sementara unik per request (tidak bentrok antar session), dihapus
+    # setelah isinya dibaca untuk download_button
+    fd, output_path = tempfile.mkstemp(prefix='fraud_scores_', suffix=suffix)
+    os.close(fd)
+    
+    progress = st.progress(0.0, text="Memulai scoring...")
+    
+    def update_progress(fraction, rows, rows_per_sec):
+        progress.progress(fraction, text=f"{rows:,} baris | {rows_per_sec:,.0f} baris/detik")
+    
+    try:
+        summary = score_file(
+            source,
+            output_path,
+            BatchScorer(scorer.model, scorer.feature_pipeline,
+                        prior_neg_rate=scorer.prior_neg_rate),
+            progress_callback=update_progress
+        )
+        with open(output_path, 'rb') as f:
+            result_bytes = f.read()
+    except (ValueError, KeyError) as e:
+        st.error(f"File tidak sesuai skema transaksi: {e}")
+        return
+    finally:
+        os.remove(output_path)
+    
+    progress.progress(1.0, text="Scoring selesai")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Transaksi", f"{summary['rows']:,}")
+    with col2:
+        st.metric("Terdeteksi Fraud", f"{summary['fraud']:,}")
+    with col3:
+        st.metric("Kecepatan", f"{summary['rows_per_sec']:,.0f} baris/detik")
+    
+    st.download_button(
+        label=f"Unduh Hasil Scoring ({out_format})",
+        data=result_bytes,
+        file_name=f'fraud_scores_{datetime.now().strftime("%Y%m%d_%H%M%S")}{suffix}',
+        mime='application/octet-stream' if suffix == '.parquet' else 'text/csv',
+        width='stretch'
+    )
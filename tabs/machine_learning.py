@@ -5,6 +5,9 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 
+# Model dengan blok hashing punya ribuan kolom; tampilkan yang teratas saja
+MAX_FEATURES_SHOWN = 20
+
 
 def render(model, feature_columns, load_data_func):
     """
@@ -201,7 +204,7 @@ model = RandomForestClassifier(
         feature_imp_df = pd.DataFrame({
             'Feature': feature_columns,
             'Importance': model.feature_importances_
-        }).sort_values('Importance', ascending=False)
+        }).sort_values('Importance', ascending=False).head(MAX_FEATURES_SHOWN)
         
         # Altair bar chart
         importance_chart = alt.Chart(feature_imp_df).mark_bar().encode(
@@ -3,9 +3,11 @@ Model Performance Tab - Dashboard evaluasi performa model
 """
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
+# Model dengan blok hashing punya ribuan kolom; tampilkan yang teratas saja
+MAX_FEATURES_SHOWN = 20
+
 
 def render(model, model_info, performance, feature_columns):
     """
@@ -64,8 +66,10 @@ def render(model, model_info, performance, feature_columns):
         feature_imp_df = pd.DataFrame({
             'Feature': feature_columns,
             'Importance': model.feature_importances_
-        }).sort_values('Importance', ascending=False)
+        }).sort_values('Importance', ascending=False).head(MAX_FEATURES_SHOWN)
         
+        # matplotlib di-import saat chart dirender, bukan saat app start
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 6))
         ax.barh(feature_imp_df['Feature'], feature_imp_df['Importance'], color='steelblue')
         ax.set_xlabel('Skor Importance', fontsize=12, fontweight='bold')